@@ -1,54 +1,58 @@
 import logging
-import yaml
-from typing import Optional, Dict, Any, List, Union, Type
+from typing import Optional, Dict, Any, List, Set, Union, Type
 from crewai import Agent
 from langchain.tools import BaseTool
 import inspect
 import asyncio
+import threading
 from pydantic import BaseModel, Field, create_model
 from langchain.tools import StructuredTool
+from config_registry import AgentConfig, ConfigRegistry, get_config_registry
 
 class AgentManager:
-    def __init__(self, tools: Dict[str, Any]):
+    def __init__(self, tools: Dict[str, Any], registry: Optional[ConfigRegistry] = None):
         self.logger = logging.getLogger(__name__)
         self.tools = tools
-        self.agents = []
-        self.agent_cache = {}  # Cache for created agents
+        self.registry = registry or get_config_registry()
+        self.agent_cache = {}  # agent name -> (config it was built from, Agent)
+        self._cache_lock = threading.Lock()
+        self.registry.add_listener(self._invalidate)
+
+    def _invalidate(self, affected: Dict[str, Set[str]]):
+        for agent_name in affected['agents']:
+            self.agent_cache.pop(agent_name, None)
+
+    @property
+    def agents(self) -> List[Dict[str, Any]]:
+        return self.registry.entries('agents')
+
+    @agents.setter
+    def agents(self, agents: List[Dict[str, Any]]):
+        self.registry.set_entries('agents', agents)
 
     def create_crewai_agent(self, agent_name: str) -> Optional[Agent]:
-        # First check if agent already exists in loaded agents
+        """Return the Agent for ``agent_name``, built once per config and shared by every crew and task using it."""
         agent_data = self.get_agent_by_name(agent_name)
-        
-        if not agent_data:
-            # Agent not found in current agents, try to load from agents.yaml
-            try:
-                with open('config/agents.yaml', 'r') as f:
-                    all_agents = yaml.safe_load(f) or []
-                    agent_data = next((agent['Agent'] for agent in all_agents 
-                                     if agent['Agent']['name'] == agent_name), None)
-                    if agent_data:
-                        # Add to current agents list
-                        self.agents.append({'Agent': agent_data})
-            except Exception as e:
-                self.logger.error(f"Error loading agent {agent_name}: {str(e)}")
-                return None
-                
         if agent_data:
+            with self._cache_lock:
+                cached = self.agent_cache.get(agent_name)
+                if cached and cached[0] == agent_data:
+                    return cached[1]
             try:
                 agent_kwargs = {
-                    'name': agent_data['name'],
-                    'role': agent_data['role'],
-                    'goal': agent_data['goal'],
-                    'backstory': agent_data['backstory'],
+                    'name': agent_data.name,
+                    'role': agent_data.role,
+                    'goal': agent_data.goal,
+                    'backstory': agent_data.backstory,
                     'verbose': True,
-                    'allow_delegation': agent_data.get('delegate', False)
+                    'allow_delegation': agent_data.delegate
                 }
 
-                if 'tools' in agent_data and agent_data['tools']:
+                if agent_data.tools:
                     tools = []
-                    for tool_name in agent_data['tools']:
-                        if tool_name in self.tools:
-                            tool = self.tools[tool_name]
+                    for tool_name in agent_data.tools:
+                        tool = self.tools.get(tool_name)
+                        if tool is not None:
                             #converted_tool = self._convert_structured_tool(tool, tool_name)
                             #if converted_tool:
                             #    tools.append(converted_tool)
@@ -60,7 +64,10 @@ class AgentManager:
                     if tools:
                         agent_kwargs['tools'] = tools
                         
-                return Agent(**agent_kwargs)
+                agent = Agent(**agent_kwargs)
+                with self._cache_lock:
+                    self.agent_cache[agent_name] = (agent_data, agent)
+                return agent
             except Exception as e:
                 self.logger.error(f"Error creating agent {agent_name}: {str(e)}")
                 return None
@@ -151,15 +158,12 @@ class AgentManager:
             self.logger.error(f"Error converting tool {tool_name}: {str(e)}")
             return None
 
-    def get_agent_by_name(self, agent_name: str) -> Optional[Dict[str, Any]]:
-        for agent in self.agents:
-            if agent['Agent']['name'] == agent_name:
-                return agent['Agent']
-        return None
+    def get_agent_by_name(self, agent_name: str) -> Optional[AgentConfig]:
+        return self.registry.get_agent(agent_name)
 
     def create_agent(self, agent_data: Dict[str, Any]) -> bool:
         try:
-            self.agents.append({'Agent': agent_data})
+            self.agents = self.agents + [{'Agent': agent_data}]
             return True
         except Exception as e:
             self.logger.error(f"Error creating agent: {str(e)}")
@@ -173,7 +177,9 @@ class AgentManager:
                 if agent_name and agent_name in self.agent_cache:
                     del self.agent_cache[agent_name]
                     
-                self.agents[index]['Agent'] = agent_data
+                agents = list(self.agents)
+                agents[index] = {'Agent': agent_data}
+                self.agents = agents
                 return True
             except Exception as e:
                 self.logger.error(f"Error updating agent: {str(e)}")
@@ -188,7 +194,7 @@ class AgentManager:
                 if agent_name and agent_name in self.agent_cache:
                     del self.agent_cache[agent_name]
                     
-                del self.agents[index]
+                self.agents = self.agents[:index] + self.agents[index + 1:]
                 return True
             except Exception as e:
                 self.logger.error(f"Error deleting agent: {str(e)}")
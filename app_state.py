@@ -10,31 +10,45 @@ from file_manager import FileManager
 from agent_manager import AgentManager
 from task_manager import TaskManager
 from crew_manager import CrewManager
-#required 
-from tools.search_tools import SearchTools
-from tools.semantic_search import ExaSearchTool
-from tools.calculator_tools import CalculatorTool
-from tools.scraper_tools import WebScrappingTools
-from tools.excel_rag_tool import ExcelRagTool
-from tools.cached_result_tool import DummyTool
-from tools.graph_rag_tool import GraphRagTool
+from config_registry import get_config_registry
+from config_watcher import get_config_watcher
+from tools.registry import LazyToolRegistry, ToolSpec
 from db_utils import set_up_db
+from startup_profiler import profiler
 
-# Define tools dictionary
-tools_dict = {
-    "ExaSearchTool": ExaSearchTool.search_and_get_contents_tool,
-    "Search Tavily": SearchTools.TavilySearchTool,
-    "Search Internet": SearchTools.search_internet_with_google,
-    "Search News": SearchTools.search_news_with_google,
-    "Scrape Company": WebScrappingTools.extract_company_overview,
-    "Scrape Data Centre": WebScrappingTools.extract_data_centre_key_facts,
-    "Calculator": CalculatorTool.evaluate,
-    "DC Excel RAG": ExcelRagTool.query_data_centre_src,
-    "Excel RAG": ExcelRagTool.query_excel_src,
-    "Graph RAG": GraphRagTool.get_PDF_insight,
-    "Dummy Tool": DummyTool.get_dummy_result,
-    "Smart Excel RAG":ExcelRagTool.query_excel_rag
-}
+# Tools are imported on first use, see tools.registry
+tools_dict = LazyToolRegistry({
+    "ExaSearchTool": ToolSpec("tools.semantic_search:ExaSearchTool.search_and_get_contents_tool",
+                              "Exa semantic search returning result highlights"),
+    "Search Tavily": ToolSpec("tools.search_tools:SearchTools.TavilySearchTool", "Tavily question answering search"),
+    "Search Internet": ToolSpec("tools.search_tools:SearchTools.search_internet_with_google", "Google search"),
+    "Search News": ToolSpec("tools.search_tools:SearchTools.search_news_with_google", "Google News search"),
+    "Multi Search": ToolSpec("tools.multi_search:MultiSearchTool.multi_search_tool",
+                             "Google, News, Tavily and Exa searched together"),
+    "Batch Search Internet": ToolSpec("tools.batch_search:BatchSearchTools.batch_search_internet_with_google",
+                                      "Google search for a list of questions"),
+    "Batch Search News": ToolSpec("tools.batch_search:BatchSearchTools.batch_search_news_with_google",
+                                  "Google News search for a list of questions"),
+    "Batch Multi Search": ToolSpec("tools.batch_search:BatchSearchTools.batch_multi_search",
+                                   "Multi Search for a list of questions"),
+    "Scrape Company": ToolSpec("tools.scraper_tools:WebScrappingTools.extract_company_overview",
+                               "Company overview from a web page"),
+    "Scrape Data Centre": ToolSpec("tools.scraper_tools:WebScrappingTools.extract_data_centre_key_facts",
+                                   "Data centre facts from a web page"),
+    "Batch Scrape Company": ToolSpec("tools.scraper_tools:WebScrappingTools.batch_extract_company_overview",
+                                     "Company overviews from a list of web pages"),
+    "Batch Scrape Data Centre": ToolSpec("tools.scraper_tools:WebScrappingTools.batch_extract_data_centre_key_facts",
+                                         "Data centre facts from a list of web pages"),
+    "Data Centre Facts": ToolSpec("tools.dc_fact_store:DataCentreFactsTool.query_data_centre_facts",
+                                  "Data centres already collected by scrapes and crews"),
+    "Calculator": ToolSpec("tools.calculator_tools:CalculatorTool.evaluate", "Evaluate an arithmetic expression"),
+    "DC Excel RAG": ToolSpec("tools.excel_rag_tool:ExcelRagTool.query_data_centre_src",
+                             "Question answering over the data centre workbooks"),
+    "Excel RAG": ToolSpec("tools.excel_rag_tool:ExcelRagTool.query_excel_src", "Data centre facts from trusted workbooks, with context"),
+    "Graph RAG": ToolSpec("tools.graph_rag_tool:GraphRagTool.get_PDF_insight", "Insights from the PDF documents"),
+    "Dummy Tool": ToolSpec("tools.cached_result_tool:DummyTool.get_dummy_result", "Capital city of Thailand, for testing cached results"),
+    "Smart Excel RAG": ToolSpec("tools.excel_rag_tool:ExcelRagTool.query_excel_rag", "Analyst insights from market report workbooks"),
+})
 
 class CrewEncoder(json.JSONEncoder):
     def default(self, o: Any) -> Any:
@@ -70,42 +84,37 @@ class AppState:
         # Create empty config files if they don't exist
         try:
             self.logger.debug("Ensuring config files exist")
-            self._ensure_config_files_exist()
+            with profiler.phase('config_files'):
+                self._ensure_config_files_exist()
         except Exception as e:
             self.logger.error(f"Failed to ensure config files: {str(e)}")
             raise
         # create cache database 
-        set_up_db()
+        with profiler.phase('set_up_db'):
+            set_up_db()
         self.inputs = self._load_data('inputs')
         try:
             # Initialize managers
             self.logger.debug("Initializing managers")
             try:
-                self.logger.debug("Initializing AgentManager")
-                self.agent_manager = AgentManager(self.tools)
-                self.logger.debug("Initializing TaskManager")
-                self.task_manager = TaskManager(self.agent_manager)
-                self.logger.debug("Initializing CrewManager")
-                self.crew_manager = CrewManager(self.agent_manager, 
-                                                self.task_manager,self.inputs)
+                self.logger.debug("Loading config registry")
+                with profiler.phase('config_registry'):
+                    self.config_registry = get_config_registry()
+                with profiler.phase('config_watcher'):
+                    self.config_watcher = get_config_watcher()
+                with profiler.phase('managers'):
+                    self.logger.debug("Initializing AgentManager")
+                    self.agent_manager = AgentManager(self.tools, self.config_registry)
+                    self.logger.debug("Initializing TaskManager")
+                    self.task_manager = TaskManager(self.agent_manager)
+                    self.logger.debug("Initializing CrewManager")
+                    self.crew_manager = CrewManager(self.agent_manager, 
+                                                    self.task_manager,self.inputs)
                 self.logger.debug("All managers initialized successfully")
             except Exception as e:
                 self.logger.error(f"Failed to initialize managers: {str(e)}", exc_info=True)
                 raise
             
-            # Load data from files with error handling
-            self.logger.debug("Loading data from config files")
-            self.agents = self._load_data('agents')
-            self.tasks = self._load_data('tasks')
-            self.crews = self._load_data('crews')
-
-            
-            # Set up managers with loaded data
-            self.logger.debug("Setting up managers with loaded data")
-            self.agent_manager.agents = self.agents
-            self.task_manager.tasks = self.tasks
-            self.crew_manager.crews = self.crews
-            
             # Initialize smart research crew
             self.logger.debug("Initializing smart research crew")
             self._init_smart_research()
@@ -115,9 +124,6 @@ class AppState:
         except Exception as e:
             self.logger.error(f"Error during AppState initialization: {str(e)}", exc_info=True)
             # Initialize empty data structures as fallback
-            self.agents = []
-            self.tasks = []
-            self.crews = []
             self.inputs = {}
             raise
     
@@ -140,6 +146,18 @@ class AppState:
                     else:
                         yaml.dump(default_content, f)
     
+    @property
+    def agents(self) -> List[Dict[str, Any]]:
+        return self.config_registry.entries('agents')
+
+    @property
+    def tasks(self) -> List[Dict[str, Any]]:
+        return self.config_registry.entries('tasks')
+
+    @property
+    def crews(self) -> List[Dict[str, Any]]:
+        return self.config_registry.entries('crews')
+
     def _load_data(self, data_type: str) -> Any:
         """Load data from config files with error handling"""
         try:
@@ -155,12 +173,11 @@ class AppState:
     
     def _init_smart_research(self):
         """Initialize smart research configuration"""
-        try:
-            with open('config/smart_research.yaml', 'r') as f:
-                smart_research = yaml.safe_load(f) or {'configs': []}
-                default_config = smart_research['configs'][0] if smart_research['configs'] else None
-        except Exception as e:
-            self.logger.error(f"Error loading default configuration: {str(e)}")
+        configs = self.config_registry.names('smart_research')
+        if configs:
+            self.logger.debug(f"Default smart research configuration: {configs[0]}")
+        else:
+            self.logger.warning("No smart research configurations defined")
 
     def setup_logging(self):
         os.makedirs('logs', exist_ok=True)
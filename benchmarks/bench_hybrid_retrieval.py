@@ -0,0 +1,144 @@
+"""Ranking quality and latency of dense, BM25 and hybrid (RRF) retrieval over workbook chunks.
+
+Usage:
+    python -m benchmarks.bench_hybrid_retrieval [--size small | --workbooks 'src_docs/**/*.xlsx'] [-k 5]
+
+By default a synthetic site workbook (see benchmarks.synthetic) is indexed,
+so the corpus is many times larger than k and full of near duplicates:
+sites of the same operator, city and year that differ in a cell or two.
+Each data row becomes an exact-token query (row label, column name and
+value); the relevant chunk is the one holding that row. Every mode ranks
+the top ``fetch_k`` chunks and the report gives recall@1, recall@k, the
+mean reciprocal rank (0 when the chunk is not in the top ``fetch_k``) and
+the mean rank of the chunks found. Dense retrieval uses the deterministic
+HashingEmbedding stand-in.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.stand_ins import HashingEmbedding, workbook_to_markdown
+from benchmarks.synthetic import SIZES, generate_workbook
+from tools.bm25_index import BM25Index, reciprocal_rank_fusion
+from tools.table_chunker import _split_cells, chunk_markdown_tables
+
+
+def build_queries(chunks: List[Dict]) -> List[Dict]:
+    queries = []
+    for chunk_no, chunk in enumerate(chunks):
+        if chunk['metadata'].get('chunk_type') != 'table':
+            continue
+        lines = [line for line in chunk['text'].splitlines() if line.startswith('|')]
+        columns = _split_cells(lines[0])
+        for row in lines[2:]:
+            cells = _split_cells(row)
+            for column, value in list(zip(columns, cells, strict=False))[1:]:
+                if value:
+                    queries.append({'query': f"{cells[0]} {column} {value}", 'relevant': f"c{chunk_no}"})
+                    break
+    return queries
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    return float(np.percentile(samples, pct)) * 1000 if samples else 0.0
+
+
+def sample(queries: List[Dict], count: Optional[int]) -> List[Dict]:
+    """Every n-th query, so a capped run still covers every sheet."""
+    if not count or len(queries) <= count:
+        return queries
+    step = len(queries) / count
+    return [queries[int(i * step)] for i in range(count)]
+
+
+def run(workbooks: List[str], k: int, fetch_k: int, max_chars: int, max_queries: Optional[int] = None) -> Dict:
+    chunks = []
+    for path in workbooks:
+        chunks.extend(chunk_markdown_tables(workbook_to_markdown(path), source=os.path.basename(path),
+                                            max_chars=max_chars))
+    ids = [f"c{i}" for i in range(len(chunks))]
+    embedding = HashingEmbedding()
+    matrix = embedding.embed_documents([chunk['text'] for chunk in chunks])
+    bm25 = BM25Index()
+    bm25.add_many((doc_id, chunk['text'], chunk['metadata']) for doc_id, chunk in zip(ids, chunks, strict=True))
+
+    def dense(query: str, n: int) -> List[str]:
+        scores = matrix @ embedding.embed_query(query)
+        return [ids[i] for i in np.argsort(-scores)[:n]]
+
+    def sparse(query: str, n: int) -> List[str]:
+        return [doc_id for doc_id, _ in bm25.search(query, k=n)]
+
+    def hybrid(query: str, n: int) -> List[str]:
+        return [doc_id for doc_id, _ in reciprocal_rank_fusion([dense(query, fetch_k), sparse(query, fetch_k)],
+                                                               limit=n)]
+
+    queries = sample(build_queries(chunks), max_queries)
+    report = {'workbooks': [os.path.basename(path) for path in workbooks], 'chunks': len(chunks),
+              'queries': len(queries), 'k': k, 'fetch_k': fetch_k, 'modes': {}}
+    for name, retrieve in (('dense', dense), ('bm25', sparse), ('hybrid', hybrid)):
+        ranks, latencies = [], []
+        for item in queries:
+            start = time.perf_counter()
+            results = retrieve(item['query'], fetch_k)
+            latencies.append(time.perf_counter() - start)
+            ranks.append(results.index(item['relevant']) + 1 if item['relevant'] in results else None)
+        found = [rank for rank in ranks if rank is not None]
+        total = len(queries) or 1
+        report['modes'][name] = {
+            'recall@1': sum(rank == 1 for rank in found) / total,
+            f'recall@{k}': sum(rank <= k for rank in found) / total,
+            'mrr': sum(1 / rank for rank in found) / total,
+            'mean_rank_found': float(np.mean(found)) if found else None,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', default='small', help=f"synthetic workbook size, from {list(SIZES)}")
+    parser.add_argument('--workbooks', help='glob of workbooks to index instead of a synthetic one')
+    parser.add_argument('-k', type=int, default=5)
+    parser.add_argument('--fetch-k', type=int, default=20)
+    parser.add_argument('--max-chars', type=int, default=300, help='chunk size passed to the table chunker')
+    parser.add_argument('--queries', type=int, default=500, help='evaluate at most this many queries')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args()
+
+    workdir = None
+    if args.workbooks:
+        workbooks = sorted(glob.glob(args.workbooks, recursive=True))
+        if not workbooks:
+            parser.error(f"No workbooks match {args.workbooks}")
+    else:
+        if args.size not in SIZES:
+            parser.error(f"Unknown size {args.size}, expected one of {list(SIZES)}")
+        workdir = tempfile.mkdtemp(prefix=f"bench_hybrid_{args.size}_")
+        workbooks = [os.path.join(workdir, 'sites.xlsx')]
+        generate_workbook(workbooks[0], SIZES[args.size]['rows'], SIZES[args.size]['sheets'])
+    try:
+        report = run(workbooks, args.k, args.fetch_k, args.max_chars, args.queries)
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    if report['chunks'] <= args.k * 10:
+        print(f"Warning: only {report['chunks']} chunks for k={args.k}, recall@{args.k} says little", file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""Ingestion and retrieval benchmark for the Excel and Graph RAG tools.
+
+Usage:
+    python -m benchmarks.bench_rag [--sizes small,medium] [--cases excel-local,excel-llama,graph-llama]
+                                   [--output report.json] [--baseline previous.json]
+
+Synthetic workbooks and PDFs are generated per size (see benchmarks.synthetic)
+and every case runs in its own subprocess so peak RSS is per case. Hosted
+services are replaced by deterministic stand-ins (benchmarks.stand_ins), so
+numbers are comparable between runs and need no API keys.
+
+Cases:
+  excel-local  table chunker + BM25 + memmap embeddings, the ExcelRagTool retrieval path
+  excel-llama  ExcelIndexManager ingestion and hybrid query engine
+  graph-llama  GraphIndexManager ingestion and hybrid query engine
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.synthetic import SIZES, generate_pdf, generate_workbook
+
+CASES = ['excel-local', 'excel-llama', 'graph-llama']
+QUERIES = 50
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def site_queries(sites: List[Dict], count: int = QUERIES) -> List[str]:
+    step = max(len(sites) // count, 1)
+    return [f"What is the capacity in MW of {site['Name']} operated by {site['Operator']} in {site['Suburb']}?"
+            for site in sites[::step][:count]]
+
+
+def time_queries(run_query: Callable[[str], object], queries: List[str]) -> Dict:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        run_query(query)
+        latencies.append(time.perf_counter() - start)
+    return {
+        'queries': len(latencies),
+        'query_p50_ms': float(np.percentile(latencies, 50)) * 1000,
+        'query_p95_ms': float(np.percentile(latencies, 95)) * 1000,
+        'queries_per_s': len(latencies) / sum(latencies) if sum(latencies) else 0.0,
+    }
+
+
+def case_excel_local(size: Dict, workdir: str) -> Dict:
+    from benchmarks.stand_ins import HashingEmbedding, workbook_to_markdown
+    from tools.bm25_index import BM25Index, reciprocal_rank_fusion
+    from tools.embedding_store import MemmapEmbeddingStore
+    from tools.table_chunker import chunk_markdown_tables
+
+    workbook = os.path.join(workdir, 'sites.xlsx')
+    sites = generate_workbook(workbook, size['rows'], size['sheets'])
+    index_dir = os.path.join(workdir, 'index')
+    embedding = HashingEmbedding()
+
+    start = time.perf_counter()
+    chunks = chunk_markdown_tables(workbook_to_markdown(workbook), source='sites.xlsx')
+    ids = [f"c{i}" for i in range(len(chunks))]
+    bm25 = BM25Index(os.path.join(index_dir, 'bm25.json'))
+    bm25.add_many((doc_id, chunk['text'], chunk['metadata']) for doc_id, chunk in zip(ids, chunks, strict=True))
+    bm25.save()
+    store = MemmapEmbeddingStore(os.path.join(index_dir, 'embeddings'))
+    store.add(ids, embedding.embed_documents([chunk['text'] for chunk in chunks]))
+    ingest_s = time.perf_counter() - start
+
+    def run_query(query: str):
+        dense = [doc_id for doc_id, _ in store.search(embedding.embed_query(query), k=20)]
+        sparse = [doc_id for doc_id, _ in bm25.search(query, k=20)]
+        return reciprocal_rank_fusion([dense, sparse], limit=5)
+
+    return {'ingest_s': ingest_s, 'rows_per_s': len(sites) / ingest_s, 'chunks': len(chunks),
+            'chunks_per_s': len(chunks) / ingest_s, 'index_bytes': dir_size(index_dir),
+            **time_queries(run_query, site_queries(sites))}
+
+
+def case_excel_llama(size: Dict, workdir: str) -> Dict:
+    from llama_index.core import Settings
+    from llama_index.core.node_parser import MarkdownElementNodeParser
+
+    from benchmarks.stand_ins import LocalWorkbookParser, llama_stand_ins
+    from tools.excel_index_manager import ExcelIndexManager
+
+    embed_model, llm = llama_stand_ins()
+    Settings.embed_model, Settings.llm = embed_model, llm
+    workbook = os.path.join(workdir, 'sites.xlsx')
+    sites = generate_workbook(workbook, size['rows'], size['sheets'])
+    index_dir = os.path.join(workdir, 'index')
+    manager = ExcelIndexManager(persist_dir=os.path.join(index_dir, 'storage'),
+                                chroma_dir=os.path.join(index_dir, 'chroma'), llm=llm)
+
+    start = time.perf_counter()
+    nodes = manager.ingest([workbook], LocalWorkbookParser(),
+                           MarkdownElementNodeParser(llm=llm, num_workers=1),
+                           os.path.join(workdir, 'processed'))
+    ingest_s = time.perf_counter() - start
+    engine = manager.get_query_engine()
+
+    return {'ingest_s': ingest_s, 'rows_per_s': len(sites) / ingest_s, 'chunks': nodes,
+            'chunks_per_s': nodes / ingest_s, 'index_bytes': dir_size(index_dir),
+            **time_queries(engine.query, site_queries(sites))}
+
+
+def case_graph_llama(size: Dict, workdir: str) -> Dict:
+    from benchmarks.stand_ins import llama_stand_ins
+    from tools.graph_index_manager import GraphIndexManager
+    from tools.triplet_cache import TripletCache
+
+    embed_model, llm = llama_stand_ins()
+    pdf_dir = os.path.join(workdir, 'pdfs')
+    os.makedirs(pdf_dir)
+    sites = generate_pdf(os.path.join(pdf_dir, 'report.pdf'), size['pages'])
+    index_dir = os.path.join(workdir, 'index')
+    manager = GraphIndexManager(persist_dir=index_dir, llm=llm, embed_model=embed_model,
+                                triplet_cache=TripletCache(os.path.join(workdir, 'triplets.sqlite3')))
+
+    start = time.perf_counter()
+    manager.ingest_new(pdf_dir, os.path.join(workdir, 'processed'))
+    ingest_s = time.perf_counter() - start
+    engine = manager.get_query_engine()
+    chunks = len(manager.get_index().docstore.docs)
+
+    return {'ingest_s': ingest_s, 'pages_per_s': size['pages'] / ingest_s, 'chunks': chunks,
+            'chunks_per_s': chunks / ingest_s, 'index_bytes': dir_size(index_dir),
+            **time_queries(engine.query, site_queries(sites))}
+
+
+CASE_FUNCTIONS = {'excel-local': case_excel_local, 'excel-llama': case_excel_llama, 'graph-llama': case_graph_llama}
+
+
+def run_case(case: str, size_name: str) -> Dict:
+    # Tool modules attach file log handlers under logs/ at import time.
+    os.makedirs('logs', exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix=f"bench_{case}_{size_name}_")
+    try:
+        result = CASE_FUNCTIONS[case](SIZES[size_name], workdir)
+    except ImportError as e:
+        result = {'skipped': f"missing dependency: {e.name}"}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    # ru_maxrss is reported in kilobytes on Linux.
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Return regressions where a metric got worse than baseline by more than ``tolerance``."""
+    lower_is_better = ('ingest_s', 'query_p50_ms', 'query_p95_ms', 'peak_rss_mb', 'index_bytes')
+    regressions = []
+    for key, result in report['results'].items():
+        previous = baseline.get('results', {}).get(key, {})
+        for metric in lower_is_better:
+            if metric in result and previous.get(metric):
+                change = (result[metric] - previous[metric]) / previous[metric]
+                if change > tolerance:
+                    regressions.append(f"{key} {metric}: {previous[metric]:.2f} -> {result[metric]:.2f} "
+                                       f"(+{change:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='small,medium', help=f"comma separated, from {list(SIZES)}")
+    parser.add_argument('--cases', default=','.join(CASES), help=f"comma separated, from {CASES}")
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--baseline', help='previous JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative regression vs baseline')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    parser.add_argument('--size', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args.size)))
+        return
+
+    report = {'sizes': {name: SIZES[name] for name in args.sizes.split(',')}, 'results': {}}
+    for size_name in args.sizes.split(','):
+        for case in args.cases.split(','):
+            completed = subprocess.run([sys.executable, '-m', 'benchmarks.bench_rag', '--run-case', case,
+                                        '--size', size_name], capture_output=True, text=True)
+            key = f"{case}/{size_name}"
+            if completed.returncode != 0:
+                report['results'][key] = {'error': completed.stderr.strip().splitlines()[-1:]}
+            else:
+                report['results'][key] = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(key, json.dumps(report['results'][key]), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""Cold start time and memory of a worker, with tools imported lazily or all up front.
+
+Usage:
+    python -m benchmarks.bench_startup [--cases lazy,eager,app] [--repeat 3] [--output report.json]
+                                       [--importtime] [--baseline previous.json] [--budget SECONDS]
+
+Every run is a fresh interpreter that imports app_state and builds AppState,
+which is what each gunicorn worker does. The eager case then imports every
+registered tool, as app_state did before tools were loaded on first use,
+so the difference between the cases is what the lazy registry saves. The
+app case imports main, i.e. the full create_app(), and reports its
+per-phase timings from startup_profiler. --importtime adds a
+``python -X importtime`` breakdown of importing main.
+
+The run fails if a requested case crashed or was skipped. With --baseline
+it also fails if any timing or memory figure regressed by more than
+--tolerance or is missing; --budget fails it if the lazy or app startup
+takes longer than the given number of seconds. Run from the repository root,
+since AppState reads config/ and cache/.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from startup_profiler import importtime_report
+
+CASES = ('lazy', 'eager', 'app')
+
+
+def run_case(case: str) -> Dict:
+    # Tool modules attach file log handlers under logs/ at import time.
+    os.makedirs('logs', exist_ok=True)
+    started = time.perf_counter()
+    try:
+        if case == 'app':
+            import main  # noqa: F401 - importing main runs create_app()
+            from app_state import tools_dict
+            from startup_profiler import profiler
+            finished = time.perf_counter()
+            phases = {phase['phase']: phase['seconds'] for phase in profiler.report()['phases']}
+            return {
+                'startup_s': finished - started,
+                'import_s': phases.get('imports', 0.0),
+                'app_state_s': phases.get('app_state', 0.0),
+                'phases': phases,
+                'modules': len(sys.modules),
+                'tools_loaded': len(tools_dict.loaded()),
+                'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            }
+        from app_state import AppState, tools_dict
+        imported = time.perf_counter()
+        AppState()
+        ready = time.perf_counter()
+        failed = tools_dict.preload() if case == 'eager' else []
+    except ImportError as e:
+        return {'skipped': f"missing dependency: {e.name}"}
+    finished = time.perf_counter()
+    return {
+        'import_s': imported - started,
+        'app_state_s': ready - imported,
+        'startup_s': finished - started,
+        'modules': len(sys.modules),
+        'tools_loaded': len(tools_dict.loaded()),
+        'tools_failed': failed,
+        # ru_maxrss is reported in kilobytes on Linux.
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def summarise(runs: List[Dict]) -> Dict:
+    """Median of each numeric metric over the runs; other fields from the last run."""
+    if any('skipped' in run or 'error' in run for run in runs):
+        return runs[-1]
+    summary = dict(runs[-1])
+    for metric, value in runs[-1].items():
+        if isinstance(value, (int, float)):
+            summary[metric] = statistics.median(run[metric] for run in runs)
+    summary['runs'] = len(runs)
+    return summary
+
+
+def failed_cases(report: Dict) -> List[str]:
+    """Cases that crashed or were skipped, which have no figures to check."""
+    return [f"{case} did not run: {result.get('error') or result.get('skipped')}"
+            for case, result in report['results'].items() if 'error' in result or 'skipped' in result]
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Return regressions where a metric got worse than baseline by more than ``tolerance`` or went missing."""
+    lower_is_better = ('startup_s', 'import_s', 'app_state_s', 'peak_rss_mb', 'modules')
+    regressions = []
+    for case, result in report['results'].items():
+        previous = baseline.get('results', {}).get(case, {})
+        for metric in lower_is_better:
+            if not previous.get(metric):
+                continue
+            if metric not in result:
+                regressions.append(f"{case} {metric}: {previous[metric]:.2f} -> missing")
+            else:
+                change = (result[metric] - previous[metric]) / previous[metric]
+                if change > tolerance:
+                    regressions.append(f"{case} {metric}: {previous[metric]:.2f} -> {result[metric]:.2f} "
+                                       f"(+{change:.0%})")
+    return regressions
+
+
+def over_budget(report: Dict, budget: float) -> List[str]:
+    # Cases without a startup time are reported by failed_cases.
+    return [f"{case} startup_s: {result['startup_s']:.2f} > budget {budget:.2f}"
+            for case, result in report['results'].items()
+            if case in ('lazy', 'app') and 'startup_s' in result and result['startup_s'] > budget]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', default=','.join(CASES), help=f"comma separated, from {CASES}")
+    parser.add_argument('--repeat', type=int, default=3, help='fresh interpreters per case')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--importtime', action='store_true', help='add a -X importtime breakdown of importing main')
+    parser.add_argument('--baseline', help='previous JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative regression vs baseline')
+    parser.add_argument('--budget', type=float, help='fail if lazy or app startup exceeds this many seconds')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case)))
+        return
+
+    report = {'results': {}}
+    for case in args.cases.split(','):
+        runs = []
+        for _ in range(args.repeat):
+            completed = subprocess.run([sys.executable, '-m', 'benchmarks.bench_startup', '--run-case', case],
+                                       capture_output=True, text=True)
+            if completed.returncode != 0:
+                runs.append({'error': completed.stderr.strip().splitlines()[-1:]})
+                break
+            runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        report['results'][case] = summarise(runs)
+        print(case, json.dumps(report['results'][case]), flush=True)
+
+    lazy, eager = report['results'].get('lazy', {}), report['results'].get('eager', {})
+    if lazy.get('startup_s') and eager.get('startup_s'):
+        report['lazy_saving'] = {
+            'startup_s': eager['startup_s'] - lazy['startup_s'],
+            'peak_rss_mb': eager['peak_rss_mb'] - lazy['peak_rss_mb'],
+        }
+        print('lazy saving', json.dumps(report['lazy_saving']))
+
+    if args.importtime:
+        report['importtime'] = importtime_report('main')
+        print('importtime', json.dumps(report['importtime']['slowest'][:10]))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    failures = failed_cases(report)
+    if args.budget:
+        failures += over_budget(report, args.budget)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            failures += compare(report, json.load(f), args.tolerance)
+    for line in failures:
+        print(f"FAIL {line}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Check the local HTML extractors against saved pages.
+
+Usage:
+    python -m benchmarks.check_html_extract [--fixtures benchmarks/fixtures/html] [--update]
+
+Every ``<page>.html`` in the fixtures directory has a ``<page>.expected.json``
+holding, per scraper schema, the extraction expected from it or null where
+the extractor should give up and leave the page to Firecrawl. Each page is
+run through ``extract_locally`` for every schema; a result must either be
+None or validate against the schema, and must match the expectation. The
+run exits non-zero on any failure. --update rewrites the expectations from
+the current output, for review in the diff.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import Dict, List
+
+from tools.html_extract import extract_locally
+from tools.scraper_tools import CompanyOverviewExtractSchema, DataCentersExtractSchema
+
+SCHEMAS = (CompanyOverviewExtractSchema, DataCentersExtractSchema)
+default_fixtures = os.path.join(os.path.dirname(__file__), 'fixtures', 'html')
+
+
+def extract_page(path: str) -> Dict:
+    """The local extraction of the page at ``path`` for each schema, by schema name."""
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    url = f"https://fixtures.invalid/{os.path.basename(path)}"
+    return {schema.__name__: extract_locally(html, schema, url) for schema in SCHEMAS}
+
+
+def check_page(path: str, extractions: Dict, expected: Dict) -> List[str]:
+    failures = []
+    name = os.path.basename(path)
+    for schema in SCHEMAS:
+        result = extractions[schema.__name__]
+        if result is not None:
+            try:
+                schema.model_validate(result['extract'])
+            except (KeyError, ValueError) as e:
+                failures.append(f"{name} {schema.__name__}: not schema valid: {e}")
+                continue
+        actual = result['extract'] if result is not None else None
+        if schema.__name__ not in expected:
+            failures.append(f"{name} {schema.__name__}: no expectation recorded")
+        elif actual != expected[schema.__name__]:
+            failures.append(f"{name} {schema.__name__}: expected {json.dumps(expected[schema.__name__])}, "
+                            f"got {json.dumps(actual)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', default=default_fixtures, help='directory of saved pages')
+    parser.add_argument('--update', action='store_true', help='rewrite the expected extractions')
+    args = parser.parse_args()
+
+    pages = sorted(glob.glob(os.path.join(args.fixtures, '*.html')))
+    if not pages:
+        parser.error(f"No pages in {args.fixtures}")
+    failures = []
+    for path in pages:
+        extractions = extract_page(path)
+        expected_path = f"{os.path.splitext(path)[0]}.expected.json"
+        if args.update:
+            with open(expected_path, 'w') as f:
+                json.dump({schema: result['extract'] if result else None
+                           for schema, result in extractions.items()}, f, indent=2)
+                f.write('\n')
+            continue
+        try:
+            with open(expected_path, 'r') as f:
+                expected = json.load(f)
+        except FileNotFoundError:
+            expected = {}
+        page_failures = check_page(path, extractions, expected)
+        print(f"{'FAIL' if page_failures else 'ok'} {os.path.basename(path)}")
+        failures += page_failures
+    for line in failures:
+        print(f"FAIL {line}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Deterministic local stand-ins for the hosted services used by the RAG tools.
+
+Benchmarks use these so results are reproducible and need no API keys.
+"""
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+import openpyxl
+
+_word = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedding:
+    """Bag of hashed words and character trigrams, L2 normalised.
+
+    Captures fuzzy lexical similarity the way a small dense model would,
+    without the exact-token precision of BM25.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = _word.findall(text.lower())
+        grams = [word[i:i + 3] for word in words for i in range(max(len(word) - 2, 1))]
+        return words + grams
+
+    def embed_query(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return np.vstack([self.embed_query(text) for text in texts]) if texts else np.zeros((0, self.dim), np.float32)
+
+
+def workbook_to_markdown(path: str) -> str:
+    """Render a workbook as LlamaParse-style markdown: one heading and table per sheet."""
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    parts = []
+    for sheet in workbook.worksheets:
+        rows = [["" if value is None else str(value) for value in row]
+                for row in sheet.iter_rows(values_only=True)]
+        rows = [row for row in rows if any(row)]
+        if not rows:
+            continue
+        parts.append(f"# {sheet.title}\n")
+        parts.append("| " + " | ".join(rows[0]) + " |")
+        parts.append("|" + "---|" * len(rows[0]))
+        parts.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        parts.append("")
+    workbook.close()
+    return "\n".join(parts)
+
+
+class LocalWorkbookParser:
+    """Stand-in for LlamaParse: renders workbooks to markdown locally."""
+
+    def load_data(self, files):
+        from llama_index.core import Document
+
+        files = [files] if isinstance(files, str) else files
+        return [Document(text=workbook_to_markdown(path), metadata={'file_name': path}) for path in files]
+
+
+def llama_stand_ins(dim: int = 256):
+    """Return (embed_model, llm) llama-index stand-ins: hashing embeddings and MockLLM."""
+    from llama_index.core.embeddings import BaseEmbedding
+    from llama_index.core.llms import MockLLM
+
+    hashing = HashingEmbedding(dim)
+
+    class HashingLlamaEmbedding(BaseEmbedding):
+        def _get_query_embedding(self, query: str) -> List[float]:
+            return hashing.embed_query(query).tolist()
+
+        def _get_text_embedding(self, text: str) -> List[float]:
+            return hashing.embed_query(text).tolist()
+
+        async def _aget_query_embedding(self, query: str) -> List[float]:
+            return self._get_query_embedding(query)
+
+    return HashingLlamaEmbedding(model_name=f"hashing-{dim}"), MockLLM(max_tokens=64)
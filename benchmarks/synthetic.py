@@ -0,0 +1,109 @@
+"""Synthetic workbooks and PDFs shaped like the documents under src_docs.
+
+Content is generated from a fixed seed so every run indexes the same text.
+"""
+import random
+from typing import Dict, List
+
+import openpyxl
+
+OPERATORS = ["Equinix", "Digital Realty", "STT GDC", "NTT", "AirTrunk", "Keppel DC", "Princeton Digital",
+             "Global Switch", "CDC", "NextDC", "Iron Mountain", "Bridge DC", "Vantage", "Yondr"]
+LOCATIONS = [("Jurong", "Singapore", "Singapore"), ("Tai Seng", "Singapore", "Singapore"),
+             ("Cyberjaya", "Kuala Lumpur", "Malaysia"), ("Nusajaya", "Johor Bahru", "Malaysia"),
+             ("Bang Na", "Bangkok", "Thailand"), ("Chonburi", "Chonburi", "Thailand"),
+             ("Macquarie Park", "Sydney", "Australia"), ("Port Melbourne", "Melbourne", "Australia"),
+             ("Inzai", "Tokyo", "Japan"), ("Kwai Chung", "Hong Kong", "Hong Kong"),
+             ("Cikarang", "Jakarta", "Indonesia"), ("Navi Mumbai", "Mumbai", "India")]
+REGIONS = ["London", "South East England", "South West England", "Midlands", "East Anglia",
+           "North East England", "North West England", "Wales", "Scotland", "Northern Ireland"]
+
+SIZES = {
+    'small': {'rows': 200, 'sheets': 2, 'pages': 5},
+    'medium': {'rows': 2000, 'sheets': 4, 'pages': 40},
+    'large': {'rows': 20000, 'sheets': 8, 'pages': 200},
+}
+
+
+def site_rows(rows: int, seed: int = 7) -> List[Dict]:
+    rng = random.Random(seed)
+    sites = []
+    for i in range(rows):
+        suburb, city, country = rng.choice(LOCATIONS)
+        operator = rng.choice(OPERATORS)
+        sites.append({
+            'Name': f"{operator.split()[0].upper()}-{city[:3].upper()}{i + 1}",
+            'Operator': operator,
+            'Suburb': suburb,
+            'City': city,
+            'Country': country,
+            'MW': round(rng.uniform(2, 120), 1),
+            'Operational': rng.choice(["Yes", "No"]),
+            'Year': rng.randint(2008, 2028),
+        })
+    return sites
+
+
+def generate_workbook(path: str, rows: int, sheets: int, seed: int = 7) -> List[Dict]:
+    """Write a workbook of data centre sites plus an EV charger pivot like EV_Charge_Test.xlsx."""
+    sites = site_rows(rows, seed)
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    per_sheet = max(len(sites) // max(sheets - 1, 1), 1)
+    for sheet_no in range(max(sheets - 1, 1)):
+        sheet = workbook.create_sheet(f"Sites {sheet_no + 1}")
+        chunk = sites[sheet_no * per_sheet:(sheet_no + 1) * per_sheet]
+        sheet.append(list(sites[0].keys()))
+        for site in chunk:
+            sheet.append(list(site.values()))
+    rng = random.Random(seed)
+    sheet = workbook.create_sheet("EV Chargers")
+    sheet.append(["Region", "Operational", "Planned"])
+    for region in REGIONS:
+        sheet.append([region, rng.randint(100, 3000), rng.randint(100, 3000)])
+    workbook.save(path)
+    return sites
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def generate_pdf(path: str, pages: int, seed: int = 11, lines_per_page: int = 48) -> List[Dict]:
+    """Write an uncompressed text PDF of analyst-style paragraphs about data centre sites."""
+    sites = site_rows(pages * lines_per_page // 2, seed)
+    sentences = [f"{site['Operator']} operates {site['Name']}, a {site['MW']} MW data centre in "
+                 f"{site['Suburb']}, {site['City']}, {site['Country']}, commissioned in {site['Year']}."
+                 for site in sites]
+    lines = []
+    for sentence in sentences:
+        while len(sentence) > 90:
+            cut = sentence.rfind(' ', 0, 90)
+            lines.append(sentence[:cut])
+            sentence = sentence[cut + 1:]
+        lines.append(sentence)
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_no in range(pages):
+        page_lines = lines[page_no * lines_per_page:(page_no + 1) * lines_per_page] or ["(intentionally blank)"]
+        body = "BT /F1 10 Tf 14 TL 50 780 Td " + " ".join(f"({_pdf_escape(line)}) '" for line in page_lines) + " ET"
+        objects.append(f"<< /Length {len(body)} >>\nstream\n{body}\nendstream")
+        content_ref = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, 'wb') as f:
+        f.write(out)
+    return sites
@@ -0,0 +1,220 @@
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Set, Type
+
+import yaml
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/config_registry.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+config_dir = 'config'
+
+
+class _ConfigModel(BaseModel):
+    # Editors and older files add keys the code doesn't read yet (e.g. output_file), keep them.
+    model_config = ConfigDict(extra='allow')
+
+    @field_validator('tools', 'agents', 'tasks', 'depends_on', mode='before', check_fields=False)
+    @classmethod
+    def _none_as_empty(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return [value]
+        return value or []
+
+
+class AgentConfig(_ConfigModel):
+    name: str
+    role: str
+    goal: str
+    backstory: str
+    delegate: bool = False
+    tools: List[str] = []
+
+
+class TaskConfig(_ConfigModel):
+    name: str
+    description: str
+    agent: Optional[str] = None
+    expected_output: Optional[str] = None
+    pydantic_class: Optional[str] = None
+    tools: List[str] = []
+    # Tasks in the same crew whose output this task needs as context
+    depends_on: List[str] = []
+
+
+class CrewConfig(_ConfigModel):
+    name: str
+    agents: List[str] = []
+    tasks: List[str] = []
+
+
+class SmartResearchConfig(_ConfigModel):
+    name: str
+    prompt_engineer_crew: Optional[str] = None
+    research_crew: Optional[str] = None
+    research_review_crew: Optional[str] = None
+
+
+# kind -> (file name, wrapper key of each list entry, model)
+config_files: Dict[str, tuple] = {
+    'agents': ('agents.yaml', 'Agent', AgentConfig),
+    'tasks': ('tasks.yaml', 'Task', TaskConfig),
+    'crews': ('crews.yaml', 'Crew', CrewConfig),
+    'smart_research': ('smart_research.yaml', None, SmartResearchConfig),
+}
+
+
+class ConfigRegistry:
+    """Agent, task, crew and smart research configs parsed once and indexed by name.
+
+    Each ``config/*.yaml`` file is read and validated a single time into
+    typed models held in dicts keyed by name, so lookups are O(1) and no
+    lookup ever touches the disk. The raw entry lists are kept alongside
+    for the editors, which address entries by position. Entries that fail
+    validation are logged and left out of the index.
+
+    Re-indexing a file reports the agents, tasks and crews affected by the
+    change, including the tasks and crews that use a changed agent, to the
+    registered listeners so they can drop just those cached objects.
+    """
+
+    def __init__(self, directory: str = config_dir):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Any] = {}
+        self._index: Dict[str, Dict[str, BaseModel]] = {}
+        self._listeners: List[Callable[[], Optional[Callable]]] = []
+        # Shared config version, kept current across workers by ConfigWatcher.
+        self.version = 0
+        for kind in config_files:
+            self.load_file(kind)
+
+    def path(self, kind: str) -> str:
+        return os.path.join(self.directory, config_files[kind][0])
+
+    def load_file(self, kind: str):
+        """(Re)parse the file for ``kind`` and rebuild its index."""
+        try:
+            with open(self.path(kind), 'r') as f:
+                data = yaml.safe_load(f)
+        except FileNotFoundError:
+            data = None
+        except (OSError, yaml.YAMLError) as e:
+            logger.error(f"Error loading {self.path(kind)}: {e}")
+            data = None
+        if kind == 'smart_research':
+            data = data or {'configs': []}
+            data.setdefault('configs', [])
+        self.set_entries(kind, data or [])
+
+    def set_entries(self, kind: str, data: Any):
+        """Replace the entries for ``kind`` with ``data`` in its file layout and re-index them."""
+        _, key, model = config_files[kind]
+        entries = data['configs'] if kind == 'smart_research' else data
+        index = self._build_index(kind, key, model, entries or [])
+        with self._lock:
+            previous = self._index.get(kind)
+            self._entries[kind] = data
+            self._index[kind] = index
+        logger.info(f"Indexed {len(index)} {kind} from {self.path(kind)}")
+        if previous is None:
+            return
+        changed = {name for name in previous.keys() | index.keys() if previous.get(name) != index.get(name)}
+        if changed:
+            self._notify(self.dependents(kind, changed))
+
+    def add_listener(self, listener: Callable[[Dict[str, Set[str]]], None]):
+        """Call ``listener`` with the affected names by kind whenever entries change.
+
+        Bound methods are held weakly, so a manager going away unregisters itself.
+        """
+        if hasattr(listener, '__self__'):
+            self._listeners.append(weakref.WeakMethod(listener))
+        else:
+            self._listeners.append(lambda: listener)
+
+    def _notify(self, affected: Dict[str, Set[str]]):
+        logger.info(f"Config change affects {({kind: sorted(names) for kind, names in affected.items() if names})}")
+        self._listeners = [ref for ref in self._listeners if ref() is not None]
+        for ref in list(self._listeners):
+            listener = ref()
+            if listener is None:
+                continue
+            try:
+                listener(affected)
+            except Exception as e:
+                logger.error(f"Config change listener failed: {e}")
+
+    def dependents(self, kind: str, names: Set[str]) -> Dict[str, Set[str]]:
+        """The agents, tasks and crews affected by a change to ``names`` of ``kind``."""
+        affected: Dict[str, Set[str]] = {'agents': set(), 'tasks': set(), 'crews': set()}
+        if kind in affected:
+            affected[kind] |= set(names)
+        with self._lock:
+            tasks = self._index.get('tasks', {})
+            crews = self._index.get('crews', {})
+            affected['tasks'] |= {name for name, task in tasks.items() if task.agent in affected['agents']}
+            affected['crews'] |= {name for name, crew in crews.items()
+                                  if affected['agents'] & set(crew.agents) or affected['tasks'] & set(crew.tasks)}
+        return affected
+
+    @staticmethod
+    def _build_index(kind: str, key: Optional[str], model: Type[BaseModel],
+                     entries: List[Any]) -> Dict[str, BaseModel]:
+        index: Dict[str, BaseModel] = {}
+        for position, entry in enumerate(entries):
+            values = entry.get(key) if key and isinstance(entry, dict) else entry
+            try:
+                config = model.model_validate(values)
+            except ValidationError as e:
+                logger.error(f"Skipping invalid {kind} entry {position}: {e}")
+                continue
+            if config.name in index:
+                logger.warning(f"Duplicate {kind} name {config.name!r} at entry {position}, keeping the first")
+                continue
+            index[config.name] = config
+        return index
+
+    def entries(self, kind: str) -> Any:
+        """The file contents for ``kind`` as loaded, for positional editing."""
+        with self._lock:
+            return self._entries[kind]
+
+    def names(self, kind: str) -> List[str]:
+        with self._lock:
+            return list(self._index[kind])
+
+    def get(self, kind: str, name: str) -> Optional[BaseModel]:
+        with self._lock:
+            return self._index[kind].get(name)
+
+    def get_agent(self, name: str) -> Optional[AgentConfig]:
+        return self.get('agents', name)
+
+    def get_task(self, name: str) -> Optional[TaskConfig]:
+        return self.get('tasks', name)
+
+    def get_crew(self, name: str) -> Optional[CrewConfig]:
+        return self.get('crews', name)
+
+    def get_smart_research_config(self, name: str) -> Optional[SmartResearchConfig]:
+        return self.get('smart_research', name)
+
+
+_config_registry: Optional[ConfigRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_config_registry() -> ConfigRegistry:
+    global _config_registry
+    if _config_registry is None:
+        with _registry_lock:
+            if _config_registry is None:
+                _config_registry = ConfigRegistry()
+    return _config_registry
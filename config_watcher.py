@@ -0,0 +1,141 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config_registry import ConfigRegistry, config_files, get_config_registry
+from db_utils import db_path
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/config_registry.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+version_db_file = os.path.join(db_path, "config_versions.sqlite3")
+# Requests within this many seconds of the last check skip stat-ing the config files.
+check_interval = float(os.getenv("CONFIG_CHECK_INTERVAL_SECONDS", "1.0"))
+
+
+class ConfigWatcher:
+    """Keeps a ConfigRegistry in step with ``config/*.yaml`` across worker processes.
+
+    Every file has a version in a small SQLite table shared by all
+    gunicorn workers, bumped whenever a worker sees the file's mtime move
+    or an editor reports a save. On ``check`` each worker compares the
+    mtimes and shared versions with what it last saw and reparses only the
+    files that changed; the registry then invalidates just the cached
+    objects that depend on the changed entries.
+    """
+
+    def __init__(self, registry: ConfigRegistry, db_file: str = version_db_file,
+                 interval: float = check_interval):
+        self.registry = registry
+        self.db_file = db_file
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._seen: Dict[str, Tuple[Optional[int], int]] = {}  # kind -> (mtime_ns, version)
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        conn = sqlite3.connect(db_file)
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS config_versions (
+                kind TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                mtime_ns INTEGER
+            )
+            ''')
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Database error during config version setup: {e}")
+            raise
+        finally:
+            conn.close()
+        self.check(force=True)
+
+    def _mtime(self, kind: str) -> Optional[int]:
+        try:
+            return os.stat(self.registry.path(kind)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _shared_versions(self) -> Dict[str, int]:
+        conn = sqlite3.connect(self.db_file, timeout=5)
+        try:
+            return dict(conn.execute('SELECT kind, version FROM config_versions'))
+        except sqlite3.Error as e:
+            logger.error(f"Database error reading config versions: {e}")
+            return {}
+        finally:
+            conn.close()
+
+    def _publish(self, kind: str, mtime: Optional[int], force: bool = False) -> int:
+        """Record ``mtime`` for ``kind``, bumping its version unless another worker already did."""
+        conn = sqlite3.connect(self.db_file, timeout=5)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT version, mtime_ns FROM config_versions WHERE kind=?', (kind,)).fetchone()
+            if row is None:
+                version = 1
+                conn.execute('INSERT INTO config_versions VALUES (?, ?, ?)', (kind, version, mtime))
+            elif force or row[1] != mtime:
+                version = row[0] + 1
+                conn.execute('UPDATE config_versions SET version=?, mtime_ns=? WHERE kind=?', (version, mtime, kind))
+            else:
+                version = row[0]
+            conn.commit()
+            return version
+        except sqlite3.Error as e:
+            logger.error(f"Database error publishing config version for {kind}: {e}")
+            conn.rollback()
+            return self._seen.get(kind, (None, 0))[1]
+        finally:
+            conn.close()
+
+    def _sync_version(self):
+        self.registry.version = sum(version for _, version in self._seen.values())
+
+    def check(self, force: bool = False) -> int:
+        """Reparse config files changed since the last check. Returns the config version."""
+        if not force and time.monotonic() - self._last_check < self.interval:
+            return self.registry.version
+        with self._lock:
+            self._last_check = time.monotonic()
+            shared = self._shared_versions()
+            for kind in config_files:
+                mtime = self._mtime(kind)
+                seen = self._seen.get(kind)
+                if seen is not None and mtime == seen[0] and shared.get(kind) == seen[1]:
+                    continue
+                if seen is not None:
+                    logger.info(f"{self.registry.path(kind)} changed, reloading")
+                    self.registry.load_file(kind)
+                self._seen[kind] = (mtime, self._publish(kind, mtime))
+            self._sync_version()
+            return self.registry.version
+
+    def notify(self, kind: str) -> int:
+        """Reload ``kind`` after this process saved it and tell the other workers. Returns the config version."""
+        with self._lock:
+            self.registry.load_file(kind)
+            mtime = self._mtime(kind)
+            self._seen[kind] = (mtime, self._publish(kind, mtime, force=True))
+            self._sync_version()
+            logger.info(f"{self.registry.path(kind)} saved, config version {self.registry.version}")
+            return self.registry.version
+
+
+_config_watcher: Optional[ConfigWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def get_config_watcher() -> ConfigWatcher:
+    global _config_watcher
+    if _config_watcher is None:
+        with _watcher_lock:
+            if _config_watcher is None:
+                _config_watcher = ConfigWatcher(get_config_registry())
+    return _config_watcher
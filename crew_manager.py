@@ -1,9 +1,11 @@
 import logging
-import yaml
 import json
 import os
-from typing import Optional, Dict, Any, List
-from crewai import Crew
+import threading
+from typing import Optional, Dict, Any, List, Set, Tuple
+from crewai import Crew, Task
+from config_registry import CrewConfig
+from tools.dc_fact_store import record_crew_output
 #from collections.abc import Iterable
 
 # Configure logging
@@ -14,6 +16,73 @@ handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s -
 logger.addHandler(handler)
 
 
+def schedule_tasks(crew_name: str, named_tasks: List[Tuple[str, Task]], registry) -> List[Task]:
+    """Order a crew's tasks by their declared ``depends_on`` and run independent ones concurrently.
+
+    Tasks are sorted by dependency level, keeping the crew's order within a
+    level, and each task gets its dependencies as ``context``. A task runs
+    asynchronously unless it needs the output of an asynchronous task that
+    is still running, or one of those is on the same agent (a crewai Agent
+    keeps its executor on the instance, so two tasks can't run on it at
+    once); then it runs synchronously, which makes crewai wait for every
+    running task first. The last task is always synchronous, as crewai
+    allows a crew to end with at most one asynchronous task.
+
+    Only crews with a task that declares ``depends_on``, even as an empty
+    list for a task that needs no other output, are scheduled. The rest,
+    and crews with a cycle, keep their tasks sequential and in order. The
+    cached tasks are shared between crews, so scheduled tasks are copies.
+    """
+    names = [name for name, _ in named_tasks]
+    tasks = dict(named_tasks)
+    depends_on = {}
+    scheduled_crew = False
+    for name in names:
+        config = registry.get_task(name)
+        declared = config.depends_on if config else []
+        scheduled_crew = scheduled_crew or (config is not None and 'depends_on' in config.model_fields_set)
+        missing = [dep for dep in declared if dep not in tasks]
+        if missing:
+            logger.warning(f"Task {name} in crew {crew_name} depends on tasks not in the crew: {missing}")
+        depends_on[name] = [dep for dep in declared if dep in tasks and dep != name]
+    if not scheduled_crew:
+        return [task for _, task in named_tasks]
+    if len(tasks) != len(names):
+        logger.error(f"Crew {crew_name} lists a task twice, running its tasks in order")
+        return [task for _, task in named_tasks]
+
+    level: Dict[str, int] = {}
+    while len(level) < len(names):
+        ready = [name for name in names
+                 if name not in level and all(dep in level for dep in depends_on[name])]
+        if not ready:
+            logger.error(f"Crew {crew_name} has a dependency cycle among "
+                         f"{[name for name in names if name not in level]}, running its tasks in order")
+            return [task for _, task in named_tasks]
+        for name in ready:
+            level[name] = 1 + max((level[dep] for dep in depends_on[name]), default=-1)
+    order = sorted(names, key=lambda name: (level[name], names.index(name)))
+
+    running: Set[str] = set()
+    scheduled: Dict[str, Task] = {}
+    for position, name in enumerate(order):
+        # Tasks on agents with the same role share one agent once the crew is copied for a run.
+        role = getattr(tasks[name].agent, 'role', None)
+        is_async = (position < len(order) - 1 and not running & set(depends_on[name])
+                    and not any(getattr(tasks[other].agent, 'role', None) == role for other in running))
+        if is_async:
+            running.add(name)
+        else:
+            running.clear()
+        scheduled[name] = tasks[name].model_copy(update={'async_execution': is_async})
+    for name in order:
+        if depends_on[name]:
+            scheduled[name].context = [scheduled[dep] for dep in depends_on[name]]
+    logger.info(f"Crew {crew_name} schedule: "
+                + ", ".join(f"{name} ({'async' if scheduled[name].async_execution else 'sync'})" for name in order))
+    return [scheduled[name] for name in order]
+
+
 class CrewManager:
     def __init__(self, agent_manager, task_manager, inputs):
         #self.logger = logging.getLogger(__name__)
@@ -21,19 +90,23 @@ class CrewManager:
         self.task_manager = task_manager
         self.inputs = inputs
         self.last_execution_results = {}
-        self.crew_cache = {}
-        
-        # Load crews from file
-        try:
-            with open('config/crews.yaml', 'r') as f:
-                self.crews = yaml.safe_load(f) or []
-        except FileNotFoundError:
-            with open('config/crews.yaml', 'w') as f:
-                yaml.dump([], f)
-            self.crews = []
-        except Exception as e:
-            logger.error(f"Error loading crews: {str(e)}")
-            self.crews = []
+        self.crew_cache = {}  # crew name -> Crew template, copied for each run
+        self._cache_lock = threading.Lock()
+        self.registry = agent_manager.registry
+        self.registry.add_listener(self._invalidate)
+
+    def _invalidate(self, affected: Dict[str, Set[str]]):
+        for crew_name in affected['crews']:
+            if self.crew_cache.pop(crew_name, None) is not None:
+                logger.debug(f"Dropped cached crew {crew_name} after a config change")
+
+    @property
+    def crews(self) -> List[Dict[str, Any]]:
+        return self.registry.entries('crews')
+
+    @crews.setter
+    def crews(self, crews: List[Dict[str, Any]]):
+        self.registry.set_entries('crews', crews)
 
     def process_json_output(self, raw_output: Any) -> Dict[str, Any]:
         try:
@@ -71,7 +144,7 @@ class CrewManager:
             return {'error': 'No crew name provided'}
             
         try:
-            crew = self.create_crewai_crew(crew_name)
+            crew = self.crew_for_run(crew_name)
             if not crew:
                 return {'error': f'Could not create crew: {crew_name}'}
                 
@@ -83,6 +156,7 @@ class CrewManager:
                 
             # Store and return result
             self.last_execution_results[crew_name] = result
+            record_crew_output(crew_name, result.json_dict or result.pydantic or result.raw)
             if result.json_dict:
                 return {'result':result.json_dict}
             if result.pydantic:
@@ -95,11 +169,30 @@ class CrewManager:
             logger.error(f'Error executing crew {crew_name}: {str(e)}')
             return {'error': str(e)}
 
+    def crew_for_run(self, crew_name: str) -> Optional[Crew]:
+        """A fresh copy of the cached crew template, so each run starts with clean task outputs and agent state.
+
+        The copy keeps the template's agent sharing between the crew and its
+        tasks, and concurrent runs of the same crew never touch each other.
+        """
+        template = self.create_crewai_crew(crew_name)
+        if template is None:
+            return None
+        try:
+            return template.copy()
+        except Exception as e:
+            logger.error(f"Error copying crew {crew_name}, rebuilding it: {str(e)}")
+            with self._cache_lock:
+                self.crew_cache.pop(crew_name, None)
+            return self.create_crewai_crew(crew_name)
+
     def create_crewai_crew(self, crew_name: str) -> Optional[Crew]:
+        """The crew template for ``crew_name``, built once per config from the shared agents and tasks."""
         # Check cache first
-        if crew_name in self.crew_cache:
-            logger.debug(f"Returning cached crew for {crew_name}")
-            return self.crew_cache[crew_name]
+        with self._cache_lock:
+            if crew_name in self.crew_cache:
+                logger.debug(f"Returning cached crew for {crew_name}")
+                return self.crew_cache[crew_name]
 
         logger.debug(f"Creating crew with name: {crew_name}")
         crew_data = self.get_crewai_crew_by_name(crew_name)
@@ -108,7 +201,7 @@ class CrewManager:
             
             # Create agents with proper error handling and type checking
             agents = []
-            for agent_name in crew_data['agents']:
+            for agent_name in crew_data.agents:
                 agent = self.agent_manager.create_crewai_agent(agent_name)
                 if agent is None:
                     logger.error(f"Failed to create agent {agent_name} for crew {crew_name}")
@@ -117,12 +210,18 @@ class CrewManager:
             
             # Create tasks with proper error handling and type checking
             tasks = []
-            for task_name in crew_data['tasks']:
+            for task_name in crew_data.tasks:
                 task = self.task_manager.create_crewai_task(task_name)
                 if task is None:
                     logger.error(f"Failed to create task {task_name} for crew {crew_name}")
                     continue
-                tasks.append(task)
+                tasks.append((task_name, task))
+                # Crew.copy() re-binds each task to the copied crew agent with the same role,
+                # so every task's agent has to be one of the crew's agents.
+                if task.agent is not None and not any(agent is task.agent for agent in agents):
+                    logger.debug(f"Adding agent {task.agent.role} of task {task_name} to crew {crew_name}")
+                    agents.append(task.agent)
+            tasks = schedule_tasks(crew_name, tasks, self.registry)
             
             if not agents:
                 logger.error(f"No valid agents created for crew {crew_name}")
@@ -141,7 +240,8 @@ class CrewManager:
                 
                 crew = Crew(**crew_kwargs)
                 # Store in cache
-                self.crew_cache[crew_name] = crew
+                with self._cache_lock:
+                    self.crew_cache[crew_name] = crew
                 logger.debug(f"Successfully created and cached crew object for {crew_name}")
                 return crew
             except Exception as e:
@@ -151,25 +251,19 @@ class CrewManager:
             logger.error(f"No crew data found for name: {crew_name}")
             return None
 
-    def get_crewai_crew_by_name(self, crew_name: str) -> Optional[Dict[str, Any]]:
-        """Get crew configuration by name with enhanced error handling"""
-        try:
-            for crew in self.crews:
-                if crew and isinstance(crew, dict) and 'Crew' in crew:
-                    if crew['Crew'].get('name') == crew_name:
-                        logger.info(f"Found crew configuration for: {crew_name}")
-                        return crew['Crew']
-            
-            logger.error(f"No crew found with name: {crew_name}")
-            logger.debug(f"Available crews: {[c.get('Crew', {}).get('name') for c in self.crews if c]}")
-            return None
-        except Exception as e:
-            logger.error(f"Error retrieving crew {crew_name}: {str(e)}")
-            return None
+    def get_crewai_crew_by_name(self, crew_name: str) -> Optional[CrewConfig]:
+        """Get crew configuration by name"""
+        crew = self.registry.get_crew(crew_name)
+        if crew:
+            logger.info(f"Found crew configuration for: {crew_name}")
+            return crew
+        logger.error(f"No crew found with name: {crew_name}")
+        logger.debug(f"Available crews: {self.registry.names('crews')}")
+        return None
 
     def create_crew(self, crew_data: Dict[str, Any]) -> bool:
         try:
-            self.crews.append({'Crew': crew_data})
+            self.crews = self.crews + [{'Crew': crew_data}]
             return True
         except Exception as e:
             logger.error(f"Error creating crew: {str(e)}")
@@ -183,7 +277,9 @@ class CrewManager:
                 if crew_name and crew_name in self.crew_cache:
                     del self.crew_cache[crew_name]
                     
-                self.crews[index]['Crew'] = crew_data
+                crews = list(self.crews)
+                crews[index] = {'Crew': crew_data}
+                self.crews = crews
                 return True
             except Exception as e:
                 logger.error(f"Error updating crew: {str(e)}")
@@ -198,7 +294,7 @@ class CrewManager:
                 if crew_name and crew_name in self.crew_cache:
                     del self.crew_cache[crew_name]
                     
-                del self.crews[index]
+                self.crews = self.crews[:index] + self.crews[index + 1:]
                 return True
             except Exception as e:
                 logger.error(f"Error deleting crew: {str(e)}")
@@ -1,7 +1,6 @@
 import os
 import sqlite3
 import logging
-import chromadb
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -95,6 +94,32 @@ def get_result_by_id(id: str):
         if 'conn' in locals():
             conn.close()
 
+def get_results_by_ids(ids):
+    """Retrieve several cached results in one query. Returns a dict of id -> result."""
+    numeric_ids = {}
+    for id in ids:
+        # Chroma ids for cached results are "id<N>"; anything else has no row here.
+        if isinstance(id, str) and id.startswith('id') and id[2:].isdigit():
+            numeric_ids[int(id[2:])] = id
+        else:
+            logger.warning(f"Skipping cache id {id!r}, expected idN")
+    try:
+        if not numeric_ids:
+            return {}
+        conn = sqlite3.connect(db_file)
+        cursor = conn.cursor()
+        placeholders = ','.join('?' * len(numeric_ids))
+        cursor.execute(f'SELECT id, result FROM cached_results WHERE id IN ({placeholders})', list(numeric_ids))
+        return {numeric_ids[record[0]]: record[1] for record in cursor.fetchall()}
+    except sqlite3.Error as e:
+        logger.error(f"Database error retrieving results: {e}")
+        return {}
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        if 'conn' in locals():
+            conn.close()
+
 def get_next_id() -> int:
     """Get the next available ID for cached results."""
     try:
@@ -149,6 +174,7 @@ def get_cache_files():
     return [f for f in os.listdir(db_path)]
 
 def query_vector_cache(query:str):
+    import chromadb  # only the maintenance page needs it, keep it out of startup
     chroma_client = chromadb.PersistentClient(path=get_vector_db_file())
     # switch `create_collection` to `get_or_create_collection` to avoid creating a new collection every time
     collection = chroma_client.get_or_create_collection(name="cached_docs")
@@ -3,8 +3,10 @@ from flask import Flask
 import logging
 import os
 from flask_wtf.csrf import CSRFProtect, CSRFError
-from app_state import AppState
-from routes import register_routes
+from startup_profiler import profiler
+with profiler.phase('imports'):
+    from app_state import AppState
+    from routes import register_routes
 
 # Configure enhanced logging
 os.makedirs('logs', exist_ok=True)
@@ -27,15 +29,17 @@ def create_app():
     try:
         # Create Flask app
         logger.info("Creating Flask application...")
-        app = Flask(__name__)
-        app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-key-please-change')
-        app.config['DEBUG'] = True
+        with profiler.phase('flask'):
+            app = Flask(__name__)
+            app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-key-please-change')
+            app.config['DEBUG'] = True
         
         # Initialize CSRF protection
         logger.info("Initializing CSRF protection...")
         try:
-            csrf = CSRFProtect()
-            csrf.init_app(app)
+            with profiler.phase('csrf'):
+                csrf = CSRFProtect()
+                csrf.init_app(app)
             logger.info("CSRF protection initialized successfully")
             
             # Add CSRF error handler
@@ -51,7 +55,8 @@ def create_app():
         # Initialize AppState
         logger.info("Initializing AppState...")
         try:
-            app_state = AppState()
+            with profiler.phase('app_state'):
+                app_state = AppState()
             logger.info("AppState initialization successful")
         except Exception as e:
             logger.error(f"Failed to initialize AppState: {str(e)}", exc_info=True)
@@ -60,12 +65,14 @@ def create_app():
         # Register routes
         logger.info("Registering routes...")
         try:
-            register_routes(app, app_state)
+            with profiler.phase('routes'):
+                register_routes(app, app_state)
             logger.info("Routes registered successfully")
         except Exception as e:
             logger.error(f"Failed to register routes: {str(e)}", exc_info=True)
             raise
         
+        profiler.finish()
         return app, app_state
     except Exception as e:
         logger.error(f"Failed to create application: {str(e)}", exc_info=True)
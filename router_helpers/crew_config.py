@@ -40,14 +40,20 @@ def manage_tasks_helper(app_state):
                   'agent': request.form.get('agent'),
                   'delegate': request.form.get('delegate') == 'True',
                   'tools': request.form.getlist('tools'),
-                  'pydantic_class': request.form.get('pydantic_class')
+                  'pydantic_class': request.form.get('pydantic_class'),
               }
+              depends_on = [name for name in request.form.getlist('depends_on')
+                            if name != request.form.get('name')]
+              index = int(request.form.get('index', -1))
+              previous = tasks[index]['Task'] if action == 'edit' and 0 <= index < len(tasks) else {}
+              # An empty depends_on still opts the task's crews into scheduling, keep it only if declared.
+              if depends_on or 'depends_on' in previous:
+                  task_data['depends_on'] = depends_on
 
               if action == 'add':
                   tasks.append({'Task': task_data})
                   flash('Task added successfully', 'success')
               elif action == 'edit':
-                  index = int(request.form.get('index', -1))
                   if 0 <= index < len(tasks):
                       tasks[index]['Task'] = task_data
                       flash('Task updated successfully', 'success')
@@ -61,6 +67,7 @@ def manage_tasks_helper(app_state):
           # Save changes to YAML file
           with open('config/tasks.yaml', 'w') as f:
               yaml.dump(tasks, f, default_flow_style=False)
+          app_state.config_watcher.notify('tasks')
 
           return redirect(url_for('manage_tasks'))
 
@@ -195,6 +202,7 @@ def manage_agents_helper(app_state):
                 # Save changes to YAML file
                 with open('config/agents.yaml', 'w') as f:
                     yaml.dump(agents, f, default_flow_style=False)
+                app_state.config_watcher.notify('agents')
 
                 return redirect(url_for('manage_agents'))
 
@@ -263,6 +271,7 @@ def manage_crews_helper(app_state):
                 # Save changes to YAML file
                 with open('config/crews.yaml', 'w') as f:
                     yaml.dump(crews, f, default_flow_style=False)
+                app_state.config_watcher.notify('crews')
 
                 return redirect(url_for('manage_crews'))
 
@@ -38,11 +38,9 @@ def execute_crew_helper(app_state):
 
       logger.info(f"Attempting to execute crew: {crew_name}")
 
-      from crew_manager import CrewManager
-      crew_manager = CrewManager(app_state.agent_manager, 
-                                 app_state.task_manager, 
-                                 app_state.inputs)
-      logger.debug(f"Available crews: {[c.get('Crew', {}).get('name') for c in crew_manager.crews if c]}")
+      # The shared manager keeps crew templates across requests and copies one per run
+      crew_manager = app_state.crew_manager
+      logger.debug(f"Available crews: {crew_manager.registry.names('crews')}")
 
       result = crew_manager.execute_crew(crew_name)
       logger.info(f"Execution result for crew {crew_name}: {result}")
@@ -13,6 +13,8 @@ except ImportError:
     pd = None  # Handle case where pandas is not available
 import yaml
 
+from config_watcher import get_config_watcher
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -44,12 +46,14 @@ def research_config_helper():
 
               with open('config/smart_research.yaml', 'w') as f:
                   yaml.dump(configs, f)
+              get_config_watcher().notify('smart_research')
 
           elif action == 'delete_config':
               config_name = request.form.get('config_name')
               configs['configs'] = [c for c in configs['configs'] if c['name'] != config_name]
               with open('config/smart_research.yaml', 'w') as f:
                   yaml.dump(configs, f)
+              get_config_watcher().notify('smart_research')
 
           return redirect(url_for('research_config'))
 
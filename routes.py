@@ -48,6 +48,11 @@ def register_routes(app, app_state):
             return jsonify({'error': 'CSRF token validation failed. Please refresh and try again.'}), 400
         return render_template('error.html', error="CSRF token validation failed. Please try again."), 400
 
+    @app.before_request
+    def sync_config():
+        # Pick up config edits made by other workers or by hand since the last request
+        app_state.config_watcher.check()
+
     def _home():
         try:
             with open('config/crews.yaml', 'r') as f:
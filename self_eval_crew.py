@@ -2,16 +2,16 @@ from crewai.flow.flow import Flow, listen, start, router
 from crewai import Agent, Task, Crew
 from pydantic import BaseModel
 import json
-import yaml
 import logging
 from logging.handlers import RotatingFileHandler
 import logging
 import os
 from typing import Optional, Dict, Any, List, TypedDict
 from app_state import AppState
-from file_manager import FileManager
 from agent_manager import AgentManager
 from task_manager import TaskManager
+from config_registry import SmartResearchConfig, get_config_registry
+from crew_manager import schedule_tasks
 from result_formatter import result_formatter
 
 # Configure logging
@@ -44,15 +44,10 @@ class AnalysisReviewState(BaseModel):
 class SmartResearcher:
     def __init__(self, config_name: Optional[str] = None):
         logger.info("create SmartResearcher class")
-        self.file_manager = FileManager()
-        self.agent_manager = AgentManager({})
+        self.registry = get_config_registry()
+        self.agent_manager = AgentManager({}, self.registry)
         self.task_manager = TaskManager(self.agent_manager)
         self.crew_cache = {}  # Dictionary to store initialized crews
-        self.crews_loaded = False  # Flag to track if crews are loaded
-        self.crews_data = None  # Store crews data when needed
-        
-        # Load smart research configuration
-        self._load_smart_research_config()
         
         # Set config but don't initialize crews yet
         self.current_config = None
@@ -63,35 +58,9 @@ class SmartResearcher:
                 logger.error(f"Configuration '{config_name}' not found")
                 raise ValueError(f"Configuration '{config_name}' not found in smart_research.yaml")
     
-    def _load_smart_research_config(self):
-        """Load smart research configuration with error handling"""
-        logger.info("_load_smart_research_config")
-        try:
-            with open('config/smart_research.yaml', 'r') as f:
-                self.smart_research = yaml.safe_load(f) or {'configs': []}
-            logger.debug("Successfully loaded smart research configuration")
-        except Exception as e:
-            logger.error(f"Error loading smart research config: {str(e)}")
-            self.smart_research = {'configs': []}
-
-    def _get_config_by_name(self, config_name: str) -> Optional[Dict[str, Any]]:
-        """Get configuration by name with logging"""
-        return next(
-            (cfg for cfg in self.smart_research['configs'] if cfg['name'] == config_name),
-            None
-        )
-
-    def _load_crews_if_needed(self):
-        """Lazy load crews data only when needed"""
-        if not self.crews_loaded:
-            logger.debug("Loading crews data")
-            try:
-                self.crews_data = self.file_manager.load_crews()
-                self.crews_loaded = True
-                logger.info(f"Successfully loaded {len(self.crews_data)} crews")
-            except Exception as e:
-                logger.error(f"Error loading crews: {str(e)}")
-                self.crews_data = []
+    def _get_config_by_name(self, config_name: str) -> Optional[SmartResearchConfig]:
+        """Get configuration by name"""
+        return self.registry.get_smart_research_config(config_name)
 
     def _get_crew(self, crew_type: str) -> Optional[Crew]:
         """Get crew with lazy loading and enhanced error handling"""
@@ -99,7 +68,7 @@ class SmartResearcher:
             logger.error("No configuration set")
             return None
             
-        crew_name = self.current_config.get(f'{crew_type}_crew')
+        crew_name = getattr(self.current_config, f'{crew_type}_crew', None)
         if not crew_name:
             logger.error(f"No crew name found for type: {crew_type}")
             return None
@@ -120,13 +89,7 @@ class SmartResearcher:
 
     def _get_crew_by_name(self, crew_name: str) -> Optional[Crew]:
         """Get crew by name with lazy loading and enhanced logging"""
-        self._load_crews_if_needed()
-        
-        crew_data = next(
-            (crew['Crew'] for crew in self.crews_data if crew['Crew']['name'] == crew_name),
-            None
-        )
-        
+        crew_data = self.registry.get_crew(crew_name)
         if not crew_data:
             logger.error(f"No crew data found for name: {crew_name}")
             return None
@@ -135,7 +98,7 @@ class SmartResearcher:
             # Create agents with logging
             logger.debug(f"Creating agents for crew: {crew_name}")
             agents = []
-            for agent_name in crew_data['agents']:
+            for agent_name in crew_data.agents:
                 agent = self.agent_manager.create_crewai_agent(agent_name)
                 if agent:
                     agents.append(agent)
@@ -146,14 +109,16 @@ class SmartResearcher:
             # Create tasks with logging
             logger.debug(f"Creating tasks for crew: {crew_name}")
             tasks = []
-            for task_name in crew_data['tasks']:
+            for task_name in crew_data.tasks:
                 task = self.task_manager.create_crewai_task(task_name)
                 if task:
-                    tasks.append(task)
+                    tasks.append((task_name, task))
                     logger.debug(f"Created task: {task_name}")
                 else:
                     logger.warning(f"Failed to create task: {task_name}")
 
+            tasks = schedule_tasks(crew_name, tasks, self.registry)
+
             if not agents:
                 logger.error(f"No valid agents created for crew: {crew_name}")
                 return None
@@ -174,8 +139,6 @@ class SmartResearcher:
         """Clean up the crew cache"""
         logger.info("Cleaning up crew cache")
         self.crew_cache.clear()
-        self.crews_loaded = False
-        self.crews_data = None
 
     @property
     def prompt_engineer_crew(self) -> Optional[Crew]:
@@ -192,9 +155,7 @@ class SmartResearcher:
     @staticmethod
     def get_available_crews() -> List[str]:
         """Get list of available research crews from crews.yaml"""
-        file_manager = FileManager()
-        crews_data = file_manager.load_crews()
-        return [crew['Crew']['name'] for crew in crews_data]
+        return get_config_registry().names('crews')
 
 class AnalysisResearchFlow(Flow[AnalysisReviewState]):
     def __init__(self,inputs):
@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+report_file = os.getenv("STARTUP_PROFILE_PATH", os.path.join('logs', 'startup_profile.json'))
+
+# "import time:       412 |       1530 |   yaml.loader"
+_importtime_re = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class StartupProfiler:
+    """Wall-clock timings of the named phases of a worker's startup.
+
+    Phases nest, so ``app_state.set_up_db`` is reported inside
+    ``app_state``. Every worker records its own timings; ``finish`` logs a
+    one-line summary and writes the report as JSON.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self._local = threading.local()
+
+    @contextmanager
+    def phase(self, name: str):
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(name)
+        path = '.'.join(stack)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self.phases.append({'phase': path, 'start_s': started - self.started,
+                                'seconds': time.perf_counter() - started})
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'total_s': time.perf_counter() - self.started,
+            'phases': sorted(self.phases, key=lambda phase: phase['start_s']),
+        }
+
+    def finish(self, path: Optional[str] = report_file) -> Dict[str, Any]:
+        report = self.report()
+        top = [phase for phase in report['phases'] if '.' not in phase['phase']]
+        logger.info(f"Startup took {report['total_s']:.2f}s: "
+                    + ", ".join(f"{phase['phase']} {phase['seconds']:.2f}s" for phase in top))
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                with open(path, 'w') as f:
+                    json.dump(report, f, indent=2)
+            except OSError as e:
+                logger.warning(f"Could not write startup profile to {path}: {e}")
+        return report
+
+
+profiler = StartupProfiler()
+
+
+def parse_importtime(output: str, top: int = 25) -> Dict[str, Any]:
+    """Summarise ``python -X importtime`` output.
+
+    Returns the modules with the largest cumulative import time (a module
+    includes everything it imported first) and the packages with the most
+    self time, both in milliseconds.
+    """
+    modules, packages = [], {}
+    for line in output.splitlines():
+        match = _importtime_re.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        package = module.split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+        modules.append({'module': module, 'depth': (len(indent) - 1) // 2,
+                        'cumulative_ms': int(cumulative_us) / 1000})
+    modules.sort(key=lambda item: item['cumulative_ms'], reverse=True)
+    by_package = sorted(({'package': name, 'self_ms': us / 1000} for name, us in packages.items()),
+                        key=lambda item: item['self_ms'], reverse=True)
+    return {
+        'total_ms': sum(packages.values()) / 1000,
+        'slowest': modules[:top],
+        'packages': by_package[:top],
+    }
+
+
+def importtime_report(module: str = 'main', top: int = 25, timeout: float = 300) -> Dict[str, Any]:
+    """Import ``module`` in a fresh interpreter under ``-X importtime`` and summarise where the time went."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               capture_output=True, text=True, timeout=timeout)
+    report = parse_importtime(completed.stderr, top)
+    if completed.returncode != 0:
+        report['error'] = completed.stderr.strip().splitlines()[-1:]
+    return report
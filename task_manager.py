@@ -1,14 +1,33 @@
 import logging
-import yaml
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set
 from crewai import Task
 import importlib
+import threading
+from config_registry import ConfigRegistry, TaskConfig
 
 class TaskManager:
-    def __init__(self, agent_manager):
+    def __init__(self, agent_manager, registry: Optional[ConfigRegistry] = None):
         self.logger = logging.getLogger(__name__)
         self.agent_manager = agent_manager
-        self.tasks = []
+        self.registry = registry or agent_manager.registry
+        self.task_cache = {}  # task name -> (config it was built from, its Agent, Task)
+        self._cache_lock = threading.Lock()
+        self.registry.add_listener(self._invalidate)
+
+    def _invalidate(self, affected: Dict[str, Set[str]]):
+        for task_name in affected['tasks']:
+            self.task_cache.pop(task_name, None)
+
+    @property
+    def tasks(self) -> List[Dict[str, Any]]:
+        return self.registry.entries('tasks')
+
+    @tasks.setter
+    def tasks(self, tasks: List[Dict[str, Any]]):
+        self.registry.set_entries('tasks', tasks)
+
+    def get_task_by_name(self, task_name: str) -> Optional[TaskConfig]:
+        return self.registry.get_task(task_name)
 
     def _import_pydantic_class(self, class_path: str) -> Optional[Any]:
         try:
@@ -20,54 +39,43 @@ class TaskManager:
             return None
 
     def create_crewai_task(self, task_name: str) -> Optional[Task]:
-        # First check if task exists in loaded tasks
-        task_data = next((task['Task'] for task in self.tasks 
-                         if task['Task']['name'] == task_name), None)
-        
-        if not task_data:
-            # Task not found in current tasks, try to load from tasks.yaml
-            try:
-                with open('config/tasks.yaml', 'r') as f:
-                    all_tasks = yaml.safe_load(f) or []
-                    task_data = next((task['Task'] for task in all_tasks 
-                                    if task['Task']['name'] == task_name), None)
-                    if task_data:
-                        # Add to current tasks list
-                        self.tasks.append({'Task': task_data})
-            except Exception as e:
-                self.logger.error(f"Error loading task {task_name}: {str(e)}")
-                return None
-        
+        """Return the Task for ``task_name``, built once per config around the shared Agent."""
+        task_data = self.get_task_by_name(task_name)
         if task_data:
-            if not task_data.get('agent'):
+            if not task_data.agent:
                 self.logger.error(f"No agent specified for task {task_name}")
                 return None
                 
-            agent = self.agent_manager.create_crewai_agent(task_data['agent'])
+            agent = self.agent_manager.create_crewai_agent(task_data.agent)
             if not agent:
-                self.logger.error(f"Could not create agent {task_data['agent']} for task {task_name}")
+                self.logger.error(f"Could not create agent {task_data.agent} for task {task_name}")
                 return None
+
+            with self._cache_lock:
+                cached = self.task_cache.get(task_name)
+                if cached and cached[0] == task_data and cached[1] is agent:
+                    return cached[2]
                 
             task_kwargs = {
-                'description': task_data['description'],
+                'description': task_data.description,
                 'agent': agent,
                 'json': True
             }
             
             # Handle pydantic class if specified
-            if pydantic_class := task_data.get('pydantic_class'):
+            if pydantic_class := task_data.pydantic_class:
                 pydantic_cls = self._import_pydantic_class(pydantic_class)
                 if pydantic_cls:
                     task_kwargs['output_pydantic'] = pydantic_cls
             
-            if 'expected_output' in task_data:
-                task_kwargs['expected_output'] = task_data['expected_output']
+            if task_data.expected_output is not None:
+                task_kwargs['expected_output'] = task_data.expected_output
             
-            if task_data.get('tools'):
+            if task_data.tools:
                 try:
                     tools_list = []
                     if agent.tools:
-                        for tool_name in task_data['tools']:
+                        for tool_name in task_data.tools:
                             matching_tools = [tool for tool in agent.tools if tool.__name__ == tool_name]
                             if matching_tools:
                                 tools_list.extend(matching_tools)
@@ -77,17 +85,20 @@ class TaskManager:
                     self.logger.error(f"Error setting up tools for task {task_name}: {str(e)}")
             
             try:
-                return Task(**task_kwargs)
+                task = Task(**task_kwargs)
             except Exception as e:
                 self.logger.error(f"Error creating task {task_name}: {str(e)}")
                 return None
+            with self._cache_lock:
+                self.task_cache[task_name] = (task_data, agent, task)
+            return task
                 
         self.logger.error(f"No task data found for {task_name}")
         return None
 
     def create_task(self, task_data: Dict[str, Any]) -> bool:
         try:
-            self.tasks.append({'Task': task_data})
+            self.tasks = self.tasks + [{'Task': task_data}]
             return True
         except Exception as e:
             self.logger.error(f"Error creating task: {str(e)}")
@@ -96,7 +107,9 @@ class TaskManager:
     def update_task(self, index: int, task_data: Dict[str, Any]) -> bool:
         if 0 <= index < len(self.tasks):
             try:
-                self.tasks[index]['Task'] = task_data
+                tasks = list(self.tasks)
+                tasks[index] = {'Task': task_data}
+                self.tasks = tasks
                 return True
             except Exception as e:
                 self.logger.error(f"Error updating task: {str(e)}")
@@ -106,7 +119,7 @@ class TaskManager:
     def delete_task(self, index: int) -> bool:
         if 0 <= index < len(self.tasks):
             try:
-                del self.tasks[index]
+                self.tasks = self.tasks[:index] + self.tasks[index + 1:]
                 return True
             except Exception as e:
                 self.logger.error(f"Error deleting task: {str(e)}")
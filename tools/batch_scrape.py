@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Type
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel
+
+from tools.scrape_cache import cached_extract, fresh_extraction
+from tools.search_results import canonical_url
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/scraper_tools.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+max_workers = int(os.getenv("SCRAPE_MAX_WORKERS", "8"))
+per_domain_concurrency = int(os.getenv("SCRAPE_PER_DOMAIN_CONCURRENCY", "2"))
+per_domain_delay = float(os.getenv("SCRAPE_PER_DOMAIN_DELAY_SECONDS", "1.0"))
+default_deadline = float(os.getenv("SCRAPE_BATCH_DEADLINE_SECONDS", "120"))
+max_batch_urls = 50
+
+
+class DomainScheduler:
+    """Limits concurrent requests per domain and spaces out their start times.
+
+    Shared by every batch in the process, so two agents scraping the same
+    operator's site still respect the same politeness limits.
+    """
+
+    def __init__(self, concurrency: int = per_domain_concurrency, delay: float = per_domain_delay):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @staticmethod
+    def domain(url: str) -> str:
+        host = (urlsplit(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    @contextmanager
+    def slot(self, url: str):
+        domain = self.domain(url)
+        with self._lock:
+            semaphore = self._semaphores.setdefault(domain, threading.BoundedSemaphore(self.concurrency))
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(domain, now))
+                self._next_start[domain] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+domain_scheduler = DomainScheduler()
+_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape")
+
+
+def parse_urls(urls: str) -> List[str]:
+    """Accept a JSON list of URLs, a JSON object with a "urls" list, or whitespace separated URLs."""
+    try:
+        data = json.loads(urls)
+    except ValueError:
+        data = urls.split()
+    if isinstance(data, dict):
+        data = data.get('urls', [])
+    if not isinstance(data, list):
+        data = [data]
+    unique, seen = [], set()
+    for url in data:
+        url = str(url).strip()
+        key = canonical_url(url)
+        if url and key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique[:max_batch_urls]
+
+
+def batch_extract(urls: List[str], schema: Type[BaseModel], extract: Callable[..., Any],
+                  deadline: float = default_deadline) -> Dict[str, Any]:
+    """Extract ``urls`` concurrently, returning whatever has finished by ``deadline`` seconds.
+
+    Each extraction is written to the scrape cache as soon as it completes,
+    including those still running at the deadline, so a later call picks
+    them up from the cache. Fresh cache hits make no request, so only
+    the URLs that need fetching wait for the per-domain scheduler.
+    """
+    def run(url: str) -> Any:
+        cached = fresh_extraction(url, schema)
+        if cached is not None:
+            return cached
+        with domain_scheduler.slot(url):
+            return cached_extract(url, schema, extract)
+
+    futures = {_executor.submit(run, url): url for url in urls}
+    results: Dict[str, Any] = {}
+    pending = set(futures)
+    end = time.monotonic() + deadline
+    while pending:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            url = futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                logger.warning(f"Scraping {url} failed: {e}")
+                results[url] = f"Scrape failed: {e}"
+    if pending:
+        logger.info(f"Batch scrape deadline reached with {len(pending)} URLs still running")
+    for future in pending:
+        if future.cancel():
+            results[futures[future]] = "Not started before the deadline"
+        else:
+            results[futures[future]] = "Still running at the deadline; ask again later to read it from the cache"
+    return {url: results[url] for url in urls}
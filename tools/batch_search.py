@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import chromadb
+from crewai.tools import tool
+
+from db_utils import (
+    get_next_id,
+    get_results_by_ids,
+    get_vector_db_file,
+    similarity_threshold,
+    store_result,
+)
+from tools.http_pool import get_http_client
+from tools.multi_search import cache_tag as multi_search_tag
+from tools.multi_search import run_multi_search
+from tools.search_providers import aserper_search
+from tools.search_results import from_serper, normalize_results
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/search_tools.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+max_batch_size = 20
+
+
+def parse_questions(questions: str) -> List[str]:
+    """Accept a JSON list of questions, a JSON object with a "questions" list, or one question per line."""
+    try:
+        data = json.loads(questions)
+    except ValueError:
+        data = list(questions.splitlines())
+    if isinstance(data, dict):
+        data = data.get('questions', [])
+    if not isinstance(data, list):
+        data = [data]
+    unique = []
+    for question in data:
+        question = str(question).strip()
+        if question and question not in unique:
+            unique.append(question)
+    return unique[:max_batch_size]
+
+
+def bulk_cache_lookup(collection, tag: str, questions: List[str]) -> Dict[str, Optional[Any]]:
+    """Look up every question in the semantic cache with one embedding query and one SQL query."""
+    cached_result = collection.query(
+        query_texts=[f'{tag}:{q}' for q in questions],
+        n_results=1
+    )
+    hit_ids = {}
+    for q, distances, ids in zip(questions, cached_result['distances'], cached_result['ids'], strict=True):
+        if distances and distances[0] < similarity_threshold():
+            hit_ids[q] = ids[0]
+    stored = get_results_by_ids(list(hit_ids.values()))
+    results = {}
+    for q in questions:
+        data = stored.get(hit_ids.get(q))
+        try:
+            results[q] = json.loads(data) if data is not None else None
+        except ValueError:
+            results[q] = None
+    logger.info(f'{tag} batch: {sum(r is not None for r in results.values())}/{len(questions)} cache hits')
+    return results
+
+
+async def _fetch_misses(fetch: Callable[[str], Awaitable[Any]], questions: List[str]) -> List[Any]:
+    return await asyncio.gather(*(fetch(q) for q in questions), return_exceptions=True)
+
+
+def batch_search(tag: str, questions: str, fetch: Callable[[str], Awaitable[Any]],
+                 from_cache: Optional[Callable[[Any], Any]] = None,
+                 cacheable: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Resolve cache hits in bulk, fetch the misses concurrently, cache them and group results by question.
+
+    ``from_cache`` converts cache hits stored in an older format.
+    ``cacheable`` says whether a fetched question's results may be cached.
+    """
+    qs = parse_questions(questions)
+    if not qs:
+        return {}
+    chroma_client = chromadb.PersistentClient(path=get_vector_db_file())
+    collection = chroma_client.get_or_create_collection(name="cached_docs")
+    results = bulk_cache_lookup(collection, tag, qs)
+    if from_cache:
+        results = {q: from_cache(result) if result is not None else None for q, result in results.items()}
+    misses = [q for q, result in results.items() if result is None]
+    if misses:
+        fetched = get_http_client().run(_fetch_misses(fetch, misses))
+        for q, result in zip(misses, fetched, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f'{tag} search failed for {q}: {result}')
+                results[q] = f"Search failed: {result}"
+                continue
+            results[q] = result
+            if result and (cacheable is None or cacheable(q)):
+                id = get_next_id()
+                collection.upsert(
+                    documents=[f'{tag}:{q}'],
+                    ids=[f'id{id}'],
+                )
+                store_result(id, q, json.dumps(result))
+    return {q: results[q] if results[q] else "No results found" for q in qs}
+
+
+async def _google(q: str) -> List[Dict[str, Any]]:
+    return normalize_results(from_serper(await aserper_search(q, "search")))
+
+
+async def _news(q: str) -> List[Dict[str, Any]]:
+    return normalize_results(from_serper(await aserper_search(q, "news"), key="news"))
+
+
+def _cached_news(results: Any) -> Any:
+    # Older news cache entries hold the raw Serper response.
+    if isinstance(results, dict):
+        return normalize_results(from_serper(results, key="news"))
+    return results
+
+
+class BatchSearchTools:
+    """Batch variants of the search tools, answering many questions in one tool call."""
+
+    @tool("Batch Google Search")
+    def batch_search_internet_with_google(questions: str) -> dict:
+        """Search the internet using Google for several questions at once. The input is a JSON list
+        of questions, e.g. ["data centres in Singapore", "data centres in Malaysia"]. Returns the
+        results grouped by question."""
+        return batch_search("GoogleSearch", questions, _google)
+
+    @tool("Batch Google News Search")
+    def batch_search_news_with_google(questions: str) -> dict:
+        """Search Google News for several questions at once. The input is a JSON list of questions.
+        Returns the news results grouped by question."""
+        return batch_search("GoogleNews", questions, _news, _cached_news)
+
+    @tool("Batch Multi Search")
+    def batch_multi_search(questions: str) -> dict:
+        """Search Google, Google News, Tavily and Exa for several questions at once. The input is a
+        JSON list of questions. Returns merged, deduplicated results grouped by question."""
+        partial = set()
+
+        async def fetch(q: str) -> List[Dict[str, Any]]:
+            results, complete = await run_multi_search(q)
+            if not complete:
+                partial.add(q)
+            return results
+
+        # Results missing a provider that failed or timed out are returned but not cached.
+        return batch_search(multi_search_tag(), questions, fetch, cacheable=lambda q: q not in partial)
@@ -0,0 +1,123 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Keep decimal figures such as "12.5" and identifiers such as "sg-1" intact.
+_token = re.compile(r"[a-z0-9]+(?:[.\-][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return _token.findall(text.lower())
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60,
+                           limit: Optional[int] = None) -> List[Tuple[str, float]]:
+    """Fuse several ranked id lists with reciprocal rank fusion.
+
+    Each id scores ``sum(1 / (k + rank))`` over the lists it appears in.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    fused = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return fused[:limit] if limit else fused
+
+
+class BM25Index:
+    """Persisted inverted index scored with Okapi BM25.
+
+    Documents are stored with their text and metadata so hits can be turned
+    back into retrievable chunks without consulting the vector store.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "BM25Index":
+        """Load an index from ``path``, or return an empty one bound to it."""
+        index = cls(path, **kwargs)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            index.docs = data.get('docs', {})
+            index.postings = data.get('postings', {})
+            index.total_length = sum(doc['length'] for doc in index.docs.values())
+        return index
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path:
+            raise ValueError("No path to save BM25 index to")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump({'docs': self.docs, 'postings': self.postings}, f)
+            os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.docs
+
+    def add(self, doc_id: str, text: str, metadata: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            if doc_id in self.docs:
+                self.remove(doc_id)
+            terms = Counter(tokenize(text))
+            length = sum(terms.values())
+            self.docs[doc_id] = {'text': text, 'metadata': metadata or {}, 'length': length}
+            self.total_length += length
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[doc_id] = tf
+
+    def add_many(self, items: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]):
+        for doc_id, text, metadata in items:
+            self.add(doc_id, text, metadata)
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            doc = self.docs.pop(doc_id, None)
+            if doc is None:
+                return
+            self.total_length -= doc['length']
+            for term in set(tokenize(doc['text'])):
+                postings = self.postings.get(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self.postings[term]
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        return self.docs.get(doc_id)
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return up to ``k`` (doc_id, score) pairs ordered by BM25 score."""
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                length = self.docs[doc_id]['length']
+                denom = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / denom
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
@@ -0,0 +1,189 @@
+"""Record and replay of external tool calls.
+
+Set ``TOOL_CASSETTE_MODE`` to ``record`` to capture every HTTP request made
+through the pooled client and every wrapped SDK call (Firecrawl, LlamaParse)
+into a compressed SQLite cassette, or to ``replay`` to serve them back
+without touching the network. Replayed calls sleep for the recorded
+duration multiplied by ``TOOL_CASSETTE_LATENCY_SCALE`` (default 1, use 0 to
+replay instantly), so crews run offline with reproducible timings.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from db_utils import db_path
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/cassette.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+cassette_modes = ("off", "record", "replay")
+default_cassette_file = os.path.join(db_path, "cassette.sqlite3")
+# Request fields that carry credentials and must not affect the match or be stored.
+secret_fields = {"api_key", "apikey", "x-api-key", "authorization", "token"}
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode when a call was never recorded."""
+
+
+def _strip_secrets(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_secrets(v) for k, v in value.items() if str(k).lower() not in secret_fields}
+    if isinstance(value, (list, tuple)):
+        return [_strip_secrets(v) for v in value]
+    return value
+
+
+def _key_part(value: Any) -> Any:
+    """JSON-friendly form of a call argument; local files are identified by their content hash."""
+    if isinstance(value, (list, tuple)):
+        return [_key_part(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _key_part(v) for k, v in _strip_secrets(value).items()}
+    if isinstance(value, str) and os.path.isfile(value):
+        with open(value, 'rb') as f:
+            return f"file:{hashlib.sha256(f.read()).hexdigest()}"
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+def interaction_key(provider: str, operation: str, payload: Any) -> str:
+    body = json.dumps(_key_part(payload), sort_keys=True, default=str)
+    return hashlib.sha256(f"{provider}\x00{operation}\x00{body}".encode()).hexdigest()
+
+
+class Cassette:
+    """SQLite store of recorded interactions, one zlib-compressed pickle per call.
+
+    Interactions are keyed by provider, operation and the request payload with
+    credentials removed. Recording the same request again replaces the
+    earlier response.
+    """
+
+    def __init__(self, mode: str = "off", db_file: str = default_cassette_file, latency_scale: float = 1.0):
+        if mode not in cassette_modes:
+            raise ValueError(f"TOOL_CASSETTE_MODE must be one of {cassette_modes}, got {mode!r}")
+        self.mode = mode
+        self.db_file = db_file
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        if mode != "off":
+            self._set_up()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _set_up(self):
+        os.makedirs(os.path.dirname(self.db_file) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.db_file)
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS interactions (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                request BLOB,
+                response BLOB NOT NULL,
+                elapsed REAL NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+            ''')
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Database error during cassette setup: {e}")
+            raise
+        finally:
+            conn.close()
+
+    def save(self, provider: str, operation: str, payload: Any, response: Any, elapsed: float):
+        key = interaction_key(provider, operation, payload)
+        request = zlib.compress(json.dumps(_key_part(payload), default=str).encode())
+        with self._lock:
+            conn = sqlite3.connect(self.db_file)
+            try:
+                conn.execute('INSERT OR REPLACE INTO interactions VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (key, provider, operation, request, zlib.compress(pickle.dumps(response)),
+                              elapsed, time.time()))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to record {provider} {operation}: {e}")
+            finally:
+                conn.close()
+
+    def load(self, provider: str, operation: str, payload: Any) -> Tuple[Any, float]:
+        """Return the recorded response and the delay to simulate, or raise CassetteMissError."""
+        conn = sqlite3.connect(self.db_file)
+        try:
+            row = conn.execute('SELECT response, elapsed FROM interactions WHERE key=?',
+                               (interaction_key(provider, operation, payload),)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            raise CassetteMissError(f"No recorded {provider} {operation} for {_key_part(payload)}")
+        return pickle.loads(zlib.decompress(row[0])), row[1] * self.latency_scale
+
+    def call(self, provider: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call an SDK function through the cassette."""
+        operation = getattr(fn, '__qualname__', repr(fn))
+        payload = {"args": args, "kwargs": kwargs}
+        if self.replaying:
+            response, delay = self.load(provider, operation, payload)
+            time.sleep(delay)
+            return response
+        started = time.perf_counter()
+        response = fn(*args, **kwargs)
+        if self.recording:
+            self.save(provider, operation, payload, response, time.perf_counter() - started)
+        return response
+
+    async def acall(self, provider: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        operation = getattr(fn, '__qualname__', repr(fn))
+        payload = {"args": args, "kwargs": kwargs}
+        if self.replaying:
+            response, delay = self.load(provider, operation, payload)
+            await asyncio.sleep(delay)
+            return response
+        started = time.perf_counter()
+        response = await fn(*args, **kwargs)
+        if self.recording:
+            self.save(provider, operation, payload, response, time.perf_counter() - started)
+        return response
+
+
+_cassette: Optional[Cassette] = None
+_cassette_config: Optional[Tuple[str, str, str]] = None
+
+
+def get_cassette() -> Cassette:
+    """Return the cassette configured by the environment, rebuilt if the settings change."""
+    global _cassette, _cassette_config
+    config = (os.getenv("TOOL_CASSETTE_MODE", "off").lower(),
+              os.getenv("TOOL_CASSETTE_PATH", default_cassette_file),
+              os.getenv("TOOL_CASSETTE_LATENCY_SCALE", "1"))
+    if _cassette is None or config != _cassette_config:
+        _cassette = Cassette(config[0], config[1], float(config[2]))
+        _cassette_config = config
+    return _cassette
+
+
+def http_payload(url: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Request fields that identify an HTTP call; headers are left out as they mostly carry keys."""
+    return {"url": url, "params": kwargs.get("params"), "json": kwargs.get("json"),
+            "data": kwargs.get("data"), "content": kwargs.get("content")}
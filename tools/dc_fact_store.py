@@ -0,0 +1,281 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from crewai.tools import tool
+
+from db_utils import db_path
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/dc_fact_store.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+facts_db_file = os.path.join(db_path, "dc_facts.sqlite3")
+max_query_results = 100
+
+_json_block_re = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+
+def _normalise(value: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", (value or "")).strip().lower()
+
+
+def split_location(location: str):
+    """Split ``"Frankfurt, Hesse, Germany"`` into city ``Frankfurt`` and country ``Germany``."""
+    parts = [part.strip() for part in (location or "").split(",") if part.strip()]
+    if not parts:
+        return None, None
+    if len(parts) == 1:
+        return parts[0], None
+    return parts[0], parts[-1]
+
+
+def operator_from_url(url: str) -> Optional[str]:
+    """Best-effort operator name from a site URL, e.g. ``https://www.equinix.com/...`` -> ``equinix``."""
+    labels = (urlsplit(url).hostname or "").lower().split(".")
+    labels = [label for label in labels if label not in ("www", "com", "co", "net", "org", "io")]
+    return labels[-2] if len(labels) >= 2 and len(labels[-1]) <= 3 else (labels[-1] if labels else None)
+
+
+class DataCentreFactStore:
+    """Normalised data centre facts with provenance, indexed for lookup by operator, city and country.
+
+    A fact is identified by operator, name and location. Crew output
+    often has no operator, so a sighting without one joins the fact with
+    the same name and location, and a sighting with one takes over a fact
+    stored without. Each sighting from a scrape or crew run updates the
+    fact's latest values and adds a row to ``fact_sources``, so every fact
+    can be traced to where and when it was seen.
+    """
+
+    def __init__(self, db_file: str = facts_db_file):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        conn = sqlite3.connect(db_file)
+        try:
+            conn.executescript('''
+            CREATE TABLE IF NOT EXISTS data_centres (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                operator TEXT,
+                name TEXT NOT NULL,
+                location TEXT,
+                city TEXT,
+                country TEXT,
+                operational_status INTEGER,
+                mw REAL,
+                fact_key TEXT NOT NULL UNIQUE,
+                first_seen REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_dc_name ON data_centres (name COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_dc_operator ON data_centres (operator COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_dc_city ON data_centres (city COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_dc_country ON data_centres (country COLLATE NOCASE);
+            CREATE TABLE IF NOT EXISTS fact_sources (
+                fact_id INTEGER NOT NULL REFERENCES data_centres (id),
+                source_type TEXT NOT NULL,
+                source TEXT NOT NULL,
+                observed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_fact_sources_fact ON fact_sources (fact_id);
+            ''')
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Database error during fact store setup: {e}")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _site_key(conn: sqlite3.Connection, fact_operator: Optional[str], name: str, location: str) -> str:
+        """The fact key for a sighting, reconciling facts of the same site stored with and without an operator."""
+        fact_key = "|".join(_normalise(part) for part in (fact_operator, name, location))
+        same_site = [(fact_id, operator, key) for fact_id, operator, key, row_name, row_location in conn.execute(
+            'SELECT id, operator, fact_key, name, location FROM data_centres WHERE name = ? COLLATE NOCASE '
+            'ORDER BY updated_at DESC', (name,))
+            if _normalise(row_name) == _normalise(name) and _normalise(row_location) == _normalise(location)]
+        if not _normalise(fact_operator):
+            known = [key for _, operator, key in same_site if _normalise(operator)]
+            return known[0] if known else fact_key
+        keys = {key for _, _, key in same_site}
+        for fact_id, operator, _ in same_site:
+            if _normalise(operator):
+                continue
+            if fact_key in keys:
+                conn.execute('UPDATE fact_sources SET fact_id = (SELECT id FROM data_centres WHERE fact_key=?) '
+                             'WHERE fact_id=?', (fact_key, fact_id))
+                conn.execute('DELETE FROM data_centres WHERE id=?', (fact_id,))
+            else:
+                conn.execute('UPDATE data_centres SET operator=?, fact_key=? WHERE id=?', (fact_operator, fact_key, fact_id))
+                keys.add(fact_key)
+        return fact_key
+
+    def upsert(self, profiles: Iterable[Dict[str, Any]], source_type: str, source: str,
+               operator: Optional[str] = None) -> int:
+        """Store data centre profiles seen at ``source``. Returns the number stored."""
+        now = time.time()
+        stored = 0
+        conn = sqlite3.connect(self.db_file)
+        try:
+            for profile in profiles:
+                name = str(profile.get("name") or "").strip()
+                if not name:
+                    continue
+                location = str(profile.get("location") or "").strip()
+                city, country = split_location(location)
+                city = profile.get("city") or city
+                country = profile.get("country") or country
+                fact_operator = profile.get("operator") or operator
+                status = profile.get("operational_status")
+                mw = profile.get("mw")
+                fact_key = self._site_key(conn, fact_operator, name, location)
+                conn.execute('''
+                    INSERT INTO data_centres (operator, name, location, city, country, operational_status, mw,
+                                              fact_key, first_seen, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(fact_key) DO UPDATE SET
+                        operational_status = COALESCE(excluded.operational_status, operational_status),
+                        mw = COALESCE(excluded.mw, mw),
+                        city = COALESCE(excluded.city, city),
+                        country = COALESCE(excluded.country, country),
+                        updated_at = excluded.updated_at
+                ''', (fact_operator, name, location, city, country,
+                      None if status is None else int(bool(status)),
+                      float(mw) if isinstance(mw, (int, float)) else None, fact_key, now, now))
+                fact_id = conn.execute('SELECT id FROM data_centres WHERE fact_key=?', (fact_key,)).fetchone()[0]
+                conn.execute('INSERT INTO fact_sources (fact_id, source_type, source, observed_at) VALUES (?, ?, ?, ?)',
+                             (fact_id, source_type, source, now))
+                stored += 1
+            conn.commit()
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            logger.error(f"Error storing data centre facts from {source}: {e}")
+            conn.rollback()
+            return 0
+        finally:
+            conn.close()
+        logger.info(f"Stored {stored} data centre facts from {source_type} {source}")
+        return stored
+
+    def query(self, operator: Optional[str] = None, city: Optional[str] = None, country: Optional[str] = None,
+              location: Optional[str] = None, operational: Optional[bool] = None, min_mw: Optional[float] = None,
+              limit: int = max_query_results) -> List[Dict[str, Any]]:
+        """Facts matching every given filter, newest first, each with its sources."""
+        clauses, params = [], []
+        if operator:
+            clauses.append("operator = ? COLLATE NOCASE")
+            params.append(operator)
+        if city:
+            clauses.append("city = ? COLLATE NOCASE")
+            params.append(city)
+        if country:
+            clauses.append("country = ? COLLATE NOCASE")
+            params.append(country)
+        if location:
+            clauses.append("(city = ? COLLATE NOCASE OR country = ? COLLATE NOCASE OR location LIKE ?)")
+            params.extend([location, location, f"%{location}%"])
+        if operational is not None:
+            clauses.append("operational_status = ?")
+            params.append(int(operational))
+        if min_mw is not None:
+            clauses.append("mw >= ?")
+            params.append(min_mw)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        conn = sqlite3.connect(self.db_file)
+        try:
+            conn.row_factory = sqlite3.Row
+            rows = [dict(row) for row in conn.execute(
+                f'SELECT * FROM data_centres {where} ORDER BY updated_at DESC LIMIT ?', params + [limit])]
+            for row in rows:
+                row.pop("fact_key", None)
+                if row["operational_status"] is not None:
+                    row["operational_status"] = bool(row["operational_status"])
+                row["sources"] = [dict(source) for source in conn.execute(
+                    'SELECT source_type, source, observed_at FROM fact_sources WHERE fact_id=? '
+                    'ORDER BY observed_at DESC LIMIT 5', (row["id"],))]
+            return rows
+        except sqlite3.Error as e:
+            logger.error(f"Database error querying data centre facts: {e}")
+            return []
+        finally:
+            conn.close()
+
+
+_fact_store: Optional[DataCentreFactStore] = None
+
+
+def get_fact_store() -> DataCentreFactStore:
+    global _fact_store
+    if _fact_store is None:
+        _fact_store = DataCentreFactStore()
+    return _fact_store
+
+
+def _looks_like_profile(item: Any) -> bool:
+    return isinstance(item, dict) and "name" in item and ("location" in item or "mw" in item or "city" in item)
+
+
+def find_profiles(value: Any) -> List[Dict[str, Any]]:
+    """Data centre profile dicts anywhere in a nested structure or JSON text."""
+    if isinstance(value, str):
+        texts = _json_block_re.findall(value) or [value]
+        found = []
+        for text in texts:
+            try:
+                found.extend(find_profiles(json.loads(text)))
+            except ValueError:
+                continue
+        return found
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    if _looks_like_profile(value):
+        return [value]
+    if isinstance(value, dict):
+        return [profile for item in value.values() for profile in find_profiles(item)]
+    if isinstance(value, list):
+        return [profile for item in value for profile in find_profiles(item)]
+    return []
+
+
+def record_scrape(url: str, extraction: Any) -> int:
+    """Store the data centres found in a scraper extraction of ``url``."""
+    if not isinstance(extraction, dict):
+        return 0
+    profiles = find_profiles(extraction.get("extract", extraction))
+    if not profiles:
+        return 0
+    return get_fact_store().upsert(profiles, "scrape", url, operator=operator_from_url(url))
+
+
+def record_crew_output(crew_name: str, output: Any) -> int:
+    """Store data centre profiles found in a crew's output. Never raises."""
+    try:
+        profiles = find_profiles(output)
+        return get_fact_store().upsert(profiles, "crew", crew_name) if profiles else 0
+    except Exception as e:
+        logger.error(f"Could not record facts from crew {crew_name}: {e}")
+        return 0
+
+
+class DataCentreFactsTool:
+
+    @tool("Query Data Centre Facts")
+    def query_data_centre_facts(query: str) -> list:
+        """Look up known data centres (name, operator, location, operational status, MW) collected from
+        earlier scrapes and crew runs, with their sources. The input is a location such as "Singapore",
+        or JSON with any of "operator", "city", "country", "location", "operational" (true/false) and
+        "min_mw". Returns an empty list when nothing is known yet."""
+        try:
+            filters = json.loads(query)
+        except ValueError:
+            filters = query
+        if not isinstance(filters, dict):
+            filters = {"location": str(filters).strip()} if str(filters).strip() else {}
+        allowed = {"operator", "city", "country", "location", "operational", "min_mw"}
+        return get_fact_store().query(**{key: value for key, value in filters.items() if key in allowed})
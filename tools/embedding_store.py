@@ -0,0 +1,177 @@
+import fcntl
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_dtypes = {'float32': np.float32, 'float16': np.float16}
+_search_block_rows = 65536
+
+
+class MemmapEmbeddingStore:
+    """Append-only embedding matrix on disk, opened read-only via numpy memmap.
+
+    Files for ``path``:
+      ``<path>.bin``        row-major float32/float16 matrix of L2-normalised vectors
+      ``<path>.ids.json``   sidecar id table, one id per matrix row
+      ``<path>.meta.json``  dim, dtype and committed row count
+      ``<path>.lock``       held by writers across processes
+
+    Writers take the lock file, re-read the committed rows, append and then
+    atomically replace the meta file, so readers only ever see committed rows
+    and concurrent writers in different workers never overwrite each other.
+    Every gunicorn worker maps the same file and shares the page cache
+    instead of holding its own deserialised copy; use ``shared`` for one
+    instance per path within a process.
+    """
+
+    _instances: Dict[str, "MemmapEmbeddingStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str, dim: Optional[int] = None, dtype: str = 'float32'):
+        self.path = path
+        self.matrix_path = f"{path}.bin"
+        self.ids_path = f"{path}.ids.json"
+        self.meta_path = f"{path}.meta.json"
+        self.lock_path = f"{path}.lock"
+        self._lock = threading.RLock()
+        self._matrix = None
+        self._ids: List[str] = []
+        self._positions = {}
+        self._meta_mtime = None
+        meta = self._read_meta()
+        if meta:
+            self.dim, self.dtype = meta['dim'], meta['dtype']
+        else:
+            if dtype not in _dtypes:
+                raise ValueError(f"Unsupported dtype {dtype}, expected one of {list(_dtypes)}")
+            self.dim, self.dtype = dim, dtype
+
+    @classmethod
+    def shared(cls, path: str, dim: Optional[int] = None, dtype: str = 'float32') -> "MemmapEmbeddingStore":
+        """The per-process store for ``path``, created on first use."""
+        path = os.path.abspath(path)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path, dim=dim, dtype=dtype)
+            return cls._instances[path]
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self.meta_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self):
+        """Re-map the matrix if another writer committed rows since the last look."""
+        try:
+            mtime = os.stat(self.meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._meta_mtime:
+            return
+        with self._lock:
+            meta = self._read_meta()
+            with open(self.ids_path, 'r') as f:
+                ids = json.load(f)[:meta['count']]
+            if meta['count']:
+                self._matrix = np.memmap(self.matrix_path, dtype=_dtypes[meta['dtype']], mode='r',
+                                         shape=(meta['count'], meta['dim']))
+            else:
+                self._matrix = None
+            self._ids = ids
+            self._positions = {doc_id: row for row, doc_id in enumerate(ids)}
+            self.dim, self.dtype = meta['dim'], meta['dtype']
+            self._meta_mtime = mtime
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._ids)
+
+    def __contains__(self, doc_id: str) -> bool:
+        self._refresh()
+        return doc_id in self._positions
+
+    @property
+    def ids(self) -> List[str]:
+        self._refresh()
+        return list(self._ids)
+
+    def add(self, ids: Sequence[str], vectors: Iterable[Sequence[float]]) -> int:
+        """Append vectors for ids not already stored. Returns the number of rows added."""
+        self._refresh()
+        vectors = np.asarray(list(vectors), dtype=np.float32)
+        if not len(ids):
+            return 0
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("Expected one vector per id")
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._lock, open(self.lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another worker may have committed rows since our last look.
+                self._meta_mtime = None
+                self._refresh()
+                if self.dim is None:
+                    self.dim = vectors.shape[1]
+                if vectors.shape[1] != self.dim:
+                    raise ValueError(f"Vector dimension {vectors.shape[1]} does not match store dimension {self.dim}")
+                seen = set(self._positions)
+                keep = []
+                for row, doc_id in enumerate(ids):
+                    if doc_id not in seen:
+                        seen.add(doc_id)
+                        keep.append(row)
+                if not keep:
+                    return 0
+                new_ids = [ids[row] for row in keep]
+                rows = vectors[keep]
+                norms = np.linalg.norm(rows, axis=1, keepdims=True)
+                rows = rows / np.where(norms == 0, 1, norms)
+                count = len(self._ids)
+                with open(self.matrix_path, 'r+b' if os.path.exists(self.matrix_path) else 'wb') as f:
+                    # Truncate any uncommitted tail left by an interrupted writer.
+                    f.truncate(count * self.dim * np.dtype(_dtypes[self.dtype]).itemsize)
+                    f.seek(0, os.SEEK_END)
+                    f.write(rows.astype(_dtypes[self.dtype]).tobytes())
+                self._write_json(self.ids_path, self._ids + new_ids)
+                self._write_json(self.meta_path, {'dim': self.dim, 'dtype': self.dtype,
+                                                  'count': count + len(new_ids)})
+                self._meta_mtime = None
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        self._refresh()
+        return len(new_ids)
+
+    @staticmethod
+    def _write_json(path: str, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def get(self, doc_id: str) -> Optional[np.ndarray]:
+        self._refresh()
+        row = self._positions.get(doc_id)
+        return None if row is None else np.asarray(self._matrix[row], dtype=np.float32)
+
+    def search(self, vector: Sequence[float], k: int = 5) -> List[Tuple[str, float]]:
+        """Return up to ``k`` (id, cosine similarity) pairs, best first."""
+        self._refresh()
+        if self._matrix is None or not len(self._ids):
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        query = query / norm if norm else query
+        # Score in blocks so float16 stores are never upcast in one piece.
+        scores = np.concatenate([
+            np.asarray(self._matrix[start:start + _search_block_rows], dtype=np.float32) @ query
+            for start in range(0, len(self._ids), _search_block_rows)
+        ])
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[row], float(scores[row])) for row in top]
@@ -0,0 +1,174 @@
+import logging
+import os
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import chromadb
+from llama_index.core import StorageContext
+from llama_index.core.indices import load_index_from_storage
+from llama_index.core.indices.vector_store.base import VectorStoreIndex
+from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.llms.openai import OpenAI
+from llama_index.vector_stores.chroma import ChromaVectorStore
+
+from tools.bm25_index import BM25Index
+from tools.cassette import get_cassette
+from tools.hybrid_retrieval import HybridNodeRetriever, build_bm25_from_nodes
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/excel_rag.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+persist_dir = "./cache/excel_storage"
+chroma_dir = "./cache/excel_chroma_db"
+collection_name = "excel_rag"
+version_files = ("docstore.json", "index_store.json")
+bm25_file = "bm25.json"
+
+
+class ExcelIndexManager:
+    """Keeps the Excel recursive index and its query engines resident in the worker.
+
+    The index is loaded from ``persist_dir`` once and only reloaded when the
+    persisted files change on disk (e.g. another worker ingested new workbooks).
+    Queries run without holding the lock so concurrent requests share the
+    same engine; only loading and ingestion are serialised.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, persist_dir: str = persist_dir, chroma_dir: str = chroma_dir,
+                 collection_name: str = collection_name, similarity_top_k: int = 5,
+                 fetch_k: int = 20, llm=None):
+        self.persist_dir = persist_dir
+        self.chroma_dir = chroma_dir
+        self.collection_name = collection_name
+        self.similarity_top_k = similarity_top_k
+        self.fetch_k = fetch_k
+        self._lock = threading.RLock()
+        self._index = None
+        self._bm25 = None
+        self._version = None
+        self._llm = llm
+        self._llms: Dict[str, OpenAI] = {}
+        self._query_engines: Dict[str, object] = {}
+
+    @classmethod
+    def instance(cls) -> "ExcelIndexManager":
+        """Return the per-process manager, creating it on first use."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def index_version(self) -> Optional[Tuple[int, ...]]:
+        """Return the on-disk version of the persisted index, or None if absent."""
+        try:
+            return tuple(os.stat(os.path.join(self.persist_dir, name)).st_mtime_ns
+                         for name in version_files)
+        except FileNotFoundError:
+            return None
+
+    def has_index(self) -> bool:
+        return self.index_version() is not None
+
+    def get_llm(self, model_name: Optional[str] = None) -> OpenAI:
+        if self._llm is not None:
+            return self._llm
+        model_name = model_name or os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
+        llm = self._llms.get(model_name)
+        if llm is None:
+            with self._lock:
+                llm = self._llms.get(model_name)
+                if llm is None:
+                    logger.info(f"Creating LLM client for {model_name}")
+                    llm = OpenAI(model=model_name)
+                    self._llms[model_name] = llm
+        return llm
+
+    def _vector_store(self) -> ChromaVectorStore:
+        chroma_client = chromadb.PersistentClient(self.chroma_dir)
+        chroma_collection = chroma_client.get_or_create_collection(name=self.collection_name)
+        return ChromaVectorStore(chroma_collection=chroma_collection)
+
+    def _load(self, version: Tuple[int, ...]):
+        logger.info(f"Loading Excel index from {self.persist_dir} (version {version})")
+        storage_context = StorageContext.from_defaults(persist_dir=self.persist_dir,
+                                                       vector_store=self._vector_store())
+        self._index = load_index_from_storage(storage_context)
+        self._bm25 = BM25Index.load(os.path.join(self.persist_dir, bm25_file))
+        self._version = version
+        self._query_engines = {}
+
+    def get_index(self):
+        """Return the resident index, reloading it if the persisted version changed."""
+        version = self.index_version()
+        if version is None:
+            return None
+        if self._index is not None and version == self._version:
+            return self._index
+        with self._lock:
+            version = self.index_version()
+            if version is not None and (self._index is None or version != self._version):
+                self._load(version)
+            return self._index
+
+    def get_query_engine(self, model_name: Optional[str] = None):
+        """Return a cached query engine over the resident index, or None if no index exists."""
+        index = self.get_index()
+        if index is None:
+            return None
+        llm = self.get_llm(model_name)
+        key = getattr(llm, 'model', type(llm).__name__)
+        engine = self._query_engines.get(key)
+        if engine is None:
+            with self._lock:
+                engine = self._query_engines.get(key)
+                if engine is None:
+                    engine = self._build_query_engine(index, llm)
+                    self._query_engines[key] = engine
+        return engine
+
+    def _build_query_engine(self, index, llm):
+        if not self._bm25:
+            logger.info("No BM25 side index, using dense retrieval only")
+            return index.as_query_engine(similarity_top_k=self.similarity_top_k, llm=llm)
+        retriever = HybridNodeRetriever(index.as_retriever(similarity_top_k=self.fetch_k), self._bm25,
+                                        similarity_top_k=self.similarity_top_k, fetch_k=self.fetch_k)
+        return RetrieverQueryEngine.from_args(retriever, llm=llm)
+
+    def ingest(self, excel_files: List[str], parser, node_parser, processed_path: str) -> int:
+        """Parse workbooks into a new index, persist it and make it resident.
+
+        Returns the number of nodes indexed. Files are moved to ``processed_path``
+        once persisted so they are not parsed again.
+        """
+        with self._lock:
+            logger.info(f"Processing {len(excel_files)} Excel files")
+            storage_context = StorageContext.from_defaults(vector_store=self._vector_store())
+            documents = get_cassette().call("llamaparse", parser.load_data, excel_files)
+            nodes = node_parser.get_nodes_from_documents(documents)
+            base_nodes, objects = node_parser.get_nodes_and_objects(nodes)
+            logger.info(f"Processing {len(base_nodes)} base nodes")
+            index = VectorStoreIndex(nodes=base_nodes + objects, llm=self.get_llm(),
+                                     storage_context=storage_context)
+            # Write the BM25 side index before the docstore so other workers
+            # never see a new index version without its matching BM25 file.
+            bm25 = BM25Index(os.path.join(self.persist_dir, bm25_file))
+            build_bm25_from_nodes(bm25, base_nodes + objects).save()
+            index.storage_context.persist(persist_dir=self.persist_dir)
+            os.makedirs(processed_path, exist_ok=True)
+            for excel_file in excel_files:
+                processed_filepath = os.path.join(processed_path, os.path.basename(excel_file))
+                logger.info(f"Processing file: {excel_file}")
+                shutil.move(excel_file, processed_filepath)
+            self._index = index
+            self._bm25 = bm25
+            self._version = self.index_version()
+            self._query_engines = {}
+            return len(base_nodes) + len(objects)
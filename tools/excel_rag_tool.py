@@ -4,21 +4,12 @@ import os
 import shutil
 
 import chromadb
-import faiss
 from crewai.tools import tool
 from langchain.chains import ConversationalRetrievalChain
 from langchain.memory import ConversationBufferMemory
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.docstore.in_memory import InMemoryDocstore
-from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from llama_index.core import StorageContext
-from llama_index.core.indices import load_index_from_storage
-from llama_index.core.indices.vector_store.base import VectorStoreIndex
 from llama_index.core.node_parser import MarkdownElementNodeParser
-from llama_index.llms.openai import OpenAI
-from llama_index.vector_stores.chroma import ChromaVectorStore
 from llama_parse import LlamaParse, ResultType
 from pydantic.v1 import NoneBytes
 
@@ -29,6 +20,12 @@ from db_utils import (
   similarity_threshold,
   store_result,
 )
+from tools.cassette import get_cassette
+from tools.excel_index_manager import ExcelIndexManager
+from tools.bm25_index import BM25Index
+from tools.embedding_store import MemmapEmbeddingStore
+from tools.hybrid_retrieval import HybridDocumentRetriever, MemmapDocumentSearch, chunk_id
+from tools.table_chunker import chunk_markdown_tables
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -39,7 +36,8 @@ logger.addHandler(handler)
 
 directory_path = "./src_docs"
 processed_path = "./src_docs/processed_docs"
-excel_rag_db = "./cache/excel_rag_db.db"
+excel_rag_embeddings = "./cache/excel_rag_embeddings"
+excel_rag_bm25 = "./cache/excel_rag_bm25.json"
 
 class ExcelRagTool:
   def iterate_excel_files(directory):
@@ -66,7 +64,7 @@ class ExcelRagTool:
         result_type="markdown",
     )
     try:
-        docs = parser.load_data(excel_file)
+        docs = get_cassette().call("llamaparse", parser.load_data, excel_file)
         logger.debug(f"Successfully extracted {len(docs)} documents")
         return docs
     except Exception as e:
@@ -107,39 +105,35 @@ class ExcelRagTool:
             )
             embeddings = OpenAIEmbeddings(api_key=openai_api_key)
 
-            logger.debug("Creating FAISS index")
-            index = faiss.IndexFlatL2(len(embeddings.embed_query("hello world")))
-            vectorstore = FAISS(
-                embedding_function=embeddings,
-                index=index,
-                docstore=InMemoryDocstore(),
-                index_to_docstore_id={},
-            )
+            store = MemmapEmbeddingStore.shared(excel_rag_embeddings,
+                                                dtype=os.environ.get('EMBEDDING_STORE_DTYPE', 'float32'))
 
             memory = ConversationBufferMemory(return_messages=True, memory_key="chat_history")
-            text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
             texts = []
+            metadatas = []
+            bm25 = BM25Index.load(excel_rag_bm25)
 
             logger.info("Processing Excel files")
             for filepath in ExcelRagTool.iterate_excel_files(directory_path):
                 logger.debug(f"Processing file: {filepath}")
                 docs = ExcelRagTool.extract_text_from_excel_llama_parse(filepath)
                 for doc in docs:
-                    texts.extend(text_splitter.split_text(doc.text))
+                    for chunk in chunk_markdown_tables(doc.text, source=os.path.basename(filepath)):
+                        chunk['metadata']['chunk_id'] = chunk_id(chunk['metadata']['source'], chunk['text'])
+                        texts.append(chunk['text'])
+                        metadatas.append(chunk['metadata'])
+                        bm25.add(chunk['metadata']['chunk_id'], chunk['text'], chunk['metadata'])
                 shutil.move(filepath, processed_path)
 
             logger.debug(f"Created {len(texts)} text chunks")
-            temp_vectorstore = FAISS.from_texts(texts, embeddings)
-
-            if os.path.exists(excel_rag_db):
-                logger.info("Loading existing vector store")
-                vectorstore.load_local(excel_rag_db, embeddings, allow_dangerous_deserialization=True)
-                vectorstore.merge_from(temp_vectorstore)
-            else:
-                logger.info("Creating new vector store")
-                vectorstore = temp_vectorstore
-
-            vectorstore.save_local(excel_rag_db)
+            # Chunk text lives in the BM25 index, so persist it before the vectors.
+            bm25.save()
+            new_rows = [i for i, metadata in enumerate(metadatas) if metadata['chunk_id'] not in store]
+            if new_rows:
+                logger.info(f"Embedding {len(new_rows)} new chunks")
+                store.add([metadatas[i]['chunk_id'] for i in new_rows],
+                          embeddings.embed_documents([texts[i] for i in new_rows]))
+            vectorstore = MemmapDocumentSearch(embeddings, store, bm25)
             prompt_decorator = """
 
             Context: {context}
@@ -154,7 +148,7 @@ class ExcelRagTool:
             custom_prompt = ChatPromptTemplate.from_template(prompt.join(prompt_decorator))
             qa_chain = ConversationalRetrievalChain.from_llm(
                 llm,
-                retriever=vectorstore.as_retriever(),
+                retriever=HybridDocumentRetriever(vectorstore=vectorstore, bm25=bm25),
                 memory=memory,
                 combine_docs_chain_kwargs={"prompt": custom_prompt}
             )
@@ -241,7 +235,6 @@ class ExcelRagTool:
         logger.info(f"Executing Excel RAG query: {query}")
         tag = "ExcelRAG"
         cache_query = f'{tag}:{query}'
-        persist_dir = "./cache/excel_storage"
         
         try:
             cache=chroma_client = chromadb.PersistentClient(path=db_path)
@@ -263,58 +256,28 @@ class ExcelRagTool:
     
         logger.info("No cache hit, processing query")
         
-        model_name=os.getenv("OPENAI_MODEL_NAME","gpt-4o-mini")
-        llm = OpenAI(model=model_name)
-        #EMBEDDING_MODEL = "text-embedding-3-small"
-        directory=directory_path
-        logger.info(f"Processing Excel files")
-        collection_name="excel_rag"
-        llamaparse_api_key=os.getenv('LLAMAPARSE_API_KEY', 'dev-key-please-change')
-        excel_files = [os.path.join(directory_path,filename) for filename in os.listdir(directory_path) if filename.endswith('.xlsx')]
-        logger.debug(f"Excel files found: {excel_files}")
-        chroma_client = chromadb.PersistentClient("./cache/excel_chroma_db")
-        chroma_collection = chroma_client.get_or_create_collection(name=collection_name)
-        parser_instruction=f"You are parsing an analyst report {backstory}. Extract information about {context} per geographic region"
-        logger.info(f"processing with{parser_instruction}")
-        parser = LlamaParse(
-          api_key=llamaparse_api_key,
-          parsing_instruction = parser_instruction,
-          result_type=ResultType.MD
-        )
-        node_parser = MarkdownElementNodeParser(llm=llm, num_workers=4)
-        if os.path.exists(os.path.join(persist_dir, "docstore.json")) and len(excel_files)>0:
-           logger.info("Loading existing vector store")
-           vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
-           storage_context = StorageContext.from_defaults(persist_dir=persist_dir,vector_store=vector_store)
-           storage_context.index_store.index_structs()
-           recursive_index=load_index_from_storage(storage_context)
-        else:
-           logger.info("Creating new or updating vector store")
-           vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
-           storage_context = StorageContext.from_defaults(
-              vector_store=vector_store,
-           )
-           excel_files = [os.path.join(directory,filename) for filename in os.listdir(directory) if filename.endswith('.xlsx')]
-           if len(excel_files) > 0:
-                logger.info(f"Processing {len(excel_files)} Excel files")
-                documents=parser.load_data(excel_files)
-                nodes = node_parser.get_nodes_from_documents(documents)
-                base_nodes, objects = node_parser.get_nodes_and_objects(nodes)
-                logger.info(f"Processing {len(base_nodes)} base nodes")
-                recursive_index = VectorStoreIndex(nodes=base_nodes + objects, llm=llm,storage_context=storage_context)
-                recursive_index.storage_context.persist(persist_dir=persist_dir)
-                for excel_file in excel_files:
-                    processed_filepath = os.path.join(processed_path, excel_file)
-                    logger.info(f"Processing file: {excel_file}")
-                    shutil.move(excel_file, processed_filepath)
-           else:
+        manager = ExcelIndexManager.instance()
+        if not manager.has_index():
+            llamaparse_api_key=os.getenv('LLAMAPARSE_API_KEY', 'dev-key-please-change')
+            excel_files = [os.path.join(directory_path,filename) for filename in os.listdir(directory_path) if filename.endswith('.xlsx')]
+            logger.debug(f"Excel files found: {excel_files}")
+            if len(excel_files) == 0:
+                return "No excel files found"
+            logger.info("Creating new vector store")
+            parser_instruction=f"You are parsing an analyst report {backstory}. Extract information about {context} per geographic region"
+            logger.info(f"processing with{parser_instruction}")
+            parser = LlamaParse(
+              api_key=llamaparse_api_key,
+              parsing_instruction = parser_instruction,
+              result_type=ResultType.MD
+            )
+            node_parser = MarkdownElementNodeParser(llm=manager.get_llm(), num_workers=4)
+            manager.ingest(excel_files, parser, node_parser, processed_path)
+
+        recursive_query_engine = manager.get_query_engine()
+        if recursive_query_engine is None:
             return "No excel files found"
-    
-        recursive_query_engine = recursive_index.as_query_engine(
-            similarity_top_k=5, 
-            llm=llm
-        )
-    
+
         response_recursive = recursive_query_engine.query(query)
-    
+
         return response_recursive.response
\ No newline at end of file
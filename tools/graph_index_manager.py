@@ -0,0 +1,295 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from llama_index.core import KnowledgeGraphIndex, Settings, StorageContext
+from llama_index.core.graph_stores import SimpleGraphStore
+from llama_index.core.indices import load_index_from_storage
+from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.embeddings.openai import OpenAIEmbedding
+from llama_index.llms.openai import OpenAI
+
+from tools.bm25_index import BM25Index
+from tools.embedding_store import MemmapEmbeddingStore
+from tools.hybrid_retrieval import (
+    HybridNodeRetriever,
+    MemmapNodeRetriever,
+    build_bm25_from_nodes,
+    embed_nodes_into_store,
+)
+from tools.pdf_stream import stream_pdf_pages
+from tools.sqlite_graph_store import SqliteGraphStore
+from tools.triplet_cache import TripletCache, cached_triplet_extractor
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/rag_tool.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+persist_dir = "./cache/graph_storage"
+legacy_persist_dir = "./storage"
+version_files = ("docstore.json", "index_store.json")
+graph_db_file = "graph.sqlite3"
+legacy_graph_file = "graph_store.json"
+manifest_file = "ingested.json"
+bm25_file = "bm25.json"
+embeddings_file = "embeddings"
+max_triplets_per_chunk = 3
+side_index_batch_pages = 32
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class GraphIndexManager:
+    """Keeps the PDF knowledge graph index resident and grows it incrementally.
+
+    The persisted graph under ``persist_dir`` is loaded once per process and
+    reloaded only when another worker persists a newer version. New PDFs are
+    recognised by content hash and inserted into the existing index, so
+    triplet extraction and embedding only run for their chunks.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, persist_dir: str = persist_dir, llm=None, embed_model=None,
+                 similarity_top_k: int = 5, fetch_k: int = 20, triplet_cache: Optional[TripletCache] = None):
+        self.persist_dir = persist_dir
+        self.similarity_top_k = similarity_top_k
+        self.fetch_k = fetch_k
+        self._llm = llm
+        self._embed_model = embed_model
+        self._triplet_cache = triplet_cache
+        self._lock = threading.RLock()
+        self._persist_lock_depth = 0
+        self._index = None
+        self._bm25 = None
+        self._chunk_store = None
+        self._graph_store = None
+        self._version = None
+        self._query_engine = None
+
+    @classmethod
+    def instance(cls) -> "GraphIndexManager":
+        """Return the per-process manager, creating it on first use."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            self._llm = OpenAI(
+                model=os.environ.get('OPENAI_MODEL_NAME', 'gpt-3.5-turbo'),
+                temperature=0.5,
+                api_key=os.environ.get('OPENAI_API_KEY', 'dev-key-please-change'),
+            )
+        return self._llm
+
+    @property
+    def embed_model(self):
+        if self._embed_model is None:
+            self._embed_model = OpenAIEmbedding(api_key=os.environ.get('OPENAI_API_KEY', 'dev-key-please-change'),
+                                                model="text-embedding-3-small",
+                                                embed_batch_size=100)
+        return self._embed_model
+
+    def _triplet_extractor(self):
+        if self._triplet_cache is None:
+            self._triplet_cache = TripletCache()
+        return cached_triplet_extractor(self.llm, max_triplets_per_chunk, self._triplet_cache)
+
+    def _get_graph_store(self) -> SqliteGraphStore:
+        if self._graph_store is None:
+            self._graph_store = SqliteGraphStore(os.path.join(self.persist_dir, graph_db_file))
+        return self._graph_store
+
+    def _import_legacy_graph(self, source: str):
+        """Copy triplets from a SimpleGraphStore JSON file into SQLite the first time it is seen."""
+        graph_store = self._get_graph_store()
+        legacy_path = os.path.join(source, legacy_graph_file)
+        if len(graph_store) or not os.path.exists(legacy_path):
+            return
+        logger.info(f"Importing knowledge graph triplets from {legacy_path}")
+        graph_store.import_graph_dict(SimpleGraphStore.from_persist_path(legacy_path)._data.graph_dict)
+
+    def _configure_settings(self):
+        Settings.embed_model = self.embed_model
+        Settings.chunk_size = 256
+        Settings.llm = self.llm
+
+    def index_version(self, directory: Optional[str] = None) -> Optional[Tuple[int, ...]]:
+        directory = directory or self.persist_dir
+        try:
+            return tuple(os.stat(os.path.join(directory, name)).st_mtime_ns for name in version_files)
+        except FileNotFoundError:
+            return None
+
+    def _manifest(self) -> Dict[str, str]:
+        try:
+            with open(os.path.join(self.persist_dir, manifest_file), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @contextmanager
+    def _persist_lock(self):
+        """Exclusive lock on the persist dir across gunicorn workers, re-entrant within this manager."""
+        with self._lock:
+            if self._persist_lock_depth:
+                self._persist_lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._persist_lock_depth -= 1
+                return
+            os.makedirs(self.persist_dir, exist_ok=True)
+            with open(os.path.join(self.persist_dir, ".lock"), 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._persist_lock_depth = 1
+                try:
+                    yield
+                finally:
+                    self._persist_lock_depth = 0
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        # Migration and the side-index sync write into persist_dir and pay for embeddings,
+        # so only one worker does them; the others then find the work done.
+        with self._persist_lock():
+            source = self.persist_dir
+            if self.index_version() is None and self.index_version(legacy_persist_dir) is not None:
+                logger.info(f"Migrating knowledge graph from {legacy_persist_dir} to {self.persist_dir}")
+                source = legacy_persist_dir
+            if self.index_version(source) is None:
+                self._index, self._version = None, None
+                return
+            logger.info(f"Loading knowledge graph index from {source}")
+            self._configure_settings()
+            os.makedirs(self.persist_dir, exist_ok=True)
+            self._import_legacy_graph(source)
+            storage_context = StorageContext.from_defaults(persist_dir=source, graph_store=self._get_graph_store())
+            self._index = load_index_from_storage(storage_context, max_triplets_per_chunk=max_triplets_per_chunk,
+                                                  include_embeddings=True,
+                                                  kg_triplet_extract_fn=self._triplet_extractor())
+            if source != self.persist_dir:
+                self._index.storage_context.persist(persist_dir=self.persist_dir)
+            self._bm25 = BM25Index.load(os.path.join(self.persist_dir, bm25_file))
+            self._chunk_store = MemmapEmbeddingStore.shared(os.path.join(self.persist_dir, embeddings_file),
+                                                            dtype=os.environ.get('EMBEDDING_STORE_DTYPE', 'float32'))
+            self._sync_side_indexes()
+            self._version = self.index_version()
+            self._query_engine = None
+
+    def _sync_side_indexes(self) -> List:
+        """Add docstore chunks missing from the BM25 and embedding side indexes."""
+        nodes = [node for node in self._index.docstore.docs.values() if node.node_id not in self._bm25]
+        if nodes:
+            build_bm25_from_nodes(self._bm25, nodes).save()
+        embed_nodes_into_store(self._chunk_store, self.embed_model, self._index.docstore.docs.values())
+        return nodes
+
+    def get_index(self):
+        version = self.index_version()
+        if self._index is not None and version == self._version:
+            return self._index
+        with self._lock:
+            if self._index is None or self.index_version() != self._version:
+                self._load()
+            return self._index
+
+    def ingest_new(self, src_dir: str, dest_dir: str) -> int:
+        """Insert PDFs in ``src_dir`` that are not yet in the graph, then move them to ``dest_dir``.
+
+        Returns the number of pages inserted. A file lock keeps gunicorn
+        workers from ingesting the same files concurrently.
+        """
+        if not os.path.isdir(src_dir):
+            return 0
+        pdfs = [os.path.join(src_dir, name) for name in sorted(os.listdir(src_dir)) if name.endswith(".pdf")]
+        if not pdfs:
+            return 0
+        with self._persist_lock():
+            self.get_index()
+            manifest = self._manifest()
+            new_files = {}
+            for path in pdfs:
+                if not os.path.exists(path):
+                    continue
+                digest = file_digest(path)
+                if digest not in manifest:
+                    new_files[path] = digest
+            inserted = 0
+            if new_files:
+                inserted = self._insert(list(new_files))
+                manifest.update({digest: os.path.basename(path) for path, digest in new_files.items()})
+                with open(os.path.join(self.persist_dir, manifest_file), 'w') as f:
+                    json.dump(manifest, f, indent=2)
+                self._index.storage_context.persist(persist_dir=self.persist_dir)
+                self._version = self.index_version()
+                self._query_engine = None
+            os.makedirs(dest_dir, exist_ok=True)
+            for path in pdfs:
+                if os.path.exists(path):
+                    shutil.move(path, os.path.join(dest_dir, os.path.basename(path)))
+            return inserted
+
+    def _insert(self, paths: List[str]) -> int:
+        """Stream pages of ``paths`` into the graph as they are extracted."""
+        self._configure_settings()
+        logger.info(f"Inserting pages from {len(paths)} new PDFs")
+        inserted = 0
+        for document in stream_pdf_pages(paths):
+            if self._index is None:
+                storage_context = StorageContext.from_defaults(graph_store=self._get_graph_store())
+                self._index = KnowledgeGraphIndex.from_documents(documents=[document],
+                                                                 max_triplets_per_chunk=max_triplets_per_chunk,
+                                                                 storage_context=storage_context,
+                                                                 embed_model=self.embed_model,
+                                                                 include_embeddings=True,
+                                                                 kg_triplet_extract_fn=self._triplet_extractor())
+                self._bm25 = BM25Index(os.path.join(self.persist_dir, bm25_file))
+                self._chunk_store = MemmapEmbeddingStore.shared(os.path.join(self.persist_dir, embeddings_file),
+                                                                dtype=os.environ.get('EMBEDDING_STORE_DTYPE', 'float32'))
+            else:
+                self._index.insert(document)
+            inserted += 1
+            if inserted % side_index_batch_pages == 0:
+                self._sync_side_indexes()
+        if self._index is not None:
+            self._sync_side_indexes()
+        logger.info(f"Inserted {inserted} pages")
+        return inserted
+
+    def get_query_engine(self):
+        """Return the cached hybrid query engine, or None if no graph has been built."""
+        index = self.get_index()
+        if index is None:
+            return None
+        engine = self._query_engine
+        if engine is None:
+            with self._lock:
+                if self._query_engine is None:
+                    retriever = HybridNodeRetriever(
+                        MemmapNodeRetriever(self._chunk_store, self.embed_model, index.docstore,
+                                            similarity_top_k=self.fetch_k),
+                        self._bm25, similarity_top_k=self.similarity_top_k, fetch_k=self.fetch_k,
+                        extra_retrievers=[index.as_retriever(similarity_top_k=self.similarity_top_k)])
+                    self._query_engine = RetrieverQueryEngine.from_args(retriever, llm=self.llm)
+                engine = self._query_engine
+        return engine
@@ -1,22 +1,8 @@
-import os
 import logging
-import shutil
-from llama_index.core.storage.storage_context import StorageContext
-from llama_index.core import SimpleDirectoryReader, KnowledgeGraphIndex
-from llama_index.core.graph_stores import SimpleGraphStore
-from llama_index.core.storage.docstore import SimpleDocumentStore
-from llama_index.core.vector_stores import SimpleVectorStore
-from llama_index.core.storage.index_store import SimpleIndexStore
-from llama_index.core import SimpleDirectoryReader
-from llama_index.core.indices import load_index_from_storage
-#from langchain_openai import OpenAIEmbeddings
-from llama_index.embeddings.openai import OpenAIEmbedding
-from llama_index.core import Settings
-from llama_index.llms.openai import OpenAI
-from llama_index.core import load_index_from_storage
 from crewai.tools import tool
 import chromadb
 from db_utils import get_vector_db_file, get_next_id, store_result, get_result_by_id,similarity_threshold
+from tools.graph_index_manager import GraphIndexManager
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -56,55 +42,13 @@ class GraphRagTool:
       data=get_result_by_id(doc_id)
       logger.debug(f"Retrieved cached data for ID {doc_id}")
     else: 
-      graph_db_path = "./cache/graph_store.db"
-      rag_db_path = "./storage"
-      documents = SimpleDirectoryReader(input_dir=src_dir,
-                                        required_exts=".pdf").load_data()
-      graph_db_path = "./store/graph_store.db"
+      manager = GraphIndexManager.instance()
+      manager.ingest_new(src_dir, dest_dir)
+      query_engine = manager.get_query_engine()
+      if query_engine is None:
+        return "No results found"
 
-      openai_api_key = os.environ.get('OPENAI_API_KEY', 'dev-key-please-change')
-      openai_model_name = os.environ.get('OPENAI_MODEL_NAME', 'gpt-3.5-turbo')
-
-      llm = OpenAI(
-        model=openai_model_name,
-        temperature=0.5,
-        api_key=openai_api_key,
-      )
-      #embeddings = OpenAIEmbeddings(api_key=openai_api_key)
-      embed_model = OpenAIEmbedding(api_key=openai_api_key,
-                                  model="text-embedding-3-small",
-                                  embed_batch_size=100)
-      Settings.embed_model = embed_model
-      Settings.chunk_size = 256
-      Settings.llm = llm
-      if os.path.exists(rag_db_path):
-                                               graph_store = SimpleGraphStore.from_persist_path(graph_db_path)
-                                               storage_context = StorageContext.from_defaults(
-                                               docstore=SimpleDocumentStore.from_persist_dir(persist_dir=rag_db_path),
-                                               vector_store=SimpleVectorStore.from_persist_dir(
-                                               persist_dir=rag_db_path
-                                               ),
-                                               index_store=SimpleIndexStore.from_persist_dir(persist_dir=rag_db_path),
-                                               graph_store=SimpleGraphStore.from_persist_dir(rag_db_path)
-                                               )
-                                               index = load_index_from_storage(storage_context)
-
-      else:
-                                               graph_store = SimpleGraphStore()
-                                               storage_context = StorageContext.from_defaults(graph_store=graph_store)
-                                               index = KnowledgeGraphIndex.from_documents(
-                                                                                          documents=documents,
-                                                                                          max_triplets_per_chunk=3,
-                                                                                          storage_context=storage_context,
-                                                                                          embed_model=embed_model,
-                                                                                          include_embeddings=True)
-
-      graph_store.persist(graph_db_path)
-      storage_context.persist("./storage")
-      query_engine = index.as_query_engine(llm=llm, similarity_top_k=5)
-
-      question = backstory
-      data = query_engine.query(question)
+      data = str(query_engine.query(question))
 
 
       id = get_next_id()
@@ -116,14 +60,4 @@ class GraphRagTool:
       store_result(id,question,data)
       logger.debug(f"Successfully cached result for query: {cache_query}")
 
-    if not os.path.exists(dest_dir):
-      os.makedirs(dest_dir)
-
-    for filename in os.listdir(src_dir):
-      if filename.endswith(".pdf"):
-        source_file = os.path.join(src, filename)
-        dest_file = os.path.join(dest_dir, filename)
-        shutil.move(source_file, dest_file)
-
-
     return data if data else "No results found"
\ No newline at end of file
@@ -0,0 +1,337 @@
+"""Local extraction of company and data centre facts from HTML.
+
+Pages are parsed with the standard library's incremental ``HTMLParser`` into
+text blocks (tagged with the path of headings they sit under), tables and JSON-LD
+objects. Heuristic extractors then fill the scraper schemas. An extractor
+returns None when required fields are missing, so the caller can fall back
+to Firecrawl. The extractors take HTML strings, so they can be run against
+saved pages without network access; ``python -m benchmarks.check_html_extract``
+does that for the pages in ``benchmarks/fixtures/html``.
+"""
+import json
+import re
+from contextlib import suppress
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional
+
+block_tags = {"p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "td", "th", "dt", "dd", "blockquote", "figcaption"}
+heading_tags = {"h1", "h2", "h3", "h4"}
+skip_tags = {"script", "style", "noscript", "svg", "template", "iframe"}
+self_closing_blocks = {"p", "li", "dt", "dd"}
+max_item_chars = 120
+max_items = 25
+
+_space_re = re.compile(r"\s+")
+_mw_re = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:MW|megawatts?)\b", re.I)
+_operational_re = re.compile(r"\b(operational|live|open|in service|in operation|online)\b", re.I)
+_not_operational_re = re.compile(r"\b(planned|under construction|construction|development|coming soon|"
+                                 r"future|proposed|pipeline)\b", re.I)
+_separator_re = re.compile(r"\s+[|–—•·-]\s+|\s*[|•·]\s*")
+
+
+@dataclass
+class TextBlock:
+    tag: str
+    text: str
+    heading: str
+
+
+@dataclass
+class ParsedPage:
+    title: str = ""
+    meta: Dict[str, str] = field(default_factory=dict)
+    blocks: List[TextBlock] = field(default_factory=list)
+    tables: List[List[List[str]]] = field(default_factory=list)
+    json_ld: List[Any] = field(default_factory=list)
+
+
+class PageParser(HTMLParser):
+    """Streams HTML into a ``ParsedPage``; ``feed`` can be called with chunks as they arrive."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.page = ParsedPage()
+        self._skip_depth = 0
+        self._json_ld: Optional[List[str]] = None
+        self._in_title = False
+        self._stack: List[List[Any]] = []
+        self._headings: Dict[int, str] = {}
+        self._tables: List[List[List[str]]] = []
+        self._row: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            self._json_ld = []
+            return
+        if tag in skip_tags:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            key = (attrs.get("name") or attrs.get("property") or "").lower()
+            if key and attrs.get("content"):
+                self.page.meta.setdefault(key, attrs["content"].strip())
+        elif tag == "table":
+            self._tables.append([])
+        elif tag == "tr" and self._tables:
+            self._close_row()
+            self._row = []
+        elif tag == "br" and self._stack:
+            self._stack[-1][1].append(" ")
+        if tag in block_tags:
+            if tag in heading_tags:
+                self._close_implicit(self_closing_blocks)
+            elif tag in self_closing_blocks and self._stack and self._stack[-1][0] == tag:
+                self._emit(self._stack.pop())
+            self._stack.append([tag, []])
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._json_ld is not None:
+            with suppress(ValueError):
+                self.page.json_ld.append(json.loads("".join(self._json_ld)))
+            self._json_ld = None
+            return
+        if tag in skip_tags:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+        if tag == "title":
+            self._in_title = False
+        elif tag in block_tags and any(open_tag == tag for open_tag, _ in self._stack):
+            while self._stack:
+                item = self._stack.pop()
+                self._emit(item)
+                if item[0] == tag:
+                    break
+        elif tag in ("ul", "ol", "dl"):
+            self._close_implicit({"li", "dt", "dd"})
+        elif tag == "tr":
+            self._close_row()
+        elif tag == "table" and self._tables:
+            self._close_row()
+            table = self._tables.pop()
+            if table:
+                self.page.tables.append(table)
+
+    def handle_data(self, data):
+        if self._json_ld is not None:
+            self._json_ld.append(data)
+        elif self._skip_depth:
+            return
+        elif self._in_title:
+            self.page.title += data
+        elif self._stack:
+            self._stack[-1][1].append(data)
+
+    def _close_implicit(self, tags):
+        """Emit blocks whose end tag HTML allows to be omitted, such as an unclosed ``<li>``."""
+        while self._stack and self._stack[-1][0] in tags:
+            self._emit(self._stack.pop())
+
+    def _close_row(self):
+        if self._row and self._tables:
+            self._tables[-1].append(self._row)
+        self._row = None
+
+    def _emit(self, item):
+        tag, parts = item
+        text = _space_re.sub(" ", "".join(parts)).strip()
+        if tag in ("td", "th") and self._row is not None:
+            self._row.append(text)
+        if not text:
+            return
+        if tag in heading_tags:
+            level = int(tag[1])
+            self._headings = {lvl: heading for lvl, heading in self._headings.items() if lvl < level}
+            self.page.blocks.append(TextBlock(tag, text, self._heading_path()))
+            self._headings[level] = text
+            return
+        self.page.blocks.append(TextBlock(tag, text, self._heading_path()))
+
+    def _heading_path(self) -> str:
+        return " > ".join(self._headings[level] for level in sorted(self._headings))
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._emit(self._stack.pop())
+        self.page.title = _space_re.sub(" ", self.page.title).strip()
+
+
+def parse_html(html: str) -> ParsedPage:
+    parser = PageParser()
+    parser.feed(html)
+    parser.close()
+    return parser.page
+
+
+def _json_ld_objects(page: ParsedPage) -> List[Dict[str, Any]]:
+    objects, stack = [], list(page.json_ld)
+    while stack:
+        item = stack.pop(0)
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            objects.append(item)
+            stack.extend(item.get("@graph", []))
+    return objects
+
+
+def _address_text(address: Any) -> str:
+    if isinstance(address, str):
+        return address
+    if isinstance(address, dict):
+        country = address.get("addressCountry")
+        if isinstance(country, dict):
+            country = country.get("name")
+        parts = [address.get("addressLocality"), address.get("addressRegion"), country]
+        return ", ".join(str(part) for part in parts if part)
+    return ""
+
+
+def _items_under(page: ParsedPage, heading_pattern: str) -> List[str]:
+    """Short list items and sub-headings that sit under a heading matching ``heading_pattern``."""
+    pattern = re.compile(heading_pattern, re.I)
+    items: List[str] = []
+    for block in page.blocks:
+        if block.tag in ("li", "h3", "h4", "dt") and pattern.search(block.heading):
+            text = block.text.strip(" .:;")
+            if 2 < len(text) <= max_item_chars and text not in items:
+                items.append(text)
+    return items[:max_items]
+
+
+def extract_company_overview(page: ParsedPage) -> Optional[Dict[str, Any]]:
+    """Fill CompanyOverviewExtractSchema fields, or None without a mission and some products or services."""
+    organisations = [obj for obj in _json_ld_objects(page)
+                     if str(obj.get("@type", "")).lower() in ("organization", "corporation", "localbusiness")]
+    mission_blocks = [block.text for block in page.blocks
+                      if block.tag == "p" and re.search(r"mission|about|who we are|purpose", block.heading, re.I)]
+    long_paragraphs = [block.text for block in page.blocks if block.tag == "p" and len(block.text) >= 60]
+    candidates = ([org.get("description") for org in organisations] + mission_blocks +
+                  [page.meta.get("description"), page.meta.get("og:description")] + long_paragraphs)
+    mission = next((str(text).strip() for text in candidates if text and str(text).strip()), "")
+
+    locations = _items_under(page, r"location|data ?cent|facilit|campus|region|where we|presence|offices?")
+    for org in organisations:
+        for address in (org.get("address"), *(place.get("address") for place in org.get("location", [])
+                                               if isinstance(place, dict))):
+            text = _address_text(address)
+            if text and text not in locations:
+                locations.append(text)
+    data = {
+        "company_mission": mission,
+        "products": _items_under(page, r"product|solution|platform|offering"),
+        "services": _items_under(page, r"service"),
+        "locations": locations[:max_items],
+    }
+    if not data["company_mission"] or not (data["products"] or data["services"]):
+        return None
+    return data
+
+
+def _parse_mw(text: str) -> Optional[int]:
+    match = _mw_re.search(text)
+    if not match:
+        return None
+    return int(float(match.group(1).replace(",", ".")) + 0.5)
+
+
+def _parse_status(text: str) -> bool:
+    """Pages mostly list running facilities, so only explicit planned/construction wording means not operational."""
+    if _operational_re.search(text):
+        return True
+    return not _not_operational_re.search(text)
+
+
+def _column(header: List[str], pattern: str) -> Optional[int]:
+    return next((i for i, cell in enumerate(header) if re.search(pattern, cell, re.I)), None)
+
+
+def _profiles_from_tables(page: ParsedPage) -> List[Dict[str, Any]]:
+    profiles = []
+    for table in page.tables:
+        header, rows = table[0], table[1:]
+        name_col = _column(header, r"name|facility|site|data ?cent|campus")
+        location_col = _column(header, r"location|city|address|metro|market|country")
+        mw_col = _column(header, r"\bmw\b|capacity|power|it load")
+        status_col = _column(header, r"status|operational|stage")
+        if name_col is None or location_col is None:
+            continue
+        for row in rows:
+            if len(row) <= max(name_col, location_col):
+                continue
+            mw_text = row[mw_col] if mw_col is not None and mw_col < len(row) else " ".join(row)
+            mw = _parse_mw(mw_text)
+            if mw is None and mw_col is not None and re.fullmatch(r"\d+(?:[.,]\d+)?", mw_text.strip()):
+                mw = int(float(mw_text.strip().replace(",", ".")) + 0.5)
+            status_text = row[status_col] if status_col is not None and status_col < len(row) else " ".join(row)
+            if row[name_col] and row[location_col] and mw is not None:
+                profiles.append({"name": row[name_col], "location": row[location_col],
+                                 "operational_status": _parse_status(status_text), "mw": mw})
+    return profiles
+
+
+def _profiles_from_blocks(page: ParsedPage) -> List[Dict[str, Any]]:
+    """Profiles from list items or headings like ``FR5 - Frankfurt, Germany - 20 MW - Operational``."""
+    profiles = []
+    for block in page.blocks:
+        if block.tag not in ("li", "h2", "h3", "h4", "p") or len(block.text) > 200:
+            continue
+        mw = _parse_mw(block.text)
+        if mw is None:
+            continue
+        segments = [segment.strip(" ,:;") for segment in _separator_re.split(block.text) if segment.strip(" ,:;")]
+        rest = [segment for segment in segments[1:]
+                if not _mw_re.search(segment) and not _operational_re.search(segment)
+                and not _not_operational_re.search(segment)]
+        if len(segments) < 2 or not rest:
+            continue
+        profiles.append({"name": segments[0], "location": ", ".join(rest),
+                         "operational_status": _parse_status(block.text), "mw": mw})
+    return profiles
+
+
+def extract_data_centres(page: ParsedPage) -> Optional[Dict[str, Any]]:
+    """Fill DataCentersExtractSchema fields, or None if no complete data centre profile was found."""
+    profiles = _profiles_from_tables(page) or _profiles_from_blocks(page)
+    unique, seen = [], set()
+    for profile in profiles:
+        key = (profile["name"].lower(), profile["location"].lower())
+        if key not in seen:
+            seen.add(key)
+            unique.append(profile)
+    return {"data_centers": unique} if unique else None
+
+
+local_extractors: Dict[str, Callable[[ParsedPage], Optional[Dict[str, Any]]]] = {
+    "CompanyOverviewExtractSchema": extract_company_overview,
+    "DataCentersExtractSchema": extract_data_centres,
+}
+
+
+def extract_locally(html: str, schema, url: str = "") -> Optional[Dict[str, Any]]:
+    """Extract ``schema`` from ``html`` without Firecrawl.
+
+    Returns a Firecrawl-shaped response (``extract`` plus ``metadata``) or
+    None if there is no local extractor for the schema, required fields
+    are missing, or the result does not validate against the schema.
+    """
+    extractor = local_extractors.get(schema.__name__)
+    if extractor is None or not html:
+        return None
+    page = parse_html(html)
+    data = extractor(page)
+    if data is None:
+        return None
+    try:
+        data = schema.model_validate(data).model_dump()
+    except ValueError:
+        return None
+    return {"extract": data, "metadata": {"sourceURL": url, "title": page.title, "extractor": "local"}}
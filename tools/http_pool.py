@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from tools.cassette import get_cassette, http_payload
+
+logger = logging.getLogger(__name__)
+
+default_timeout = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+default_connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+default_per_host_limit = int(os.getenv("HTTP_PER_HOST_CONNECTIONS", "8"))
+
+T = TypeVar("T")
+
+
+def _response_record(response: httpx.Response) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    return response.status_code, list(response.headers.items()), response.content
+
+
+def _rebuild_response(method: str, url: str, record: Tuple[int, List[Tuple[str, str]], bytes]) -> httpx.Response:
+    status_code, headers, content = record
+    headers = [(k, v) for k, v in headers if k.lower() not in ("content-encoding", "transfer-encoding")]
+    return httpx.Response(status_code, headers=headers, content=content, request=httpx.Request(method, url))
+
+
+class PooledHttpClient:
+    """Keep-alive HTTP connection pool shared by every external tool call.
+
+    Wraps one ``httpx.Client`` for sync callers and one ``httpx.AsyncClient``
+    per event loop for asyncio callers. Both reuse TLS connections across
+    calls, share the same timeouts, and cap concurrent requests per host.
+    Sync code that wants to fan out coroutines should use ``run`` so they
+    execute on a long-lived background loop whose connections stay warm.
+    Requests are recorded or replayed when a tool cassette is active.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 per_host_limit: int = default_per_host_limit, timeout: float = default_timeout,
+                 connect_timeout: float = default_connect_timeout):
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive_connections)
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.per_host_limit = per_host_limit
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+            weakref.WeakKeyDictionary()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(limits=self.limits, timeout=self.timeout)
+        return self._client
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._host_semaphores.setdefault(host, threading.BoundedSemaphore(self.per_host_limit))
+        return semaphore
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        cassette = get_cassette()
+        if cassette.replaying:
+            recorded, delay = cassette.load(urlsplit(url).netloc, method, http_payload(url, kwargs))
+            time.sleep(delay)
+            return _rebuild_response(method, url, recorded)
+        started = time.perf_counter()
+        with self._host_semaphore(url):
+            response = self.client.request(method, url, **kwargs)
+        if cassette.recording:
+            cassette.save(urlsplit(url).netloc, method, http_payload(url, kwargs),
+                          _response_record(response), time.perf_counter() - started)
+        return response
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            self._async_clients[loop] = client
+        return client
+
+    def _async_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        semaphores = self._async_semaphores.setdefault(asyncio.get_running_loop(), {})
+        host = urlsplit(url).netloc
+        semaphore = semaphores.get(host)
+        if semaphore is None:
+            semaphore = semaphores.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        return semaphore
+
+    async def arequest(self, method: str, url: str, **kwargs) -> httpx.Response:
+        cassette = get_cassette()
+        if cassette.replaying:
+            recorded, delay = cassette.load(urlsplit(url).netloc, method, http_payload(url, kwargs))
+            await asyncio.sleep(delay)
+            return _rebuild_response(method, url, recorded)
+        started = time.perf_counter()
+        async with self._async_host_semaphore(url):
+            response = await self._async_client().request(method, url, **kwargs)
+        if cassette.recording:
+            cassette.save(urlsplit(url).netloc, method, http_payload(url, kwargs),
+                          _response_record(response), time.perf_counter() - started)
+        return response
+
+    def post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Any:
+        response = self.request("POST", url, json=payload, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def apost_json(self, url: str, payload: Dict[str, Any],
+                         headers: Optional[Dict[str, str]] = None) -> Any:
+        response = await self.arequest("POST", url, json=payload, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="http-pool-loop", daemon=True).start()
+                    self._loop = loop
+        return self._loop
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run ``coro`` on the background event loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self._background_loop()).result(timeout)
+
+    async def aclose(self):
+        """Close the async client bound to the running loop."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+_http_client: Optional[PooledHttpClient] = None
+_http_client_pid: Optional[int] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHttpClient:
+    """Return the process-wide pooled client, recreating it after a fork."""
+    global _http_client, _http_client_pid
+    if _http_client is None or _http_client_pid != os.getpid():
+        with _http_client_lock:
+            if _http_client is None or _http_client_pid != os.getpid():
+                _http_client = PooledHttpClient()
+                _http_client_pid = os.getpid()
+    return _http_client
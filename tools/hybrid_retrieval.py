@@ -0,0 +1,142 @@
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever as DocumentRetriever
+from llama_index.core.retrievers import BaseRetriever as NodeRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+from tools.bm25_index import BM25Index, reciprocal_rank_fusion
+from tools.embedding_store import MemmapEmbeddingStore
+
+
+def chunk_id(source: str, text: str) -> str:
+    """Stable id shared by a chunk's vector and BM25 entries."""
+    return hashlib.sha1(f"{source}\x00{text}".encode("utf-8")).hexdigest()[:20]
+
+
+def plain_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only JSON scalar metadata values so they can be persisted with the BM25 index."""
+    return {key: value for key, value in (metadata or {}).items()
+            if isinstance(value, (str, int, float, bool))}
+
+
+def build_bm25_from_nodes(bm25: BM25Index, nodes) -> BM25Index:
+    """Add llama-index nodes to ``bm25`` keyed by node id."""
+    bm25.add_many((node.node_id, node.get_content(), plain_metadata(node.metadata)) for node in nodes)
+    return bm25
+
+
+def embed_nodes_into_store(store: MemmapEmbeddingStore, embed_model, nodes) -> int:
+    """Embed and append llama-index nodes that are not yet in ``store``."""
+    missing = [node for node in nodes if node.node_id not in store]
+    if not missing:
+        return 0
+    vectors = embed_model.get_text_embedding_batch([node.get_content() for node in missing])
+    return store.add([node.node_id for node in missing], vectors)
+
+
+class MemmapNodeRetriever(NodeRetriever):
+    """llama-index dense retriever over a MemmapEmbeddingStore, resolving nodes from a docstore."""
+
+    def __init__(self, store: MemmapEmbeddingStore, embed_model, docstore, similarity_top_k: int = 5):
+        super().__init__()
+        self.store = store
+        self.embed_model = embed_model
+        self.docstore = docstore
+        self.similarity_top_k = similarity_top_k
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        embedding = query_bundle.embedding or self.embed_model.get_query_embedding(query_bundle.query_str)
+        results = []
+        for doc_id, score in self.store.search(embedding, k=self.similarity_top_k):
+            node = self.docstore.get_node(doc_id, raise_error=False)
+            if node is not None:
+                results.append(NodeWithScore(node=node, score=score))
+        return results
+
+
+class MemmapDocumentSearch:
+    """langchain-style ``similarity_search`` over a MemmapEmbeddingStore.
+
+    Chunk text and metadata are read back from the BM25 index, which already
+    stores them keyed by chunk id.
+    """
+
+    def __init__(self, embeddings, store: MemmapEmbeddingStore, docstore: BM25Index):
+        self.embeddings = embeddings
+        self.store = store
+        self.docstore = docstore
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        docs = []
+        for doc_id, _ in self.store.search(self.embeddings.embed_query(query), k=k):
+            entry = self.docstore.get(doc_id)
+            if entry is not None:
+                docs.append(Document(page_content=entry['text'], metadata={**entry['metadata'], 'chunk_id': doc_id}))
+        return docs
+
+
+class HybridNodeRetriever(NodeRetriever):
+    """llama-index retriever fusing a dense retriever with a BM25 side index (RRF).
+
+    ``extra_retrievers`` are fused as additional rankings, e.g. a knowledge
+    graph retriever alongside chunk-level dense retrieval.
+    """
+
+    def __init__(self, vector_retriever: NodeRetriever, bm25: BM25Index,
+                 similarity_top_k: int = 5, fetch_k: int = 20, rrf_k: int = 60,
+                 extra_retrievers: Optional[Sequence[NodeRetriever]] = None):
+        super().__init__()
+        self.vector_retriever = vector_retriever
+        self.extra_retrievers = list(extra_retrievers or [])
+        self.bm25 = bm25
+        self.similarity_top_k = similarity_top_k
+        self.fetch_k = fetch_k
+        self.rrf_k = rrf_k
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        dense = self.vector_retriever.retrieve(query_bundle)
+        extra = [retriever.retrieve(query_bundle) for retriever in self.extra_retrievers]
+        nodes = {hit.node.node_id: hit.node for hits in [dense] + extra for hit in hits}
+        sparse = self.bm25.search(query_bundle.query_str, k=self.fetch_k)
+        for doc_id, _ in sparse:
+            if doc_id not in nodes:
+                doc = self.bm25.get(doc_id)
+                nodes[doc_id] = TextNode(id_=doc_id, text=doc['text'], metadata=doc['metadata'])
+        rankings = [[hit.node.node_id for hit in hits] for hits in [dense] + extra]
+        rankings.append([doc_id for doc_id, _ in sparse])
+        fused = reciprocal_rank_fusion(rankings, k=self.rrf_k, limit=self.similarity_top_k)
+        return [NodeWithScore(node=nodes[doc_id], score=score) for doc_id, score in fused]
+
+
+class HybridDocumentRetriever(DocumentRetriever):
+    """langchain retriever fusing vector store hits with a BM25 side index (RRF).
+
+    Vector store documents are matched to BM25 entries by their ``chunk_id`` metadata.
+    """
+
+    vectorstore: Any
+    bm25: Any
+    k: int = 5
+    fetch_k: int = 20
+    rrf_k: int = 60
+
+    def _get_relevant_documents(self, query: str, *,
+                                run_manager: CallbackManagerForRetrieverRun) -> List[Document]:  # noqa: ARG002 - BaseRetriever signature
+        dense = self.vectorstore.similarity_search(query, k=self.fetch_k)
+        docs: Dict[str, Document] = {}
+        dense_ids = []
+        for doc in dense:
+            doc_id = doc.metadata.get('chunk_id') or chunk_id(doc.metadata.get('source', ''), doc.page_content)
+            docs.setdefault(doc_id, doc)
+            dense_ids.append(doc_id)
+        sparse = self.bm25.search(query, k=self.fetch_k)
+        for doc_id, _ in sparse:
+            if doc_id not in docs:
+                entry = self.bm25.get(doc_id)
+                docs[doc_id] = Document(page_content=entry['text'], metadata=entry['metadata'])
+        fused = reciprocal_rank_fusion([dense_ids, [doc_id for doc_id, _ in sparse]],
+                                       k=self.rrf_k, limit=self.k)
+        return [docs[doc_id] for doc_id, _ in fused]
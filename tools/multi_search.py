@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import chromadb
+from crewai.tools import tool
+
+from db_utils import (
+    get_next_id,
+    get_result_by_id,
+    get_vector_db_file,
+    similarity_threshold,
+    store_result,
+)
+from tools.http_pool import get_http_client
+from tools.search_providers import (
+    aexa_search_and_contents,
+    aserper_search,
+    atavily_search,
+)
+from tools.search_results import (
+    from_exa,
+    from_serper,
+    from_tavily,
+    merge_results,
+    normalize_results,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/search_tools.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+default_timeout = 8.0
+
+
+async def _google(q: str) -> List[Dict[str, Any]]:
+    return from_serper(await aserper_search(q, "search"))
+
+
+async def _news(q: str) -> List[Dict[str, Any]]:
+    return from_serper(await aserper_search(q, "news"), key="news")
+
+
+async def _tavily(q: str) -> List[Dict[str, Any]]:
+    return from_tavily(await atavily_search(q))
+
+
+async def _exa(q: str) -> List[Dict[str, Any]]:
+    return from_exa(await aexa_search_and_contents(q))
+
+
+providers: Dict[str, Callable[[str], Awaitable[List[Dict[str, Any]]]]] = {
+    "google": _google,
+    "news": _news,
+    "tavily": _tavily,
+    "exa": _exa,
+}
+
+
+async def run_multi_search(q: str, selected: Optional[Sequence[str]] = None, timeout: float = default_timeout,
+                           first_k: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """Query the selected providers concurrently and return their normalised, merged results.
+
+    Returns when every provider has answered, when ``timeout`` seconds have
+    passed, or as soon as ``first_k`` unique results are in, whichever comes
+    first. Providers that fail or miss the deadline are logged and skipped.
+    The results are capped at ``max_results``, not ``first_k``; the flag
+    says whether every provider answered, i.e. whether they may be cached.
+    """
+    names = [name for name in (selected or providers) if name in providers]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    pending = {asyncio.ensure_future(providers[name](q)): name for name in names}
+    collected: List[Dict[str, Any]] = []
+    merged: List[Dict[str, Any]] = []
+    complete = True
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.warning(f"Multi search deadline reached, skipping {sorted(pending.values())}")
+                break
+            done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = pending.pop(task)
+                try:
+                    collected.extend(task.result())
+                except Exception as e:
+                    complete = False
+                    logger.warning(f"Multi search provider {name} failed: {e}")
+            merged = merge_results(collected)
+            if first_k and len(merged) >= first_k:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+    return normalize_results(merged), complete and not pending
+
+
+async def multi_search(q: str, selected: Optional[Sequence[str]] = None, timeout: float = default_timeout,
+                       first_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Like ``run_multi_search``, returning at most ``first_k`` results."""
+    results, _ = await run_multi_search(q, selected, timeout, first_k)
+    return results[:first_k] if first_k else results
+
+
+def cache_tag(selected: Optional[Sequence[str]] = None) -> str:
+    return f"MultiSearch[{','.join(sorted(selected or providers))}]"
+
+
+class MultiSearchTool:
+
+    @tool("Multi Search")
+    def multi_search_tool(question: str) -> list:
+        """Search Google, Google News, Tavily and Exa at the same time for a question and return
+        one merged list of results (title, url, snippet, providers) with duplicate pages removed.
+        The input can be a plain question or JSON with "question" and optionally "providers"
+        (any of google, news, tavily, exa) and "max_results"."""
+        selected, first_k = None, None
+        try:
+            data = json.loads(question)
+            q = data.get('question', question)
+            selected = data.get('providers')
+            first_k = data.get('max_results')
+        except (ValueError, AttributeError):
+            q = question
+
+        tag = cache_tag(selected)
+        cache_query = f'{tag}:{q}'
+        chroma_client = chromadb.PersistentClient(path=get_vector_db_file())
+        collection = chroma_client.get_or_create_collection(name="cached_docs")
+        cached_result = collection.query(
+            query_texts=[cache_query],
+            n_results=1
+        )
+        if cached_result['distances'][0] and cached_result['distances'][0][0] < similarity_threshold():
+            doc_id = cached_result['ids'][0][0]
+            logger.info(f'Cache hit for multi search {doc_id}')
+            results = json.loads(get_result_by_id(doc_id))
+        else:
+            results, complete = get_http_client().run(run_multi_search(q, selected, first_k=first_k))
+            # A run cut short by the deadline, a failed provider or max_results is missing results.
+            if results and complete:
+                id = get_next_id()
+                collection.upsert(
+                    documents=[cache_query],
+                    ids=[f'id{id}'],
+                )
+                store_result(id, q, json.dumps(results))
+
+        return results[:first_k] if first_k else results
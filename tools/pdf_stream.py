@@ -0,0 +1,74 @@
+import logging
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, Optional, Tuple
+
+from llama_index.core import Document
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+# Readers cached per worker process so each PDF is opened once per worker.
+_readers: "OrderedDict[str, PdfReader]" = OrderedDict()
+_max_cached_readers = 4
+
+
+def _reader(path: str) -> PdfReader:
+    reader = _readers.get(path)
+    if reader is None:
+        reader = PdfReader(path)
+        _readers[path] = reader
+        if len(_readers) > _max_cached_readers:
+            _readers.popitem(last=False)
+    else:
+        _readers.move_to_end(path)
+    return reader
+
+
+def page_count(path: str) -> int:
+    return len(PdfReader(path).pages)
+
+
+def extract_page(path: str, page_no: int) -> Tuple[str, int, str]:
+    """Extract the text of one page. Runs in a worker process."""
+    return path, page_no, _reader(path).pages[page_no].extract_text() or ""
+
+
+def _page_document(path: str, page_no: int, text: str) -> Document:
+    return Document(text=text, metadata={
+        'file_path': path,
+        'file_name': os.path.basename(path),
+        'page_label': str(page_no + 1),
+    })
+
+
+def stream_pdf_pages(paths: List[str], max_workers: Optional[int] = None,
+                     window: Optional[int] = None) -> Iterator[Document]:
+    """Yield one Document per PDF page as soon as its text is extracted.
+
+    Pages are extracted across a process pool. At most ``window`` pages are
+    in flight or waiting to be consumed, so memory stays bounded however
+    large the PDFs are, and callers can index early pages while later ones
+    are still being parsed. Pages are yielded in completion order. Workers
+    are started by a forkserver rather than forked, as the caller is a
+    threaded web worker holding locks and open SQLite connections.
+    """
+    max_workers = max_workers or min(os.cpu_count() or 1, 8)
+    window = window or max_workers * 2
+    pages = ((path, page_no) for path in paths for page_no in range(page_count(path)))
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=multiprocessing.get_context('forkserver')) as pool:
+        pending = set()
+        for path, page_no in pages:
+            pending.add(pool.submit(extract_page, path, page_no))
+            if len(pending) < window:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _page_document(*future.result())
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _page_document(*future.result())
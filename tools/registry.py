@@ -0,0 +1,81 @@
+import importlib
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, NamedTuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/tool_registry.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+
+class ToolSpec(NamedTuple):
+    """Where a tool lives, as ``module:attribute.path``, and a one-line summary for the config pages."""
+    path: str
+    description: str = ""
+
+
+class LazyToolRegistry(Mapping):
+    """Tool name -> tool object, importing each tool's module the first time the tool is used.
+
+    Listing names, checking membership and reading descriptions never
+    import anything, so a worker that only renders config pages never
+    loads the search, scraping and RAG stacks. A tool whose module fails
+    to import, for any reason (tool modules open log files and create
+    clients at import), is logged and reported as missing (``KeyError``),
+    so ``get`` returns None for it.
+    """
+
+    def __init__(self, specs: Dict[str, ToolSpec]):
+        self._specs = dict(specs)
+        self._loaded: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._loaded:
+            return self._loaded[name]
+        spec = self._specs[name]
+        with self._lock:
+            if name not in self._loaded:
+                module_path, attribute = spec.path.split(':')
+                started = time.perf_counter()
+                try:
+                    value: Any = importlib.import_module(module_path)
+                    for part in attribute.split('.'):
+                        value = getattr(value, part)
+                except Exception as e:
+                    logger.exception(f"Could not load tool {name} from {spec.path}: {e}")
+                    raise KeyError(name) from e
+                logger.info(f"Loaded tool {name} from {spec.path} in {time.perf_counter() - started:.3f}s")
+                self._loaded[name] = value
+        return self._loaded[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def spec(self, name: str) -> ToolSpec:
+        return self._specs[name]
+
+    def descriptions(self) -> Dict[str, str]:
+        return {name: spec.description for name, spec in self._specs.items()}
+
+    def loaded(self) -> List[str]:
+        """Names of the tools imported so far."""
+        return list(self._loaded)
+
+    def preload(self, names=None) -> List[str]:
+        """Import ``names`` (default: every tool) now, returning those that failed."""
+        failed = []
+        for name in names if names is not None else list(self._specs):
+            if self.get(name) is None:
+                failed.append(name)
+        return failed
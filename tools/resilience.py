@@ -0,0 +1,288 @@
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import random
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from db_utils import db_path
+from tools.cassette import get_cassette
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/resilience.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+resilience_db_file = os.path.join(db_path, "resilience.sqlite3")
+
+# provider: (tokens per second, bucket capacity)
+provider_rate_limits: Dict[str, Tuple[float, float]] = {
+    "serper": (5.0, 10.0),
+    "tavily": (2.0, 5.0),
+    "exa": (2.0, 5.0),
+    "firecrawl": (1.0, 3.0),
+}
+default_rate_limit = (2.0, 5.0)
+
+retry_attempts = 3
+retry_base_delay = 0.5
+retry_max_delay = 8.0
+breaker_failure_threshold = 5
+breaker_reset_seconds = 30.0
+acquire_timeout = 30.0
+
+
+class ProviderUnavailableError(Exception):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+
+class RateLimitTimeoutError(Exception):
+    """Raised when no rate limit token becomes available before the timeout."""
+
+
+def _connect(db_file: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_file, timeout=10, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    return conn
+
+
+def set_up_resilience_db(db_file: str = resilience_db_file):
+    conn = None
+    try:
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        conn = _connect(db_file)
+        conn.executescript('''
+        CREATE TABLE IF NOT EXISTS rate_buckets (
+            provider TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS circuit_breakers (
+            provider TEXT PRIMARY KEY,
+            failures INTEGER NOT NULL DEFAULT 0,
+            opened_at REAL
+        );
+        ''')
+    except sqlite3.Error as e:
+        logger.error(f"Database error during resilience setup: {e}")
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+
+class TokenBucket:
+    """Token bucket rate limiter whose state lives in SQLite.
+
+    Every gunicorn worker reads and refills the same row inside an
+    ``IMMEDIATE`` transaction, so the configured rate holds for the whole
+    host rather than per process.
+    """
+
+    def __init__(self, provider: str, rate: float, capacity: float, db_file: str = resilience_db_file):
+        self.provider = provider
+        self.rate = rate
+        self.capacity = capacity
+        self.db_file = db_file
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` if available. Returns 0 on success, otherwise the seconds to wait."""
+        conn = _connect(self.db_file)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            now = time.time()
+            row = conn.execute('SELECT tokens, updated FROM rate_buckets WHERE provider=?',
+                               (self.provider,)).fetchone()
+            available = self.capacity if row is None else min(self.capacity, row[0] + (now - row[1]) * self.rate)
+            wait = 0.0
+            if available >= tokens:
+                available -= tokens
+            else:
+                wait = (tokens - available) / self.rate
+            conn.execute('INSERT OR REPLACE INTO rate_buckets (provider, tokens, updated) VALUES (?, ?, ?)',
+                         (self.provider, available, now))
+            conn.execute('COMMIT')
+            return wait
+        except sqlite3.Error as e:
+            logger.error(f"Rate limiter error for {self.provider}, allowing call: {e}")
+            return 0.0
+        finally:
+            conn.close()
+
+    def acquire(self, tokens: float = 1.0, timeout: float = acquire_timeout):
+        deadline = time.monotonic() + timeout
+        while (wait := self.try_acquire(tokens)) > 0:
+            if time.monotonic() + wait > deadline:
+                raise RateLimitTimeoutError(f"Rate limit for {self.provider} not available within {timeout}s")
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: float = 1.0, timeout: float = acquire_timeout):
+        # try_acquire can block on the SQLite lock, keep it off the event loop.
+        deadline = time.monotonic() + timeout
+        while (wait := await asyncio.to_thread(self.try_acquire, tokens)) > 0:
+            if time.monotonic() + wait > deadline:
+                raise RateLimitTimeoutError(f"Rate limit for {self.provider} not available within {timeout}s")
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """Shared circuit breaker that stops calls to a provider after repeated failures.
+
+    After ``failure_threshold`` consecutive failed calls the circuit opens
+    and calls fail immediately for ``reset_seconds``. After that calls are
+    let through again as probes; a success closes the circuit and a failure
+    opens it for another ``reset_seconds``.
+    """
+
+    def __init__(self, provider: str, failure_threshold: int = breaker_failure_threshold,
+                 reset_seconds: float = breaker_reset_seconds, db_file: str = resilience_db_file):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.db_file = db_file
+
+    def _execute(self, query: str, params: tuple = ()):
+        conn = _connect(self.db_file)
+        try:
+            return conn.execute(query, params).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Circuit breaker error for {self.provider}: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def allow(self) -> bool:
+        row = self._execute('SELECT opened_at FROM circuit_breakers WHERE provider=?', (self.provider,))
+        return not row or row[0] is None or time.time() - row[0] >= self.reset_seconds
+
+    def record_success(self):
+        self._execute('INSERT OR REPLACE INTO circuit_breakers (provider, failures, opened_at) VALUES (?, 0, NULL)',
+                      (self.provider,))
+
+    def record_failure(self):
+        row = self._execute('''
+            INSERT INTO circuit_breakers (provider, failures, opened_at) VALUES (?, 1, NULL)
+            ON CONFLICT(provider) DO UPDATE SET failures = failures + 1
+            RETURNING failures
+        ''', (self.provider,))
+        if row and row[0] >= self.failure_threshold:
+            self._execute('UPDATE circuit_breakers SET opened_at=? WHERE provider=?', (time.time(), self.provider))
+            logger.warning(f"Circuit opened for {self.provider} after {row[0]} consecutive failures")
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    response = getattr(exc, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Retry rate limiting, server errors, timeouts and connection failures."""
+    status = _status_code(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    name = type(exc).__name__
+    return isinstance(exc, (ConnectionError, TimeoutError)) or name.endswith(
+        ('TimeoutException', 'ConnectError', 'ReadError', 'WriteError', 'RemoteProtocolError',
+         'NetworkError', 'Timeout', 'ConnectionError'))
+
+
+def retry_delay(attempt: int, exc: Optional[BaseException] = None) -> float:
+    """Full-jitter exponential backoff, honouring a Retry-After header when present."""
+    response = getattr(exc, 'response', None)
+    retry_after = getattr(response, 'headers', {}).get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), retry_max_delay)
+        except ValueError:
+            pass
+    return random.uniform(0, min(retry_max_delay, retry_base_delay * (2 ** attempt)))
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def _guards(provider: str) -> Tuple[TokenBucket, CircuitBreaker]:
+    if provider not in _buckets:
+        set_up_resilience_db()
+        rate, capacity = provider_rate_limits.get(provider, default_rate_limit)
+        _buckets[provider] = TokenBucket(provider, rate, capacity)
+        _breakers[provider] = CircuitBreaker(provider)
+    return _buckets[provider], _breakers[provider]
+
+
+def call_with_resilience(provider: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Call ``fn`` under the provider's rate limit, retry policy and circuit breaker.
+
+    While a cassette is replaying no provider is contacted, so ``fn`` is
+    called directly and replay timings don't depend on live limiter or
+    breaker state.
+    """
+    if get_cassette().replaying:
+        return fn(*args, **kwargs)
+    bucket, breaker = _guards(provider)
+    if not breaker.allow():
+        raise ProviderUnavailableError(f"{provider} is unavailable, circuit open")
+    for attempt in range(retry_attempts):
+        bucket.acquire()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if attempt + 1 < retry_attempts and is_retryable(e):
+                delay = retry_delay(attempt, e)
+                logger.warning(f"{provider} call failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            if is_retryable(e):
+                breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
+
+
+async def acall_with_resilience(provider: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Async counterpart of ``call_with_resilience`` for coroutine functions.
+
+    The rate limiter and breaker state live in SQLite, so every access to
+    them runs in a worker thread rather than on the event loop.
+    """
+    if get_cassette().replaying:
+        return await fn(*args, **kwargs)
+    bucket, breaker = await asyncio.to_thread(_guards, provider)
+    if not await asyncio.to_thread(breaker.allow):
+        raise ProviderUnavailableError(f"{provider} is unavailable, circuit open")
+    for attempt in range(retry_attempts):
+        await bucket.aacquire()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt + 1 < retry_attempts and is_retryable(e):
+                delay = retry_delay(attempt, e)
+                logger.warning(f"{provider} call failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            if is_retryable(e):
+                await asyncio.to_thread(breaker.record_failure)
+            raise
+        await asyncio.to_thread(breaker.record_success)
+        return result
+
+
+def resilient(provider: str):
+    """Decorate a sync or async provider call with ``call_with_resilience``."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                return await acall_with_resilience(provider, fn, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return call_with_resilience(provider, fn, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+from db_utils import db_path
+from tools.http_pool import get_http_client
+from tools.search_results import canonical_url
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/scraper_tools.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
+
+scrape_db_file = os.path.join(db_path, "scrape_cache.sqlite3")
+# Entries validated more recently than this are served without contacting the site.
+fresh_seconds = float(os.getenv("SCRAPE_CACHE_FRESH_SECONDS", "3600"))
+
+_script_re = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>", re.S | re.I)
+_tag_re = re.compile(r"<[^>]+>")
+_space_re = re.compile(r"\s+")
+
+
+def schema_hash(schema: Type[BaseModel]) -> str:
+    return hashlib.sha256(json.dumps(schema.model_json_schema(), sort_keys=True).encode()).hexdigest()[:16]
+
+
+def content_hash(body: str) -> str:
+    """Hash of the visible page text, so rotating nonces in scripts and markup don't count as changes."""
+    text = _space_re.sub(" ", _tag_re.sub(" ", _script_re.sub(" ", body))).strip()
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ScrapeCache:
+    """Structured extractions keyed by canonical URL and extraction schema.
+
+    Each entry keeps the page's ETag/Last-Modified validators and a hash of
+    its text. Stale entries are revalidated with a conditional GET, and the
+    paid extraction only runs again when the page text actually changed.
+    """
+
+    def __init__(self, db_file: str = scrape_db_file):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        conn = sqlite3.connect(db_file)
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS scrape_cache (
+                url TEXT NOT NULL,
+                schema_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                extraction TEXT NOT NULL,
+                extracted_at REAL NOT NULL,
+                validated_at REAL NOT NULL,
+                PRIMARY KEY (url, schema_hash)
+            )
+            ''')
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Database error during scrape cache setup: {e}")
+            raise
+        finally:
+            conn.close()
+
+    def get(self, url: str, schema_key: str) -> Optional[Dict[str, Any]]:
+        conn = sqlite3.connect(self.db_file)
+        try:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM scrape_cache WHERE url=? AND schema_hash=?',
+                               (url, schema_key)).fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Database error reading scrape cache: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def put(self, url: str, schema_key: str, extraction: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, page_hash: Optional[str] = None):
+        now = time.time()
+        conn = sqlite3.connect(self.db_file)
+        try:
+            conn.execute('INSERT OR REPLACE INTO scrape_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                         (url, schema_key, etag, last_modified, page_hash, json.dumps(extraction), now, now))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Database error writing scrape cache: {e}")
+        finally:
+            conn.close()
+
+    def touch(self, url: str, schema_key: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Mark an entry as revalidated, keeping existing validators the response didn't resend."""
+        conn = sqlite3.connect(self.db_file)
+        try:
+            conn.execute('''
+                UPDATE scrape_cache SET validated_at=?, etag=COALESCE(?, etag),
+                    last_modified=COALESCE(?, last_modified)
+                WHERE url=? AND schema_hash=?
+            ''', (time.time(), etag, last_modified, url, schema_key))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Database error updating scrape cache: {e}")
+        finally:
+            conn.close()
+
+
+def fetch_page(url: str, entry: Optional[Dict[str, Any]] = None):
+    """GET ``url``, conditionally when ``entry`` has validators. Returns the response or None on failure."""
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    try:
+        return get_http_client().request("GET", url, headers=headers, follow_redirects=True)
+    except Exception as e:
+        logger.warning(f"Could not fetch {url} for revalidation: {e}")
+        return None
+
+
+_scrape_cache: Optional[ScrapeCache] = None
+
+
+def get_scrape_cache() -> ScrapeCache:
+    global _scrape_cache
+    if _scrape_cache is None:
+        _scrape_cache = ScrapeCache()
+    return _scrape_cache
+
+
+def fresh_extraction(url: str, schema: Type[BaseModel], cache: Optional[ScrapeCache] = None) -> Optional[Any]:
+    """The stored extraction of ``url`` for ``schema`` if it is fresh enough to serve without a request."""
+    cache = cache or get_scrape_cache()
+    key = canonical_url(url) or url
+    entry = cache.get(key, schema_hash(schema))
+    if entry and time.time() - entry['validated_at'] < fresh_seconds:
+        logger.info(f"Scrape cache hit for {key}")
+        return json.loads(entry['extraction'])
+    return None
+
+
+def cached_extract(url: str, schema: Type[BaseModel], extract: Callable[..., Any],
+                   cache: Optional[ScrapeCache] = None) -> Any:
+    """Return the extraction of ``url`` for ``schema``, calling ``extract`` only when the page changed.
+
+    Fresh entries are returned directly. Older ones are revalidated: a 304,
+    or a 200 whose text hashes to the stored value, reuses the stored
+    extraction. If the site cannot be reached the stored extraction is
+    served stale rather than paying for a new one. ``extract`` is called
+    as ``extract(url, schema, html)`` with the page body fetched here, or
+    None if the page could not be fetched.
+    """
+    cache = cache or get_scrape_cache()
+    key = canonical_url(url) or url
+    schema_key = schema_hash(schema)
+    entry = cache.get(key, schema_key)
+    if entry and time.time() - entry['validated_at'] < fresh_seconds:
+        logger.info(f"Scrape cache hit for {key}")
+        return json.loads(entry['extraction'])
+
+    response = fetch_page(url, entry)
+    etag = response.headers.get('ETag') if response is not None else None
+    last_modified = response.headers.get('Last-Modified') if response is not None else None
+    page_hash = None
+    html = response.text if response is not None and response.status_code < 400 else None
+    if entry:
+        if response is None or response.status_code >= 400:
+            logger.info(f"Serving stale extraction for {key}, revalidation failed")
+            return json.loads(entry['extraction'])
+        if response.status_code == 304:
+            logger.info(f"Scrape cache revalidated {key} (304)")
+            cache.touch(key, schema_key, etag, last_modified)
+            return json.loads(entry['extraction'])
+        page_hash = content_hash(html)
+        if page_hash == entry['content_hash']:
+            logger.info(f"Scrape cache revalidated {key} (content unchanged)")
+            cache.touch(key, schema_key, etag, last_modified)
+            return json.loads(entry['extraction'])
+    elif html is not None:
+        page_hash = content_hash(html)
+
+    logger.info(f"Extracting {key} with schema {schema.__name__}")
+    extraction = extract(url, schema, html)
+    cache.put(key, schema_key, extraction, etag, last_modified, page_hash)
+    return extraction
@@ -1,11 +1,21 @@
 from crewai.tools import tool
-from firecrawl import FirecrawlApp
-from firecrawl import FirecrawlApp
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
+import logging
 import os
-from db_utils import get_vector_db_file, get_next_id, store_result, get_result_by_id,similarity_threshold
+from tools.cassette import get_cassette
+from tools.dc_fact_store import record_scrape
+from tools.html_extract import extract_locally
+from tools.resilience import call_with_resilience
+from tools.batch_scrape import batch_extract, parse_urls
+from tools.scrape_cache import cached_extract
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+handler = logging.FileHandler('logs/scraper_tools.log')
+handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logger.addHandler(handler)
 
 
 class CompanyOverviewExtractSchema(BaseModel):
@@ -26,75 +36,64 @@ class DataCentersExtractSchema(BaseModel):
 
 
 
-# Initialize the FirecrawlApp with your API key
-firecrawl_api_key = os.getenv("FIRECRAWL_API_KEY")
-app = FirecrawlApp(api_key=firecrawl_api_key)
+_firecrawl_app = None
+
+
+def get_firecrawl_app():
+    """The Firecrawl client, created on first extraction so importing the tools stays cheap."""
+    global _firecrawl_app
+    if _firecrawl_app is None:
+        from firecrawl import FirecrawlApp
+        _firecrawl_app = FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY"))
+    return _firecrawl_app
+
+
+def scrape_extract(url: str, schema) -> dict:
+    """Run a Firecrawl structured extraction of ``url`` against a pydantic ``schema``."""
+    result = call_with_resilience("firecrawl", get_cassette().call, "firecrawl", get_firecrawl_app().scrape_url, url, {
+        'formats': ['extract'],
+        'extract': {
+            'schema': schema.model_json_schema(),
+        }
+    })
+    return result.model_dump() if hasattr(result, 'model_dump') else result
+
+
+def local_or_scrape_extract(url: str, schema, html: Optional[str] = None) -> dict:
+    """Extract from the fetched HTML locally, paying for Firecrawl only when required fields are missing."""
+    extraction = extract_locally(html, schema, url) if html else None
+    if extraction is not None:
+        logger.info(f"Extracted {url} locally")
+        return extraction
+    return scrape_extract(url, schema)
+
 
 class WebScrappingTools:
 
     @tool("Extract Company Overview and its products, services and locations")
-    def extract_company_overview(url: str) -> CompanyOverviewExtractSchema:
+    def extract_company_overview(url: str) -> dict:
         """Extracts company overview, products, services and locations from a given URL."""
-        tag="ScrapeCompany"
-        cache_query=f'{tag}:{url}'
-        chroma_client = chromadb.PersistentClient(path=get_vector_db_file())
-          # switch `create_collection` to `get_or_create_collection` to avoid creating a new collection every time
-        collection = chroma_client.get_or_create_collection(name="cached_docs")
-        cached_result = collection.query(
-            query_texts=[cache_query], # Chroma will embed this for you
-            n_results=1 # how many results to return
-        )
-        if cached_result['distances'][0] and cached_result['distances'][0][0]<similarity_threshold():
-            doc_id=results['ids'][0][0]
-            company_data=get_result_by_id(doc_id)
-        else: 
-            company_data = app.scrape_url(url, {
-                'formats': ['extract'],
-                'extract': {
-                    'schema': CompanyOverviewExtractSchema.model_json_schema(),
-                }
-            })
-
-            id = get_next_id()
-            collection.upsert(
-                documents=[cache_query],
-                ids=[f'id{id}'],
-              )
-            store_result(id,url,data)
-            
-        return company_data
+        return cached_extract(url, CompanyOverviewExtractSchema, local_or_scrape_extract)
 
-    @tool("Extract Company Overview and its products, services and locations")
-    def extract_data_centre_key_facts(url: str) -> CompanyOverviewExtractSchema:
+    @tool("Extract key facts about data centres")
+    def extract_data_centre_key_facts(url: str) -> dict:
         """Extracts key facts about data centres from a given URL."""
-
-        tag="ScrapeDataCentre"
-        cache_query=f'{tag}:{url}'
-        chroma_client = chromadb.PersistentClient(path=get_vector_db_file())
-          # switch `create_collection` to `get_or_create_collection` to avoid creating a new collection every time
-        collection = chroma_client.get_or_create_collection(name="cached_docs")
-        cached_result = collection.query(
-            query_texts=[cache_query], # Chroma will embed this for you
-            n_results=1 # how many results to return
-        )
-        if cached_result['distances'][0] and cached_result['distances'][0][0]<similarity_threshold():
-            doc_id=results['ids'][0][0]
-            data_centres=get_result_by_id(doc_id)
-        else: 
-
-            data_centres = app.scrape_url(url, {
-                'formats': ['extract'],
-                'extract': {
-                    'schema': DataCentersExtractSchema.model_json_schema(),
-                }
-            })
-
-
-            id = get_next_id()
-            collection.upsert(
-                documents=[cache_query],
-                ids=[f'id{id}'],
-              )
-            store_result(id,url,data_centres)
-
-        return data_centres
\ No newline at end of file
+        data_centres = cached_extract(url, DataCentersExtractSchema, local_or_scrape_extract)
+        record_scrape(url, data_centres)
+        return data_centres
+
+    @tool("Extract Company Overview from several URLs")
+    def batch_extract_company_overview(urls: str) -> dict:
+        """Extracts company overview, products, services and locations from several URLs at once.
+        The input is a JSON list of URLs. Returns the extractions keyed by URL; URLs not finished
+        before the deadline are marked and can be asked for again later."""
+        return batch_extract(parse_urls(urls), CompanyOverviewExtractSchema, local_or_scrape_extract)
+
+    @tool("Extract key facts about data centres from several URLs")
+    def batch_extract_data_centre_key_facts(urls: str) -> dict:
+        """Extracts key facts about data centres from several URLs at once. The input is a JSON
+        list of URLs. Returns the extractions keyed by URL."""
+        results = batch_extract(parse_urls(urls), DataCentersExtractSchema, local_or_scrape_extract)
+        for url, data_centres in results.items():
+            record_scrape(url, data_centres)
+        return results
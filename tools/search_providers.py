@@ -0,0 +1,95 @@
+"""Search provider API calls made over the shared pooled HTTP client.
+
+Base URLs can be pointed at a local mock server with SERPER_BASE_URL,
+TAVILY_BASE_URL and EXA_BASE_URL. Every call goes through the provider's
+shared rate limiter, retry policy and circuit breaker.
+"""
+import os
+from typing import Any, Dict, List
+
+from tools.http_pool import get_http_client
+from tools.resilience import resilient
+
+
+def serper_base_url() -> str:
+    return os.getenv("SERPER_BASE_URL", "https://google.serper.dev")
+
+
+def tavily_base_url() -> str:
+    return os.getenv("TAVILY_BASE_URL", "https://api.tavily.com")
+
+
+def exa_base_url() -> str:
+    return os.getenv("EXA_BASE_URL", "https://api.exa.ai")
+
+
+def _serper_request(q: str, endpoint: str, num: int):
+    headers = {
+        'X-API-KEY': os.getenv("SERPER_API_KEY") or "",
+        'Content-Type': 'application/json'
+    }
+    return f"{serper_base_url()}/{endpoint}", {"q": q, "num": num}, headers
+
+
+@resilient("serper")
+def serper_search(q: str, endpoint: str = "search", num: int = 10) -> Dict[str, Any]:
+    """Query Serper's ``search`` or ``news`` endpoint and return the decoded response."""
+    return get_http_client().post_json(*_serper_request(q, endpoint, num))
+
+
+@resilient("serper")
+async def aserper_search(q: str, endpoint: str = "search", num: int = 10) -> Dict[str, Any]:
+    return await get_http_client().apost_json(*_serper_request(q, endpoint, num))
+
+
+def _tavily_request(query: str, max_results: int):
+    api_key = os.getenv("TAVILY_API_KEY") or ""
+    payload = {
+        "api_key": api_key,
+        "query": query,
+        "search_depth": "advanced",
+        "include_answer": True,
+        "max_results": max_results,
+    }
+    return f"{tavily_base_url()}/search", payload, {'Authorization': f"Bearer {api_key}"}
+
+
+@resilient("tavily")
+def tavily_search(query: str, max_results: int = 10) -> Dict[str, Any]:
+    """Tavily search including the generated answer, as used by ``TavilyClient.qna_search``."""
+    return get_http_client().post_json(*_tavily_request(query, max_results))
+
+
+@resilient("tavily")
+async def atavily_search(query: str, max_results: int = 10) -> Dict[str, Any]:
+    return await get_http_client().apost_json(*_tavily_request(query, max_results))
+
+
+def tavily_qna_search(query: str, max_results: int = 10) -> str:
+    return tavily_search(query, max_results).get("answer") or ""
+
+
+async def atavily_qna_search(query: str, max_results: int = 10) -> str:
+    return (await atavily_search(query, max_results)).get("answer") or ""
+
+
+def _exa_request(query: str, num_results: int):
+    payload = {
+        "query": query,
+        "type": "neural",
+        "useAutoprompt": True,
+        "numResults": num_results,
+        "contents": {"highlights": True},
+    }
+    return f"{exa_base_url()}/search", payload, {'x-api-key': os.getenv("EXA_API_KEY") or ""}
+
+
+@resilient("exa")
+def exa_search_and_contents(query: str, num_results: int = 10) -> List[Dict[str, Any]]:
+    """Exa neural search with highlights; returns the list of result dicts."""
+    return get_http_client().post_json(*_exa_request(query, num_results)).get("results", [])
+
+
+@resilient("exa")
+async def aexa_search_and_contents(query: str, num_results: int = 10) -> List[Dict[str, Any]]:
+    return (await get_http_client().apost_json(*_exa_request(query, num_results))).get("results", [])
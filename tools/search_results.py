@@ -0,0 +1,179 @@
+"""Normalisation of search results returned by the different providers.
+
+Every search tool passes its results through ``normalize_results`` before
+caching them, so the agent sees each page once, without tracking
+parameters, and within a bounded number of characters.
+"""
+import re
+import zlib
+from typing import Any, Dict, FrozenSet, Iterable, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+tracking_params = {"gclid", "fbclid", "msclkid", "dclid", "yclid", "mc_cid", "mc_eid",
+                   "ref", "ref_src", "igshid", "_hsenc", "_hsmi", "cmpid", "ocid"}
+tracking_prefixes = ("utm_",)
+
+max_results = 10
+max_snippet_chars = 400
+max_total_chars = 6000
+near_duplicate_threshold = 0.7
+shingle_size = 4
+
+_word_re = re.compile(r"\w+")
+
+
+def _is_tracking(key: str) -> bool:
+    return key.lower() in tracking_params or key.lower().startswith(tracking_prefixes)
+
+
+def canonical_url(url: str) -> str:
+    """Reduce a URL to a canonical form so the same page from different providers compares equal.
+
+    Lower-cases the scheme and host, drops ``www.``, default ports, fragments,
+    tracking query parameters and trailing slashes, and sorts the remaining
+    query parameters. Only for comparing URLs: the result may name a scheme
+    or host the site doesn't serve. A URL that can't be parsed, e.g. with a
+    malformed port, is returned as given.
+    """
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    scheme = (parts.scheme or "https").lower()
+    if scheme == "http":
+        scheme = "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/")
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _is_tracking(key))
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def strip_tracking(url: str) -> str:
+    """``url`` as the provider returned it, minus tracking query parameters."""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    pairs = parse_qsl(parts.query, keep_blank_values=True)
+    query = [(key, value) for key, value in pairs if not _is_tracking(key)]
+    if len(query) == len(pairs):
+        return url
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+def search_result(provider: str, title: Any, url: Any, snippet: Any) -> Dict[str, Any]:
+    if isinstance(snippet, (list, tuple)):
+        snippet = " ".join(str(part) for part in snippet)
+    return {
+        "title": str(title or "").strip(),
+        "url": str(url or "").strip(),
+        "snippet": str(snippet or "").strip(),
+        "providers": [provider],
+    }
+
+
+def from_serper(response: Dict[str, Any], key: str = "organic") -> List[Dict[str, Any]]:
+    return [search_result("google" if key == "organic" else "news", item.get("title"), item.get("link"),
+                          item.get("snippet")) for item in response.get(key, [])]
+
+
+def from_tavily(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [search_result("tavily", item.get("title"), item.get("url"), item.get("content"))
+            for item in response.get("results", [])]
+
+
+def from_exa(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [search_result("exa", item.get("title"), item.get("url"), item.get("highlights") or item.get("text"))
+            for item in results]
+
+
+def merge_results(results: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge results from several providers, keeping the first result per canonical URL.
+
+    The canonical form is only the merge key; each result keeps the URL its
+    provider returned, without tracking parameters, so the scraping tools
+    fetch a page the site actually serves. Later duplicates add their
+    provider to ``providers`` and fill in a missing snippet; order of first
+    appearance is preserved.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        key = canonical_url(result.get("url", "")) or result.get("title", "")
+        if not key:
+            continue
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = dict(result, url=strip_tracking(result.get("url", "")),
+                               providers=list(result.get("providers", [])))
+            continue
+        for provider in result.get("providers", []):
+            if provider not in existing["providers"]:
+                existing["providers"].append(provider)
+        if not existing.get("snippet") and result.get("snippet"):
+            existing["snippet"] = result["snippet"]
+    return list(merged.values())
+
+
+def shingles(text: str, size: int = shingle_size) -> FrozenSet[int]:
+    """Hashed word ``size``-grams of ``text``, used for near-duplicate detection."""
+    words = _word_re.findall(text.lower())
+    if len(words) <= size:
+        return frozenset([zlib.crc32(" ".join(words).encode())]) if words else frozenset()
+    return frozenset(zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1))
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def remove_near_duplicates(results: List[Dict[str, Any]],
+                           threshold: float = near_duplicate_threshold) -> List[Dict[str, Any]]:
+    """Drop results whose title and snippet mostly repeat an earlier result.
+
+    Syndicated articles often appear under different URLs with the same text;
+    the earlier result is kept and absorbs the duplicate's providers.
+    """
+    kept: List[Dict[str, Any]] = []
+    kept_shingles: List[FrozenSet[int]] = []
+    for result in results:
+        signature = shingles(f"{result.get('title', '')} {result.get('snippet', '')}")
+        duplicate_of = next((i for i, other in enumerate(kept_shingles) if jaccard(signature, other) >= threshold), None)
+        if duplicate_of is None:
+            kept.append(result)
+            kept_shingles.append(signature)
+            continue
+        providers = kept[duplicate_of].setdefault("providers", [])
+        providers.extend(p for p in result.get("providers", []) if p not in providers)
+    return kept
+
+
+def cap_results(results: List[Dict[str, Any]], limit: int = max_results,
+                snippet_chars: int = max_snippet_chars, total_chars: int = max_total_chars) -> List[Dict[str, Any]]:
+    """Keep at most ``limit`` results, truncating snippets and stopping at ``total_chars``."""
+    capped: List[Dict[str, Any]] = []
+    used = 0
+    for result in results[:limit]:
+        snippet = result.get("snippet", "")
+        if len(snippet) > snippet_chars:
+            snippet = snippet[:snippet_chars].rsplit(" ", 1)[0] + "..."
+        size = len(result.get("title", "")) + len(result.get("url", "")) + len(snippet)
+        if capped and used + size > total_chars:
+            break
+        capped.append(dict(result, snippet=snippet))
+        used += size
+    return capped
+
+
+def normalize_results(results: Iterable[Dict[str, Any]], limit: int = max_results) -> List[Dict[str, Any]]:
+    """Canonicalise URLs, merge exact and near duplicates, and cap the result size."""
+    return cap_results(remove_near_duplicates(merge_results(results)), limit=limit)
@@ -1,15 +1,15 @@
 import json
 import requests
 import os
-import http.client
 from crewai.tools import tool
 import logging
 import logging.handlers
 from typing import Dict, Any, Optional, Union, Type
 from pydantic import Field, BaseModel, create_model
-from tavily import TavilyClient
 import chromadb
 from db_utils import get_vector_db_file, get_next_id, store_result, get_result_by_id,similarity_threshold
+from tools.search_providers import serper_search, tavily_qna_search
+from tools.search_results import from_serper, normalize_results
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -47,21 +47,7 @@ class SearchTools:
           data=get_result_by_id(doc_id)
           logger.info(f'Cache hit for Google search {doc_id}')
         else: 
-          serper_api_key = os.getenv("SERPER_API_KEY")
-          conn = http.client.HTTPSConnection("google.serper.dev")
-          payload = json.dumps({
-            "q": q,
-            "num": 10
-          })
-          headers = {
-            'X-API-KEY': serper_api_key,
-            'Content-Type': 'application/json'
-          }
-          conn.request("POST", "/search", payload, headers)
-          res = conn.getresponse()
-          results = res.read()
-          data = [" ".join(result.decode("utf-8")['organic']) for result in results]
-          data = data if data else "No results found"
+          data = json.dumps(normalize_results(from_serper(serper_search(q, "search"))))
 
           id = get_next_id()
           collection.upsert(
@@ -100,19 +86,7 @@ class SearchTools:
           doc_id=cached_result['ids'][0][0]
           data=get_result_by_id(doc_id)
         else: 
-          serper_api_key = os.getenv("SERPER_API_KEY")
-          conn = http.client.HTTPSConnection("google.serper.dev")
-          payload = json.dumps({
-            "q": q,
-            "num": 10
-          })
-          headers = {
-            'X-API-KEY': serper_api_key,
-            'Content-Type': 'application/json'
-          }
-          conn.request("POST", "/news", payload, headers)
-          res = conn.getresponse()
-          data = res.read()
+          data = json.dumps(normalize_results(from_serper(serper_search(q, "news"), key="news")))
 
           id = get_next_id()
           collection.upsert(
@@ -121,7 +95,10 @@ class SearchTools:
           )
           store_result(id,q,data)
 
-        return json.loads(data.decode("utf-8"))['organic']
+        results = json.loads(data)
+        if isinstance(results, dict):
+          results = normalize_results(from_serper(results, key="news"))
+        return results
 
     @tool("Tavily Search")
     def TavilySearchTool(question: str) -> str:
@@ -136,12 +113,10 @@ class SearchTools:
         n_results=1 # how many results to return
       )
       if cached_result['distances'][0] and cached_result['distances'][0][0]<similarity_threshold():
-        doc_id=results['ids'][0][0]
+        doc_id=cached_result['ids'][0][0]
         data=get_result_by_id(doc_id)
       else: 
-        tavily_api_key=os.getenv("TAVILY_API_KEY")
-        client = TavilyClient(api_key=tavily_api_key)
-        data = client.qna_search(query=question,max_results=10)
+        data = tavily_qna_search(question, max_results=10)
 
         id = get_next_id()
         collection.upsert(
@@ -1,14 +1,14 @@
-import os
-from exa_py import Exa
 from crewai.tools import tool
 from db_utils import get_vector_db_file, get_next_id, store_result, get_result_by_id,similarity_threshold
+from tools.search_providers import exa_search_and_contents
+from tools.search_results import from_exa, normalize_results
 import chromadb
 class ExaSearchTool:
 
 
   @tool("Exa search and get contents")
   def search_and_get_contents_tool(question: str) -> str:
-    """Tool using Exa's Python SDK to run semantic search and return result highlights."""
+    """Tool using Exa's search API to run semantic search and return result highlights."""
 
     tag="ExaSearch"
     cache_query=f'{tag}:{question}'
@@ -20,26 +20,14 @@ class ExaSearchTool:
       n_results=1 # how many results to return
     )
     if cached_result['distances'][0] and cached_result['distances'][0][0]<similarity_threshold():
-      doc_id=results['ids'][0][0]
+      doc_id=cached_result['ids'][0][0]
       data=get_result_by_id(doc_id)
     else: 
-      exa_api_key = os.getenv("EXA_API_KEY")
-      exa = Exa(exa_api_key)
+      response_results=enumerate(normalize_results(from_exa(exa_search_and_contents(question, num_results=10))))
 
-      response = exa.search_and_contents(
-          question,
-          type="neural",
-          use_autoprompt=True,
-          num_results=10,
-          highlights=True
-      )
-
-      response_results=enumerate(response.results)
-
-
-      data= ''.join([f'<Title id={idx}>{eachResult.title}</Title>'+
-                             f'<URL id={idx}>{eachResult.url}</URL>'+
-                             f'<Highlight id={idx}>{eachResult.highlights}</Highlight>' 
+      data= ''.join([f'<Title id={idx}>{eachResult.get("title")}</Title>'+
+                             f'<URL id={idx}>{eachResult.get("url")}</URL>'+
+                             f'<Highlight id={idx}>{eachResult.get("snippet")}</Highlight>' 
                              for (idx, eachResult) in response_results])
 
       id = get_next_id()
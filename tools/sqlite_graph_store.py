@@ -0,0 +1,155 @@
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from llama_index.core.graph_stores.types import GraphStore
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteGraphStore(GraphStore):
+    """llama-index graph store backed by SQLite edge tables.
+
+    Entity and relation names are interned into integer ids and edges are
+    indexed on both subject and object, so neighbourhood lookups and k-hop
+    traversals run in SQL instead of over a fully loaded JSON graph. Each
+    upsert is committed on its own, which makes ``persist`` a no-op rather
+    than a rewrite of the whole graph.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript('''
+        CREATE TABLE IF NOT EXISTS entities (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS relations (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS edges (
+            subj_id INTEGER NOT NULL,
+            rel_id INTEGER NOT NULL,
+            obj_id INTEGER NOT NULL,
+            PRIMARY KEY (subj_id, rel_id, obj_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_edges_obj ON edges (obj_id, subj_id);
+        ''')
+        self._conn.commit()
+
+    @property
+    def client(self) -> Any:
+        return self._conn
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM edges').fetchone()[0]
+
+    def _intern(self, table: str, name: str) -> int:
+        self._conn.execute(f'INSERT OR IGNORE INTO {table} (name) VALUES (?)', (name,))
+        return self._conn.execute(f'SELECT id FROM {table} WHERE name=?', (name,)).fetchone()[0]
+
+    def get(self, subj: str) -> List[List[str]]:
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT r.name, o.name FROM edges e
+                JOIN entities s ON s.id = e.subj_id
+                JOIN relations r ON r.id = e.rel_id
+                JOIN entities o ON o.id = e.obj_id
+                WHERE s.name = ?
+            ''', (subj,)).fetchall()
+        return [list(row) for row in rows]
+
+    def get_rel_map(self, subjs: Optional[List[str]] = None, depth: int = 2,
+                    limit: int = 30) -> Dict[str, List[List[str]]]:
+        """Return [subj, rel, obj] triplets reachable within ``depth`` hops of each subject.
+
+        Triplets are ordered by hop distance and the total across subjects is
+        capped at ``limit``, matching SimpleGraphStore's truncation.
+        """
+        if depth <= 0:
+            return {}
+        with self._lock:
+            if subjs is None:
+                roots = self._conn.execute('SELECT DISTINCT s.id, s.name FROM edges e '
+                                           'JOIN entities s ON s.id = e.subj_id').fetchall()
+            else:
+                placeholders = ','.join('?' * len(subjs))
+                roots = self._conn.execute(f'SELECT id, name FROM entities WHERE name IN ({placeholders})',
+                                           list(subjs)).fetchall() if subjs else []
+            rel_map: Dict[str, List[List[str]]] = {}
+            remaining = limit
+            for root_id, root_name in roots:
+                if remaining <= 0:
+                    break
+                rows = self._conn.execute('''
+                    WITH RECURSIVE hop(subj_id, rel_id, obj_id, depth) AS (
+                        SELECT subj_id, rel_id, obj_id, 1 FROM edges WHERE subj_id = ?
+                        UNION
+                        SELECT e.subj_id, e.rel_id, e.obj_id, hop.depth + 1
+                        FROM edges e JOIN hop ON e.subj_id = hop.obj_id
+                        WHERE hop.depth < ?
+                    )
+                    SELECT s.name, r.name, o.name, MIN(hop.depth) AS hops FROM hop
+                    JOIN entities s ON s.id = hop.subj_id
+                    JOIN relations r ON r.id = hop.rel_id
+                    JOIN entities o ON o.id = hop.obj_id
+                    GROUP BY hop.subj_id, hop.rel_id, hop.obj_id
+                    ORDER BY hops
+                    LIMIT ?
+                ''', (root_id, depth, remaining)).fetchall()
+                if rows:
+                    rel_map[root_name] = [[subj, rel, obj] for subj, rel, obj, _ in rows]
+                    remaining -= len(rows)
+        return rel_map
+
+    def upsert_triplet(self, subj: str, rel: str, obj: str) -> None:
+        self.upsert_triplets([(subj, rel, obj)])
+
+    def upsert_triplets(self, triplets) -> None:
+        with self._lock:
+            for subj, rel, obj in triplets:
+                self._conn.execute('INSERT OR IGNORE INTO edges (subj_id, rel_id, obj_id) VALUES (?, ?, ?)',
+                                   (self._intern('entities', subj), self._intern('relations', rel),
+                                    self._intern('entities', obj)))
+            self._conn.commit()
+
+    def delete(self, subj: str, rel: str, obj: str) -> None:
+        with self._lock:
+            self._conn.execute('''
+                DELETE FROM edges WHERE
+                    subj_id = (SELECT id FROM entities WHERE name = ?) AND
+                    rel_id = (SELECT id FROM relations WHERE name = ?) AND
+                    obj_id = (SELECT id FROM entities WHERE name = ?)
+            ''', (subj, rel, obj))
+            self._conn.commit()
+
+    def persist(self, persist_path: str, fs=None) -> None:  # noqa: ARG002 - GraphStore signature
+        """Edges are committed as they are upserted, so there is nothing to rewrite."""
+        with self._lock:
+            self._conn.commit()
+
+    def import_graph_dict(self, graph_dict: Dict[str, List[List[str]]]) -> int:
+        """Load triplets from a SimpleGraphStore ``graph_dict``. Returns the number imported."""
+        triplets = [(subj, rel, obj) for subj, pairs in graph_dict.items() for rel, obj in pairs]
+        self.upsert_triplets(triplets)
+        logger.info(f"Imported {len(triplets)} triplets into {self.db_file}")
+        return len(triplets)
+
+    def get_schema(self, refresh: bool = False) -> str:  # noqa: ARG002 - GraphStore signature, always read fresh
+        """The graph has no typed schema, so describe it by the relation names in use."""
+        with self._lock:
+            relations = [row[0] for row in self._conn.execute('SELECT name FROM relations ORDER BY name')]
+        return f"Relations: {', '.join(relations)}" if relations else "Relations: (none)"
+
+    def query(self, query: str, param_map: Optional[Dict[str, Any]] = None) -> Any:
+        with self._lock:
+            return self._conn.execute(query, param_map or {}).fetchall()
@@ -0,0 +1,131 @@
+import re
+from typing import Any, Dict, List, Optional
+
+_separator_row = re.compile(r'^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$')
+_heading = re.compile(r'^(#{1,6})\s+(.*\S)\s*$')
+
+
+def _is_table_line(line: str) -> bool:
+    return line.lstrip().startswith('|')
+
+
+def _split_cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+
+def _pack(pieces: List[str], max_chars: int, joiner: str = "\n\n") -> List[str]:
+    """Greedily pack pieces into strings of at most max_chars without overlap."""
+    chunks, current = [], ""
+    for piece in pieces:
+        while len(piece) > max_chars:
+            cut = piece.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(piece[:cut].rstrip())
+            piece = piece[cut:].lstrip()
+        if not piece:
+            continue
+        if current and len(current) + len(joiner) + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}{joiner}{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _table_chunks(lines: List[str], sheet: Optional[str], table_no: int,
+                  source: str, max_chars: int) -> List[Dict[str, Any]]:
+    header = [lines[0]]
+    body = lines[1:]
+    if body and _separator_row.match(body[0].strip()):
+        header.append(body[0])
+        body = body[1:]
+    header_text = "\n".join(header)
+    prefix = f"## {sheet}\n" if sheet else ""
+    columns = [cell for cell in _split_cells(lines[0]) if cell]
+    budget = max(max_chars - len(prefix) - len(header_text) - 1, 1)
+
+    chunks = []
+    group, group_len, first_row = [], 0, 1
+    for row_no, row in enumerate(body, start=1):
+        if group and group_len + len(row) + 1 > budget:
+            chunks.append((first_row, row_no - 1, group))
+            group, group_len, first_row = [], 0, row_no
+        group.append(row)
+        group_len += len(row) + 1
+    if group or not chunks:
+        chunks.append((first_row, len(body), group))
+
+    return [{
+        'text': prefix + "\n".join([header_text] + rows),
+        'metadata': {
+            'source': source,
+            'sheet': sheet or "",
+            'region': f"table {table_no} rows {start}-{end}",
+            'table': table_no,
+            'row_start': start,
+            'row_end': end,
+            'columns': ", ".join(columns),
+            'chunk_type': 'table',
+        },
+    } for start, end, rows in chunks]
+
+
+def chunk_markdown_tables(markdown: str, source: str = "", max_chars: int = 1000) -> List[Dict[str, Any]]:
+    """Split parsed spreadsheet markdown into row-group chunks.
+
+    Tables are split only between rows and every chunk repeats the table's
+    header row, so a chunk can be read on its own. Text outside tables is
+    packed by paragraph. Chunks never overlap. Each chunk is a dict with
+    ``text`` and ``metadata`` (source, sheet, region, row range, columns).
+    """
+    chunks: List[Dict[str, Any]] = []
+    sheet: Optional[str] = None
+    table_no = 0
+    paragraphs: List[str] = []
+    paragraph: List[str] = []
+    table: List[str] = []
+
+    def flush_text():
+        if paragraph:
+            paragraphs.append("\n".join(paragraph))
+            paragraph.clear()
+        for text in _pack(paragraphs, max_chars):
+            chunks.append({
+                'text': text,
+                'metadata': {'source': source, 'sheet': sheet or "", 'region': "text", 'chunk_type': 'text'},
+            })
+        paragraphs.clear()
+
+    def flush_table():
+        nonlocal table_no
+        if table:
+            table_no += 1
+            chunks.extend(_table_chunks(list(table), sheet, table_no, source, max_chars))
+            table.clear()
+
+    for line in markdown.splitlines():
+        if _is_table_line(line):
+            if not table:
+                flush_text()
+            table.append(line.rstrip())
+            continue
+        flush_table()
+        heading = _heading.match(line)
+        if heading:
+            flush_text()
+            sheet = heading.group(2)
+            table_no = 0
+        elif not line.strip() or line.strip() == '---':
+            if paragraph:
+                paragraphs.append("\n".join(paragraph))
+                paragraph.clear()
+        else:
+            paragraph.append(line.rstrip())
+    flush_table()
+    flush_text()
+    return chunks
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+from typing import Callable, List, Optional, Tuple
+
+from llama_index.core import KnowledgeGraphIndex
+from llama_index.core.prompts.default_prompts import DEFAULT_KG_TRIPLET_EXTRACT_PROMPT
+
+from db_utils import db_path
+
+logger = logging.getLogger(__name__)
+
+triplet_db_file = os.path.join(db_path, "triplets.sqlite3")
+
+Triplet = Tuple[str, str, str]
+
+
+def chunk_hash(text: str) -> str:
+    """Hash chunk text with whitespace normalised, so re-wrapped text still hits."""
+    return hashlib.sha256(re.sub(r'\s+', ' ', text).strip().encode('utf-8')).hexdigest()
+
+
+class TripletCache:
+    """SQLite cache of LLM-extracted knowledge graph triplets keyed by chunk hash and model id."""
+
+    def __init__(self, db_file: str = triplet_db_file):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        try:
+            conn = sqlite3.connect(self.db_file)
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS triplets (
+                chunk_hash TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                triplets TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (chunk_hash, model_id)
+            )
+            ''')
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Database error setting up triplet cache: {e}")
+            raise
+        finally:
+            if 'conn' in locals():
+                conn.close()
+
+    def get(self, text: str, model_id: str) -> Optional[List[Triplet]]:
+        try:
+            conn = sqlite3.connect(self.db_file)
+            record = conn.execute('SELECT triplets FROM triplets WHERE chunk_hash=? AND model_id=?',
+                                  (chunk_hash(text), model_id)).fetchone()
+            return [tuple(triplet) for triplet in json.loads(record[0])] if record else None
+        except sqlite3.Error as e:
+            logger.error(f"Database error reading triplet cache: {e}")
+            return None
+        finally:
+            if 'conn' in locals():
+                conn.close()
+
+    def put(self, text: str, model_id: str, triplets: List[Triplet]):
+        try:
+            conn = sqlite3.connect(self.db_file)
+            conn.execute('INSERT OR REPLACE INTO triplets (chunk_hash, model_id, triplets) VALUES (?, ?, ?)',
+                         (chunk_hash(text), model_id, json.dumps([list(triplet) for triplet in triplets])))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Database error writing triplet cache: {e}")
+        finally:
+            if 'conn' in locals():
+                conn.close()
+
+
+def triplet_model_id(llm, max_triplets_per_chunk: int) -> str:
+    model_name = getattr(llm, 'model', None) or llm.metadata.model_name
+    return f"{model_name}:max{max_triplets_per_chunk}"
+
+
+def cached_triplet_extractor(llm, max_triplets_per_chunk: int,
+                             cache: Optional[TripletCache] = None) -> Callable[[str], List[Triplet]]:
+    """Build a ``kg_triplet_extract_fn`` that only calls the LLM for chunks not seen before.
+
+    Uses the same prompt and parsing as KnowledgeGraphIndex's own extraction.
+    """
+    cache = cache or TripletCache()
+    model_id = triplet_model_id(llm, max_triplets_per_chunk)
+    template = DEFAULT_KG_TRIPLET_EXTRACT_PROMPT.partial_format(max_knowledge_triplets=max_triplets_per_chunk)
+
+    def extract(text: str) -> List[Triplet]:
+        triplets = cache.get(text, model_id)
+        if triplets is not None:
+            return triplets
+        response = llm.predict(template, text=text)
+        triplets = KnowledgeGraphIndex._parse_triplet_response(response)
+        cache.put(text, model_id, triplets)
+        return triplets
+
+    return extract